@@ -2,9 +2,11 @@
 import pulumi
 import pulumi_aws as aws
 
-from modules.aws.vpc import Vpc
-from modules.aws.eks import EksCluster
-from modules.aws.rds import RdsDatabase
+from modules.aws.vpc import Vpc, VpcArgs
+from modules.aws.eks import EksCluster, EksClusterArgs, NodeLaunchTemplateArgs
+from modules.aws.rds import RdsDatabase, RdsDatabaseArgs
+from modules.aws.elasticache import ElastiCache, ElastiCacheArgs
+from modules.aws.efs import Efs, EfsArgs
 
 
 class AwsInfrastructure:
@@ -13,41 +15,122 @@ class AwsInfrastructure:
         self.stack = pulumi.get_stack()
         
         # Create VPC
+        vpc_cidr_block = self.config.get("vpcCidrBlock") or "10.0.0.0/16"
+        nat_strategy = self.config.get("natStrategy") or (
+            "per-az" if self.stack == "production" else "single"
+        )
+        if nat_strategy not in ("single", "per-az", "none"):
+            raise ValueError(f"Unsupported natStrategy '{nat_strategy}'; use single, per-az or none")
+        enable_ipv6 = self.config.get_bool("enableIpv6") or False
+        eks_ip_family = self.config.get("eksIpFamily") or "ipv4"
+        if eks_ip_family == "ipv6" and not enable_ipv6:
+            raise ValueError("eksIpFamily ipv6 requires enableIpv6 for dual-stack subnets")
         self.vpc = Vpc(
-            name=f"main-vpc-{self.stack}",
-            cidr_block=self.config.get("vpcCidrBlock") or "10.0.0.0/16",
-            enable_nat_gateway=True,
-            single_nat_gateway=self.stack != "production",
-            tags={
-                "Environment": self.stack,
-                "Project": "pulumi-cloud-infrastructure",
-                "ManagedBy": "pulumi"
-            }
+            f"main-vpc-{self.stack}",
+            VpcArgs(
+                name=f"main-vpc-{self.stack}",
+                cidr_block=vpc_cidr_block,
+                enable_nat_gateway=nat_strategy != "none",
+                single_nat_gateway=nat_strategy == "single",
+                enable_ipv6=enable_ipv6,
+                enable_flow_logs=self.config.get_bool("enableFlowLogs") or False,
+                flow_logs_force_destroy=self.stack != "production",
+                tags={
+                    "Environment": self.stack,
+                    "Project": "pulumi-cloud-infrastructure",
+                    "ManagedBy": "pulumi"
+                }
+            )
         )
         
         # Create EKS Cluster
+        enable_shared_storage = self.config.get_bool("enableSharedStorage") or False
+        node_launch_template = None
+        node_ami_family = self.config.get("nodeAmiFamily")
+        if node_ami_family:
+            node_launch_template = NodeLaunchTemplateArgs(
+                ami_family=node_ami_family,
+                image_cache_size_gib=self.config.get_int("nodeImageCacheGib") or 60,
+                volume_throughput=self.config.get_int("nodeVolumeThroughput") or 250,
+                volume_iops=self.config.get_int("nodeVolumeIops") or 3000,
+                prepull_images=self.config.get_object("nodePrepullImages")
+            )
         self.eks_cluster = EksCluster(
-            name=f"main-eks-{self.stack}",
-            vpc_id=self.vpc.vpc_id,
-            private_subnet_ids=self.vpc.private_subnet_ids,
-            public_subnet_ids=self.vpc.public_subnet_ids,
-            instance_types=["t3.medium"],
-            min_size=self.config.get_int("minNodes") or 1,
-            max_size=self.config.get_int("maxNodes") or 3,
-            desired_size=self.config.get_int("desiredNodes") or 1
+            f"main-eks-{self.stack}",
+            EksClusterArgs(
+                name=f"main-eks-{self.stack}",
+                vpc_id=self.vpc.vpc_id,
+                private_subnet_ids=self.vpc.private_subnet_ids,
+                public_subnet_ids=self.vpc.public_subnet_ids,
+                instance_types=["t3.medium"],
+                ip_family=eks_ip_family,
+                min_size=self.config.get_int("minNodes") or 1,
+                max_size=self.config.get_int("maxNodes") or 3,
+                desired_size=self.config.get_int("desiredNodes") or 1,
+                node_launch_template=node_launch_template,
+                enable_oidc_provider=enable_shared_storage,
+                enable_karpenter=self.config.get_bool("enableKarpenter") or False,
+                kubeconfig_token_cache_command=self.config.get("kubeconfigTokenCacheCommand")
+            )
         )
         
         # Create RDS Database
         self.database = RdsDatabase(
-            name=f"main-db-{self.stack}",
-            vpc_id=self.vpc.vpc_id,
-            subnet_ids=self.vpc.private_subnet_ids,
-            instance_class=self.config.get("databaseInstanceClass") or "db.t3.micro",
-            allocated_storage=self.config.get_int("allocatedStorage") or 20,
-            multi_az=self.stack == "production",
-            backup_retention_period=7 if self.stack == "production" else 3
+            f"main-db-{self.stack}",
+            RdsDatabaseArgs(
+                name=f"main-db-{self.stack}",
+                vpc_id=self.vpc.vpc_id,
+                subnet_ids=self.vpc.private_subnet_ids,
+                instance_class=self.config.get("databaseInstanceClass") or "db.t3.micro",
+                allocated_storage=self.config.get_int("allocatedStorage") or 20,
+                multi_az=self.stack == "production",
+                backup_retention_period=7 if self.stack == "production" else 3,
+                deletion_protection=self.stack == "production",
+                allowed_cidr_blocks=[vpc_cidr_block],
+                enable_observability=self.config.get_bool("enableDatabaseInsights") or False,
+                slow_query_threshold_ms=self.config.get_int("slowQueryThresholdMs") or 500
+            )
         )
         
+        # Create cache tier
+        self.cache = None
+        if self.config.get_bool("enableCache"):
+            cache_replicas = self.config.get_int("cacheReplicas")
+            self.cache = ElastiCache(
+                f"main-cache-{self.stack}",
+                ElastiCacheArgs(
+                    name=f"main-cache-{self.stack}",
+                    vpc_id=self.vpc.vpc_id,
+                    subnet_ids=self.vpc.private_subnet_ids,
+                    engine=self.config.get("cacheEngine") or "valkey",
+                    engine_version=self.config.get("cacheEngineVersion"),
+                    node_type=self.config.get("cacheNodeType") or "cache.t4g.small",
+                    cluster_mode=self.config.get_bool("cacheClusterMode") is not False,
+                    num_shards=self.config.get_int("cacheShards") or 1,
+                    replicas_per_shard=1 if cache_replicas is None else cache_replicas,
+                    allowed_cidr_blocks=[vpc_cidr_block]
+                )
+            )
+        
+        # Create shared file storage
+        self.shared_storage = None
+        if enable_shared_storage:
+            self.shared_storage = Efs(
+                f"main-efs-{self.stack}",
+                EfsArgs(
+                    name=f"main-efs-{self.stack}",
+                    vpc_id=self.vpc.vpc_id,
+                    subnet_ids=self.vpc.private_subnet_ids,
+                    throughput_mbps=self.config.get_float("sharedStorageThroughputMbps") or 100,
+                    throughput_mode=self.config.get("sharedStorageThroughputMode") or "elastic",
+                    allowed_cidr_blocks=[vpc_cidr_block],
+                    k8s_provider=self.eks_cluster.k8s_provider,
+                    oidc_provider_arn=self.eks_cluster.oidc_provider.arn,
+                    oidc_provider_url=self.eks_cluster.oidc_provider.url
+                ),
+                opts=pulumi.ResourceOptions(depends_on=[self.eks_cluster.node_group])
+            )
+        
         # Create S3 Bucket for application data
         self.app_bucket = aws.s3.BucketV2(
             f"app-bucket-{self.stack}",
@@ -86,12 +169,26 @@ class AwsInfrastructure:
     def export_outputs(self):
         """Export important resource identifiers."""
         pulumi.export("vpc_id", self.vpc.vpc_id)
+        pulumi.export("vpc_cidr_block", self.vpc.vpc.cidr_block)
         pulumi.export("eks_cluster_name", self.eks_cluster.cluster.name)
         pulumi.export("eks_kubeconfig", self.eks_cluster.kubeconfig)
         pulumi.export("rds_endpoint", self.database.instance.endpoint)
+        pulumi.export("rds_resource_id", self.database.resource_id)
+        if self.database.monitoring_role_arn is not None:
+            pulumi.export("rds_monitoring_role_arn", self.database.monitoring_role_arn)
         pulumi.export("s3_bucket_name", self.app_bucket.bucket)
         pulumi.export("private_subnet_ids", self.vpc.private_subnet_ids)
         pulumi.export("public_subnet_ids", self.vpc.public_subnet_ids)
+        pulumi.export("private_route_table_ids", self.vpc.private_route_table_ids)
+        if self.cache is not None:
+            pulumi.export("cache_primary_endpoint", self.cache.primary_endpoint)
+            pulumi.export("cache_reader_endpoint", self.cache.reader_endpoint)
+        if self.shared_storage is not None:
+            pulumi.export("efs_file_system_id", self.shared_storage.file_system.id)
+        if self.vpc.ipv6_cidr_block is not None:
+            pulumi.export("vpc_ipv6_cidr_block", self.vpc.ipv6_cidr_block)
+        if self.vpc.flow_logs_bucket_arn is not None:
+            pulumi.export("flow_logs_bucket_arn", self.vpc.flow_logs_bucket_arn)
 
 
 # Create infrastructure
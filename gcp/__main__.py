@@ -2,14 +2,17 @@
 import pulumi
 import pulumi_gcp as gcp
 
-from modules.gcp.gke import GkeCluster
-from modules.gcp.cloud_sql import CloudSqlDatabase
+from modules.gcp.gke import GkeCluster, GkeClusterArgs
+from modules.gcp.cloud_sql import CloudSqlDatabase, CloudSqlDatabaseArgs, PgBouncer, PgBouncerArgs
+from modules.gcp.memorystore import Memorystore, MemorystoreArgs
+from modules.gcp.filestore import Filestore, FilestoreArgs
 
 
 class GcpInfrastructure:
     def __init__(self):
         self.config = pulumi.Config()
         self.stack = pulumi.get_stack()
+        self.project = pulumi.Config("gcp").require("project")
         
         # Create VPC Network
         self.vpc = gcp.compute.Network(
@@ -17,48 +20,129 @@ class GcpInfrastructure:
             name=f"main-vpc-{self.stack}",
             auto_create_subnetworks=False,
             description=f"Main VPC for {self.stack} environment",
-            project=self.config.require("gcp:project")
+            project=self.project
         )
         
         # Create Subnets
         self.subnets = []
         regions = ["us-central1", "us-west1"]
+        # Kept clear of the aws/ stack's 10.0.0.0/16 so the two can be
+        # joined by the cross-cloud VPN.
+        subnet_cidr_blocks = self.config.get_object("subnetCidrBlocks") or ["10.10.0.0/16", "10.11.0.0/16"]
+        if len(subnet_cidr_blocks) != len(regions):
+            raise ValueError(f"subnetCidrBlocks needs one range per region: {', '.join(regions)}")
         
-        for i, region in enumerate(regions):
+        for region, cidr_block in zip(regions, subnet_cidr_blocks):
             subnet = gcp.compute.Subnetwork(
                 f"subnet-{region}-{self.stack}",
                 name=f"subnet-{region}-{self.stack}",
-                ip_cidr_range=f"10.{i}.0.0/16",
+                ip_cidr_range=cidr_block,
                 region=region,
                 network=self.vpc.id,
                 private_ip_google_access=True,
-                project=self.config.require("gcp:project")
+                project=self.project
             )
             self.subnets.append(subnet)
         
         # Create GKE Cluster
+        enable_shared_storage = self.config.get_bool("enableSharedStorage") or False
+        enable_connection_pooling = self.config.get_bool("enableConnectionPooling") or False
         self.gke_cluster = GkeCluster(
-            name=f"main-gke-{self.stack}",
-            location="us-central1",
-            network=self.vpc.id,
-            subnetwork=self.subnets[0].id,
-            min_node_count=self.config.get_int("minNodes") or 1,
-            max_node_count=self.config.get_int("maxNodes") or 3,
-            machine_type=self.config.get("machineType") or "e2-medium",
-            enable_private_nodes=True
+            f"main-gke-{self.stack}",
+            GkeClusterArgs(
+                name=f"main-gke-{self.stack}",
+                location="us-central1",
+                network=self.vpc.id,
+                subnetwork=self.subnets[0].id,
+                min_node_count=self.config.get_int("minNodes") or 1,
+                max_node_count=self.config.get_int("maxNodes") or 3,
+                machine_type=self.config.get("machineType") or "e2-medium",
+                enable_private_nodes=True,
+                enable_filestore_csi_driver=enable_shared_storage,
+                workload_identity_project=self.project if enable_connection_pooling else None
+            )
         )
         
         # Create Cloud SQL Database
+        db_tier = self.config.get("dbTier") or "db-f1-micro"
         self.database = CloudSqlDatabase(
-            name=f"main-db-{self.stack}",
-            database_version="POSTGRES_13",
-            tier=self.config.get("dbTier") or "db-f1-micro",
-            disk_size=self.config.get_int("diskSize") or 20,
-            availability_type="ZONAL" if self.stack == "dev" else "REGIONAL",
-            backup_enabled=True,
-            deletion_protection=self.stack == "production"
+            f"main-db-{self.stack}",
+            CloudSqlDatabaseArgs(
+                name=f"main-db-{self.stack}",
+                database_version="POSTGRES_13",
+                tier=db_tier,
+                disk_size=self.config.get_int("diskSize") or 20,
+                availability_type="ZONAL" if self.stack == "dev" else "REGIONAL",
+                backup_enabled=True,
+                deletion_protection=self.stack == "production",
+                enable_observability=self.config.get_bool("enableDatabaseInsights") or False,
+                slow_query_threshold_ms=self.config.get_int("slowQueryThresholdMs") or 500,
+                # The pooler's Auth Proxy reaches the instance over private IP.
+                private_network=self.vpc.id if enable_connection_pooling else None
+            )
         )
         
+        # Pool connections to Cloud SQL from the cluster
+        self.connection_pool = None
+        if enable_connection_pooling:
+            self.connection_pool = PgBouncer(
+                f"main-pgbouncer-{self.stack}",
+                PgBouncerArgs(
+                    name=f"main-pgbouncer-{self.stack}",
+                    instance_connection_name=self.database.instance.connection_name,
+                    k8s_provider=self.gke_cluster.k8s_provider,
+                    user=self.database.user.name,
+                    password=self.config.require_secret("dbPassword"),
+                    tier=db_tier,
+                    project=self.project,
+                    region=regions[0],
+                    default_pool_size=self.config.get_int("pgbouncerPoolSize") or 5,
+                    pool_sizes=self.config.get_object("pgbouncerPoolSizes"),
+                    max_user_connections=self.config.get_object("pgbouncerMaxUserConnections"),
+                    max_replicas=self.config.get_int("pgbouncerMaxReplicas") or 4
+                ),
+                opts=pulumi.ResourceOptions(depends_on=[self.database.database])
+            )
+        
+        # Create cache tier
+        self.cache = None
+        if self.config.get_bool("enableCache"):
+            cache_replicas = self.config.get_int("cacheReplicas")
+            self.cache = Memorystore(
+                f"main-cache-{self.stack}",
+                MemorystoreArgs(
+                    name=f"main-cache-{self.stack}",
+                    network=self.vpc.id,
+                    subnetwork=self.subnets[0].id,
+                    project=self.project,
+                    region=regions[0],
+                    engine=self.config.get("cacheEngine") or "VALKEY",
+                    node_type=self.config.get("cacheNodeType") or "SHARED_CORE_NANO",
+                    cluster_mode=self.config.get_bool("cacheClusterMode") is not False,
+                    shard_count=self.config.get_int("cacheShards") or 1,
+                    replica_count=1 if cache_replicas is None else cache_replicas,
+                    memory_size_gb=self.config.get_int("cacheMemorySizeGb") or 5,
+                    deletion_protection=self.stack == "production"
+                )
+            )
+        
+        # Create shared file storage
+        self.shared_storage = None
+        if enable_shared_storage:
+            self.shared_storage = Filestore(
+                f"main-filestore-{self.stack}",
+                FilestoreArgs(
+                    name=f"main-filestore-{self.stack}",
+                    network=self.vpc.name,
+                    project=self.project,
+                    zone=f"{regions[0]}-a",
+                    throughput_mbps=self.config.get_float("sharedStorageThroughputMbps") or 100,
+                    regional=self.stack == "production",
+                    k8s_provider=self.gke_cluster.k8s_provider,
+                    deletion_protection=self.stack == "production"
+                )
+            )
+        
         # Create Cloud Storage Bucket
         self.storage_bucket = gcp.storage.Bucket(
             f"app-bucket-{self.stack}",
@@ -72,7 +156,7 @@ class GcpInfrastructure:
             encryption=gcp.storage.BucketEncryptionArgs(
                 default_kms_key_name=""
             ),
-            project=self.config.require("gcp:project")
+            project=self.project
         )
         
         # Export outputs
@@ -83,9 +167,20 @@ class GcpInfrastructure:
         pulumi.export("vpc_name", self.vpc.name)
         pulumi.export("gke_cluster_name", self.gke_cluster.cluster.name)
         pulumi.export("gke_kubeconfig", self.gke_cluster.kubeconfig)
-        pulumi.export("cloud_sql_instance_name", self.database.instance.name)
+        if self.connection_pool is not None:
+            pulumi.export("database_endpoint", self.connection_pool.endpoint)
+        else:
+            pulumi.export("cloud_sql_instance_name", self.database.instance.name)
+        pulumi.export("cloud_sql_database_id", self.database.database_id)
         pulumi.export("storage_bucket_name", self.storage_bucket.name)
         pulumi.export("subnet_names", [subnet.name for subnet in self.subnets])
+        pulumi.export("subnet_cidr_blocks", [subnet.ip_cidr_range for subnet in self.subnets])
+        if self.cache is not None:
+            pulumi.export("cache_primary_endpoint", self.cache.primary_endpoint)
+            pulumi.export("cache_reader_endpoint", self.cache.reader_endpoint)
+        if self.shared_storage is not None:
+            pulumi.export("filestore_ip_address", self.shared_storage.ip_address)
+            pulumi.export("filestore_tier", self.shared_storage.tier)
 
 
 # Create infrastructure
@@ -0,0 +1,3 @@
+from .file_system import Efs, EfsArgs, efs_throughput
+
+__all__ = ['Efs', 'EfsArgs', 'efs_throughput']
\ No newline at end of file
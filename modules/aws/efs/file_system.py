@@ -0,0 +1,220 @@
+"""AWS EFS Module."""
+import math
+
+import pulumi
+import pulumi_aws as aws
+import pulumi_kubernetes as k8s
+
+from modules.aws.eks.irsa import irsa_assume_role_policy
+
+
+THROUGHPUT_MODES = ("elastic", "provisioned")
+
+# Default per-file-system limits in MiB/s. Elastic throughput scales with
+# demand up to these; provisioned throughput meters reads at a third of
+# their size, so the provisioned value covers writes at the target and
+# reads at three times it.
+ELASTIC_MAX_READ_MIBPS = 3072
+ELASTIC_MAX_WRITE_MIBPS = 1024
+PROVISIONED_MAX_MIBPS = 3414
+
+NFS_PORT = 2049
+
+
+def mbps_to_mibps(mbps: float) -> float:
+    """Convert a decimal MB/s target to the MiB/s EFS is configured in."""
+    return mbps * 1000 * 1000 / (1024 * 1024)
+
+
+def efs_throughput(throughput_mbps: float, mode: str = "elastic") -> dict:
+    """Return the FileSystem throughput settings that sustain ``throughput_mbps``.
+
+    Raises ``ValueError`` when the target exceeds what the mode can deliver.
+    """
+    if mode not in THROUGHPUT_MODES:
+        raise ValueError(f"Unsupported throughput mode '{mode}'; use elastic or provisioned")
+    if throughput_mbps <= 0:
+        raise ValueError("throughput_mbps must be positive")
+    mibps = mbps_to_mibps(throughput_mbps)
+    if mode == "elastic":
+        if mibps > ELASTIC_MAX_WRITE_MIBPS:
+            raise ValueError(
+                f"{throughput_mbps} MB/s exceeds the elastic write limit of "
+                f"{ELASTIC_MAX_WRITE_MIBPS} MiB/s per file system"
+            )
+        return {"throughput_mode": "elastic"}
+    provisioned = math.ceil(mibps)
+    if provisioned > PROVISIONED_MAX_MIBPS:
+        raise ValueError(
+            f"{throughput_mbps} MB/s exceeds the provisioned limit of "
+            f"{PROVISIONED_MAX_MIBPS} MiB/s per file system"
+        )
+    return {"throughput_mode": "provisioned", "provisioned_throughput_in_mibps": provisioned}
+
+
+class EfsArgs:
+    def __init__(self,
+                 name: str,
+                 vpc_id: pulumi.Input[str],
+                 subnet_ids: list,
+                 throughput_mbps: float = 100,
+                 throughput_mode: str = "elastic",
+                 allowed_cidr_blocks: list = None,
+                 k8s_provider: k8s.Provider = None,
+                 oidc_provider_arn: pulumi.Input[str] = None,
+                 oidc_provider_url: pulumi.Input[str] = None,
+                 storage_class_name: str = "efs",
+                 csi_driver_version: str = "3.1.0",
+                 namespace: str = "kube-system"):
+        self.name = name
+        self.vpc_id = vpc_id
+        self.subnet_ids = subnet_ids
+        self.throughput_mbps = throughput_mbps
+        self.throughput_mode = throughput_mode
+        self.allowed_cidr_blocks = allowed_cidr_blocks or ["10.0.0.0/8"]
+        self.k8s_provider = k8s_provider
+        self.oidc_provider_arn = oidc_provider_arn
+        self.oidc_provider_url = oidc_provider_url
+        self.storage_class_name = storage_class_name
+        self.csi_driver_version = csi_driver_version
+        self.namespace = namespace
+
+
+class Efs(pulumi.ComponentResource):
+    """Encrypted EFS file system with a mount target in every subnet.
+
+    Throughput is configured from ``throughput_mbps``: elastic mode checks the
+    target against the per-file-system limits, provisioned mode provisions it.
+    With a ``k8s_provider`` the EFS CSI driver is installed with an IRSA role
+    and a StorageClass provisions one access point per volume claim.
+    """
+
+    def __init__(self, name: str, args: EfsArgs, opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:aws:Efs", name, {}, opts)
+
+        throughput = efs_throughput(args.throughput_mbps, args.throughput_mode)
+        if args.k8s_provider is not None and not (args.oidc_provider_arn and args.oidc_provider_url):
+            raise ValueError("the EFS CSI driver needs the cluster OIDC provider for its IRSA role")
+
+        # Security Group
+        security_group = aws.ec2.SecurityGroup(
+            f"{name}-security-group",
+            vpc_id=args.vpc_id,
+            description=f"NFS access to {args.name}",
+            ingress=[aws.ec2.SecurityGroupIngressArgs(
+                protocol="tcp",
+                from_port=NFS_PORT,
+                to_port=NFS_PORT,
+                cidr_blocks=args.allowed_cidr_blocks
+            )],
+            tags={
+                "Name": f"{args.name}-security-group",
+                "ManagedBy": "pulumi"
+            },
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        # File System
+        self.file_system = aws.efs.FileSystem(
+            f"{name}-file-system",
+            encrypted=True,
+            performance_mode="generalPurpose",
+            lifecycle_policies=[aws.efs.FileSystemLifecyclePolicyArgs(
+                transition_to_ia="AFTER_30_DAYS"
+            )],
+            tags={
+                "Name": args.name,
+                "ManagedBy": "pulumi"
+            },
+            **throughput,
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        # Mount Targets
+        self.mount_targets = []
+        for i, subnet_id in enumerate(args.subnet_ids):
+            self.mount_targets.append(aws.efs.MountTarget(
+                f"{name}-mount-target-{i}",
+                file_system_id=self.file_system.id,
+                subnet_id=subnet_id,
+                security_groups=[security_group.id],
+                opts=pulumi.ResourceOptions(parent=self)
+            ))
+
+        self.csi_driver = None
+        self.storage_class = None
+        if args.k8s_provider is not None:
+            self._install_csi_driver(name, args)
+
+        # Export outputs
+        self.register_outputs({
+            "file_system": self.file_system,
+            "file_system_id": self.file_system.id,
+            "dns_name": self.file_system.dns_name,
+            "storage_class": self.storage_class
+        })
+
+    def _install_csi_driver(self, name: str, args: EfsArgs):
+        service_account = "efs-csi-controller-sa"
+
+        # Controller role (IRSA); the controller creates an access point per volume.
+        controller_role = aws.iam.Role(
+            f"{name}-csi-controller-role",
+            assume_role_policy=irsa_assume_role_policy(
+                args.oidc_provider_arn,
+                args.oidc_provider_url,
+                args.namespace,
+                service_account
+            ),
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        aws.iam.RolePolicyAttachment(
+            f"{name}-csi-controller-policy",
+            role=controller_role.name,
+            policy_arn="arn:aws:iam::aws:policy/service-role/AmazonEFSCSIDriverPolicy",
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        k8s_opts = pulumi.ResourceOptions(parent=self, provider=args.k8s_provider)
+        self.csi_driver = k8s.helm.v3.Release(
+            f"{name}-csi-driver",
+            name="aws-efs-csi-driver",
+            chart="aws-efs-csi-driver",
+            version=args.csi_driver_version,
+            namespace=args.namespace,
+            repository_opts=k8s.helm.v3.RepositoryOptsArgs(
+                repo="https://kubernetes-sigs.github.io/aws-efs-csi-driver"
+            ),
+            values={
+                "controller": {
+                    "serviceAccount": {
+                        "name": service_account,
+                        "annotations": {
+                            "eks.amazonaws.com/role-arn": controller_role.arn
+                        }
+                    }
+                }
+            },
+            opts=k8s_opts
+        )
+
+        self.storage_class = k8s.storage.v1.StorageClass(
+            f"{name}-storage-class",
+            metadata=k8s.meta.v1.ObjectMetaArgs(name=args.storage_class_name),
+            provisioner="efs.csi.aws.com",
+            parameters={
+                "provisioningMode": "efs-ap",
+                "fileSystemId": self.file_system.id,
+                "directoryPerms": "700",
+                "basePath": "/dynamic"
+            },
+            mount_options=["tls"],
+            reclaim_policy="Delete",
+            volume_binding_mode="Immediate",
+            opts=pulumi.ResourceOptions(
+                parent=self,
+                provider=args.k8s_provider,
+                depends_on=[self.csi_driver] + self.mount_targets
+            )
+        )
@@ -1,3 +1,14 @@
 from .cluster import EksCluster, EksClusterArgs
+from .addons import NodeLocalDns, NodeLocalDnsArgs, max_pods_per_node
+from .karpenter import Karpenter, KarpenterArgs
+from .kubeconfig import render_kubeconfig
+from .launch_template import NodeLaunchTemplate, NodeLaunchTemplateArgs, ImagePrePuller, ImagePrePullerArgs
 
-__all__ = ['EksCluster', 'EksClusterArgs']
\ No newline at end of file
+__all__ = [
+    'EksCluster', 'EksClusterArgs',
+    'NodeLocalDns', 'NodeLocalDnsArgs', 'max_pods_per_node',
+    'Karpenter', 'KarpenterArgs',
+    'NodeLaunchTemplate', 'NodeLaunchTemplateArgs',
+    'ImagePrePuller', 'ImagePrePullerArgs',
+    'render_kubeconfig'
+]
\ No newline at end of file
@@ -0,0 +1,318 @@
+"""AWS EKS Networking Add-ons Module."""
+import ipaddress
+import json
+
+import pulumi
+import pulumi_kubernetes as k8s
+
+
+# (max ENIs, IPv4 addresses per ENI, vCPUs) per instance type, from
+# https://github.com/aws/amazon-vpc-cni-k8s/blob/master/misc/eni-max-pods.txt
+INSTANCE_NETWORK_LIMITS = {
+    "t3.small": (3, 4, 2),
+    "t3.medium": (3, 6, 2),
+    "t3.large": (3, 12, 2),
+    "t3.xlarge": (4, 15, 4),
+    "t3.2xlarge": (4, 15, 8),
+    "t3a.medium": (3, 6, 2),
+    "t3a.large": (3, 12, 2),
+    "m5.large": (3, 10, 2),
+    "m5.xlarge": (4, 15, 4),
+    "m5.2xlarge": (4, 15, 8),
+    "m5.4xlarge": (8, 30, 16),
+    "m6i.large": (3, 10, 2),
+    "m6i.xlarge": (4, 15, 4),
+    "m6i.2xlarge": (4, 15, 8),
+    "m6i.4xlarge": (8, 30, 16),
+    "m6i.8xlarge": (8, 30, 32),
+    "m6id.large": (3, 10, 2),
+    "m6id.xlarge": (4, 15, 4),
+    "m6id.2xlarge": (4, 15, 8),
+    "m6id.4xlarge": (8, 30, 16),
+    "c5.large": (3, 10, 2),
+    "c5.xlarge": (4, 15, 4),
+    "c5.2xlarge": (4, 15, 8),
+    "c6i.large": (3, 10, 2),
+    "c6i.xlarge": (4, 15, 4),
+    "c6i.2xlarge": (4, 15, 8),
+    "c6id.large": (3, 10, 2),
+    "c6id.xlarge": (4, 15, 4),
+    "c6id.2xlarge": (4, 15, 8),
+    "r5.large": (3, 10, 2),
+    "r5.xlarge": (4, 15, 4),
+    "r6i.large": (3, 10, 2),
+    "r6i.xlarge": (4, 15, 4),
+}
+
+# Addresses per /28 prefix assigned to an ENI slot with prefix delegation.
+IPS_PER_PREFIX = 16
+
+
+def max_pods_per_node(instance_type: str, prefix_delegation: bool = False) -> int:
+    """Return the kubelet max-pods value for an instance type.
+
+    Mirrors the VPC CNI max-pods calculator: each ENI keeps its primary
+    address, host-network pods add 2, and with prefix delegation each
+    secondary slot holds a /28 prefix, capped at 110 pods below 30 vCPUs
+    and 250 above.
+    """
+    if instance_type not in INSTANCE_NETWORK_LIMITS:
+        raise ValueError(
+            f"Unknown ENI limits for instance type '{instance_type}'; set max_pods explicitly"
+        )
+    enis, ips_per_eni, vcpus = INSTANCE_NETWORK_LIMITS[instance_type]
+    if not prefix_delegation:
+        return enis * (ips_per_eni - 1) + 2
+    max_pods = enis * (ips_per_eni - 1) * IPS_PER_PREFIX + 2
+    return min(max_pods, 110 if vcpus < 30 else 250)
+
+
+def vpc_cni_configuration(prefix_delegation: bool,
+                          warm_prefix_target: int = None,
+                          warm_ip_target: int = None,
+                          minimum_ip_target: int = None,
+                          ipv6: bool = False) -> str:
+    """Render the vpc-cni add-on configuration values."""
+    env = {"ENABLE_PREFIX_DELEGATION": "true" if prefix_delegation else "false"}
+    if ipv6:
+        # Pods get IPv6 addresses from a delegated /80 per node.
+        env["ENABLE_IPv6"] = "true"
+        env["ENABLE_IPv4"] = "false"
+    if prefix_delegation and warm_prefix_target is not None:
+        env["WARM_PREFIX_TARGET"] = str(warm_prefix_target)
+    if warm_ip_target is not None:
+        env["WARM_IP_TARGET"] = str(warm_ip_target)
+    if minimum_ip_target is not None:
+        env["MINIMUM_IP_TARGET"] = str(minimum_ip_target)
+    return json.dumps({"env": env})
+
+
+def kube_proxy_configuration(mode: str, ipvs_scheduler: str = "rr") -> str:
+    """Render the kube-proxy add-on configuration values."""
+    if mode not in ("iptables", "ipvs"):
+        raise ValueError(f"Unsupported kube-proxy mode '{mode}'")
+    config = {"mode": mode}
+    if mode == "ipvs":
+        config["ipvs"] = {"scheduler": ipvs_scheduler}
+    return json.dumps(config)
+
+
+def coredns_configuration(autoscaling: bool, min_replicas: int, max_replicas: int) -> str:
+    """Render the coredns add-on configuration values."""
+    if not autoscaling:
+        return json.dumps({"replicaCount": min_replicas})
+    return json.dumps({
+        "autoScaling": {
+            "enabled": True,
+            "minReplicas": min_replicas,
+            "maxReplicas": max_replicas
+        }
+    })
+
+
+def cluster_dns_ip(service_cidr: str) -> str:
+    """kube-dns ClusterIP EKS assigns: the tenth address of the service CIDR."""
+    return str(ipaddress.ip_network(service_cidr)[10])
+
+
+COREFILE = """cluster.local:53 {{
+    errors
+    cache {{
+        success 9984 30
+        denial 9984 5
+    }}
+    reload
+    loop
+    bind {bind}
+    forward . __PILLAR__CLUSTER__DNS__ {{
+        force_tcp
+    }}
+    prometheus :9253
+    health {local_ip}:8080
+}}
+in-addr.arpa:53 {{
+    errors
+    cache 30
+    reload
+    loop
+    bind {bind}
+    forward . __PILLAR__CLUSTER__DNS__ {{
+        force_tcp
+    }}
+    prometheus :9253
+}}
+ip6.arpa:53 {{
+    errors
+    cache 30
+    reload
+    loop
+    bind {bind}
+    forward . __PILLAR__CLUSTER__DNS__ {{
+        force_tcp
+    }}
+    prometheus :9253
+}}
+.:53 {{
+    errors
+    cache 30
+    reload
+    loop
+    bind {bind}
+    forward . __PILLAR__UPSTREAM__SERVERS__
+    prometheus :9253
+}}
+"""
+
+
+class NodeLocalDnsArgs:
+    def __init__(self,
+                 kube_dns_ip: pulumi.Input[str],
+                 local_ip: str = "169.254.20.10",
+                 kube_proxy_mode: str = "iptables",
+                 image: str = "registry.k8s.io/dns/k8s-dns-node-cache:1.23.1"):
+        self.kube_dns_ip = kube_dns_ip
+        self.local_ip = local_ip
+        self.kube_proxy_mode = kube_proxy_mode
+        self.image = image
+
+
+class NodeLocalDns(pulumi.ComponentResource):
+    """NodeLocal DNSCache DaemonSet.
+
+    In iptables mode the cache also binds the kube-dns ClusterIP, so pods use
+    it transparently. In IPVS mode it can only bind the link-local address and
+    kubelet's clusterDNS must point at ``local_ip``.
+    """
+
+    def __init__(self, name: str, args: NodeLocalDnsArgs, opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:aws:NodeLocalDns", name, {}, opts)
+
+        labels = {"k8s-app": "node-local-dns"}
+        child_opts = pulumi.ResourceOptions(parent=self)
+
+        if args.kube_proxy_mode == "ipvs":
+            bind = pulumi.Output.from_input(args.local_ip)
+        else:
+            bind = pulumi.Output.concat(args.local_ip, " ", args.kube_dns_ip)
+
+        service_account = k8s.core.v1.ServiceAccount(
+            f"{name}-sa",
+            metadata=k8s.meta.v1.ObjectMetaArgs(
+                name="node-local-dns",
+                namespace="kube-system"
+            ),
+            opts=child_opts
+        )
+
+        # Upstream for cache misses; node-cache resolves its ClusterIP at start.
+        k8s.core.v1.Service(
+            f"{name}-upstream",
+            metadata=k8s.meta.v1.ObjectMetaArgs(
+                name="kube-dns-upstream",
+                namespace="kube-system",
+                labels={"k8s-app": "kube-dns"}
+            ),
+            spec=k8s.core.v1.ServiceSpecArgs(
+                selector={"k8s-app": "kube-dns"},
+                ports=[
+                    k8s.core.v1.ServicePortArgs(name="dns", port=53, protocol="UDP", target_port=53),
+                    k8s.core.v1.ServicePortArgs(name="dns-tcp", port=53, protocol="TCP", target_port=53)
+                ]
+            ),
+            opts=child_opts
+        )
+
+        config_map = k8s.core.v1.ConfigMap(
+            f"{name}-config",
+            metadata=k8s.meta.v1.ObjectMetaArgs(
+                name="node-local-dns",
+                namespace="kube-system"
+            ),
+            data={
+                "Corefile": bind.apply(
+                    lambda b: COREFILE.format(bind=b, local_ip=args.local_ip)
+                )
+            },
+            opts=child_opts
+        )
+
+        local_ips = bind.apply(lambda b: ",".join(b.split()))
+
+        self.daemon_set = k8s.apps.v1.DaemonSet(
+            f"{name}-daemonset",
+            metadata=k8s.meta.v1.ObjectMetaArgs(
+                name="node-local-dns",
+                namespace="kube-system",
+                labels=labels
+            ),
+            spec=k8s.apps.v1.DaemonSetSpecArgs(
+                selector=k8s.meta.v1.LabelSelectorArgs(match_labels=labels),
+                update_strategy=k8s.apps.v1.DaemonSetUpdateStrategyArgs(
+                    rolling_update=k8s.apps.v1.RollingUpdateDaemonSetArgs(max_unavailable="10%")
+                ),
+                template=k8s.core.v1.PodTemplateSpecArgs(
+                    metadata=k8s.meta.v1.ObjectMetaArgs(labels=labels),
+                    spec=k8s.core.v1.PodSpecArgs(
+                        priority_class_name="system-node-critical",
+                        service_account_name=service_account.metadata.name,
+                        host_network=True,
+                        dns_policy="Default",
+                        tolerations=[k8s.core.v1.TolerationArgs(operator="Exists")],
+                        containers=[k8s.core.v1.ContainerArgs(
+                            name="node-cache",
+                            image=args.image,
+                            args=[
+                                "-localip", local_ips,
+                                "-conf", "/etc/Corefile",
+                                "-upstreamsvc", "kube-dns-upstream"
+                            ],
+                            resources=k8s.core.v1.ResourceRequirementsArgs(
+                                requests={"cpu": "25m", "memory": "5Mi"}
+                            ),
+                            security_context=k8s.core.v1.SecurityContextArgs(
+                                capabilities=k8s.core.v1.CapabilitiesArgs(add=["NET_ADMIN"])
+                            ),
+                            ports=[
+                                k8s.core.v1.ContainerPortArgs(name="dns", container_port=53, protocol="UDP"),
+                                k8s.core.v1.ContainerPortArgs(name="dns-tcp", container_port=53, protocol="TCP"),
+                                k8s.core.v1.ContainerPortArgs(name="metrics", container_port=9253, protocol="TCP")
+                            ],
+                            liveness_probe=k8s.core.v1.ProbeArgs(
+                                http_get=k8s.core.v1.HTTPGetActionArgs(
+                                    host=args.local_ip,
+                                    path="/health",
+                                    port=8080
+                                ),
+                                initial_delay_seconds=60,
+                                timeout_seconds=5
+                            ),
+                            volume_mounts=[
+                                k8s.core.v1.VolumeMountArgs(name="xtables-lock", mount_path="/run/xtables.lock"),
+                                k8s.core.v1.VolumeMountArgs(name="config-volume", mount_path="/etc/coredns")
+                            ]
+                        )],
+                        volumes=[
+                            k8s.core.v1.VolumeArgs(
+                                name="xtables-lock",
+                                host_path=k8s.core.v1.HostPathVolumeSourceArgs(
+                                    path="/run/xtables.lock",
+                                    type="FileOrCreate"
+                                )
+                            ),
+                            k8s.core.v1.VolumeArgs(
+                                name="config-volume",
+                                config_map=k8s.core.v1.ConfigMapVolumeSourceArgs(
+                                    name=config_map.metadata.name,
+                                    items=[k8s.core.v1.KeyToPathArgs(key="Corefile", path="Corefile.base")]
+                                )
+                            )
+                        ]
+                    )
+                )
+            ),
+            opts=child_opts
+        )
+
+        self.register_outputs({
+            "daemon_set": self.daemon_set
+        })
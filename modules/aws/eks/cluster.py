@@ -1,8 +1,28 @@
 """AWS EKS Cluster Module."""
+import ipaddress
+
 import pulumi
 import pulumi_aws as aws
 import pulumi_kubernetes as k8s
 
+from .addons import (
+    NodeLocalDns,
+    NodeLocalDnsArgs,
+    cluster_dns_ip,
+    coredns_configuration,
+    kube_proxy_configuration,
+    max_pods_per_node,
+    vpc_cni_configuration,
+)
+from .karpenter import Karpenter, KarpenterArgs
+from .kubeconfig import render_kubeconfig
+from .launch_template import (
+    ImagePrePuller,
+    ImagePrePullerArgs,
+    NodeLaunchTemplate,
+    NodeLaunchTemplateArgs,
+)
+
 
 class EksClusterArgs:
     def __init__(self,
@@ -15,7 +35,29 @@ class EksClusterArgs:
                  max_size: int = 3,
                  desired_size: int = 1,
                  kubernetes_version: str = "1.27",
-                 enable_cluster_logging: bool = True):
+                 ip_family: str = "ipv4",
+                 enable_cluster_logging: bool = True,
+                 manage_networking_addons: bool = True,
+                 vpc_cni_prefix_delegation: bool = True,
+                 vpc_cni_warm_prefix_target: int = 1,
+                 vpc_cni_warm_ip_target: int = None,
+                 vpc_cni_minimum_ip_target: int = None,
+                 kube_proxy_mode: str = "ipvs",
+                 coredns_autoscaling: bool = True,
+                 coredns_min_replicas: int = 2,
+                 coredns_max_replicas: int = 10,
+                 enable_node_local_dns: bool = False,
+                 node_local_dns_ip: str = "169.254.20.10",
+                 addon_versions: dict = None,
+                 max_pods: int = None,
+                 node_launch_template: NodeLaunchTemplateArgs = None,
+                 enable_oidc_provider: bool = False,
+                 enable_karpenter: bool = False,
+                 karpenter_version: str = "1.1.1",
+                 karpenter_capacity_types: list = None,
+                 karpenter_cpu_limit: int = 100,
+                 kubeconfig_role_arn: str = None,
+                 kubeconfig_token_cache_command: str = None):
         self.name = name
         self.vpc_id = vpc_id
         self.private_subnet_ids = private_subnet_ids
@@ -25,13 +67,48 @@ class EksClusterArgs:
         self.max_size = max_size
         self.desired_size = desired_size
         self.kubernetes_version = kubernetes_version
+        self.ip_family = ip_family
         self.enable_cluster_logging = enable_cluster_logging
+        self.manage_networking_addons = manage_networking_addons
+        self.vpc_cni_prefix_delegation = vpc_cni_prefix_delegation
+        self.vpc_cni_warm_prefix_target = vpc_cni_warm_prefix_target
+        self.vpc_cni_warm_ip_target = vpc_cni_warm_ip_target
+        self.vpc_cni_minimum_ip_target = vpc_cni_minimum_ip_target
+        self.kube_proxy_mode = kube_proxy_mode
+        self.coredns_autoscaling = coredns_autoscaling
+        self.coredns_min_replicas = coredns_min_replicas
+        self.coredns_max_replicas = coredns_max_replicas
+        self.enable_node_local_dns = enable_node_local_dns
+        self.node_local_dns_ip = node_local_dns_ip
+        self.addon_versions = addon_versions or {}
+        self.max_pods = max_pods
+        self.node_launch_template = node_launch_template
+        self.enable_oidc_provider = enable_oidc_provider or enable_karpenter
+        self.enable_karpenter = enable_karpenter
+        self.karpenter_version = karpenter_version
+        self.karpenter_capacity_types = karpenter_capacity_types or ["on-demand"]
+        self.karpenter_cpu_limit = karpenter_cpu_limit
+        self.kubeconfig_role_arn = kubeconfig_role_arn
+        self.kubeconfig_token_cache_command = kubeconfig_token_cache_command
 
 
 class EksCluster(pulumi.ComponentResource):
     def __init__(self, name: str, args: EksClusterArgs, opts: pulumi.ResourceOptions = None):
         super().__init__("modules:aws:EksCluster", name, {}, opts)
         
+        ipv6 = args.ip_family == "ipv6"
+        if args.ip_family not in ("ipv4", "ipv6"):
+            raise ValueError(f"Unsupported ip_family '{args.ip_family}'; use ipv4 or ipv6")
+        if ipv6 and not (args.manage_networking_addons and args.vpc_cni_prefix_delegation):
+            raise ValueError("ip_family ipv6 requires the managed vpc-cni add-on with prefix delegation")
+        if ipv6 and args.enable_node_local_dns and ipaddress.ip_address(args.node_local_dns_ip).version != 6:
+            raise ValueError("NodeLocal DNSCache on an ipv6 cluster needs an IPv6 node_local_dns_ip")
+        if args.enable_node_local_dns and args.kube_proxy_mode == "ipvs" and not args.node_launch_template:
+            raise ValueError(
+                "NodeLocal DNSCache with kube-proxy in ipvs mode needs node_launch_template "
+                "to point the kubelet's clusterDNS at the cache"
+            )
+        
         # EKS Cluster Role
         cluster_role = aws.iam.Role(
             f"{name}-cluster-role",
@@ -62,6 +139,9 @@ class EksCluster(pulumi.ComponentResource):
                 endpoint_private_access=True,
                 endpoint_public_access=True
             ),
+            kubernetes_network_config=aws.eks.ClusterKubernetesNetworkConfigArgs(
+                ip_family=args.ip_family
+            ),
             enabled_cluster_log_types=[
                 "api", "audit", "authenticator", "controllerManager", "scheduler"
             ] if args.enable_cluster_logging else [],
@@ -72,8 +152,22 @@ class EksCluster(pulumi.ComponentResource):
             opts=pulumi.ResourceOptions(parent=self)
         )
         
+        # OIDC provider for IAM Roles for Service Accounts
+        self.oidc_provider = None
+        if args.enable_oidc_provider:
+            self.oidc_provider = aws.iam.OpenIdConnectProvider(
+                f"{name}-oidc-provider",
+                url=self.cluster.identities[0].oidcs[0].issuer,
+                client_id_lists=["sts.amazonaws.com"],
+                tags={
+                    "Name": f"{args.name}-oidc-provider",
+                    "ManagedBy": "pulumi"
+                },
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+        
         # Node Group Role
-        node_group_role = aws.iam.Role(
+        self.node_group_role = aws.iam.Role(
             f"{name}-nodegroup-role",
             assume_role_policy=pulumi.Output.json_dumps({
                 "Version": "2012-10-17",
@@ -93,11 +187,102 @@ class EksCluster(pulumi.ComponentResource):
             opts=pulumi.ResourceOptions(parent=self)
         )
         
+        # IPv6 pods get addresses assigned to the node's ENIs, which the
+        # managed CNI policy does not allow.
+        ipv6_cni_policy = None
+        if ipv6:
+            ipv6_cni_policy = aws.iam.RolePolicy(
+                f"{name}-nodegroup-cni-ipv6-policy",
+                role=self.node_group_role.id,
+                policy=pulumi.Output.json_dumps({
+                    "Version": "2012-10-17",
+                    "Statement": [
+                        {
+                            "Effect": "Allow",
+                            "Action": [
+                                "ec2:AssignIpv6Addresses",
+                                "ec2:DescribeInstances",
+                                "ec2:DescribeTags",
+                                "ec2:DescribeNetworkInterfaces",
+                                "ec2:DescribeInstanceTypes"
+                            ],
+                            "Resource": "*"
+                        },
+                        {
+                            "Effect": "Allow",
+                            "Action": "ec2:CreateTags",
+                            "Resource": "arn:aws:ec2:*:*:network-interface/*"
+                        }
+                    ]
+                }),
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+        
+        # Networking add-ons. vpc-cni must be configured before nodes join so
+        # they come up with prefix delegation and the matching max-pods.
+        self.addons = {}
+        node_group_dependencies = [self.cluster]
+        prefix_delegation = args.manage_networking_addons and args.vpc_cni_prefix_delegation
+        # Only launch templates and Karpenter node classes set max-pods.
+        self.max_pods_per_node = args.max_pods
+        if self.max_pods_per_node is None and (
+            args.node_launch_template or (args.enable_karpenter and prefix_delegation)
+        ):
+            self.max_pods_per_node = self._max_pods(args.instance_types, prefix_delegation)
+        if args.manage_networking_addons:
+            self.addons["vpc-cni"] = self._addon(name, args, "vpc-cni", vpc_cni_configuration(
+                args.vpc_cni_prefix_delegation,
+                warm_prefix_target=args.vpc_cni_warm_prefix_target,
+                warm_ip_target=args.vpc_cni_warm_ip_target,
+                minimum_ip_target=args.vpc_cni_minimum_ip_target,
+                ipv6=ipv6
+            ))
+            self.addons["kube-proxy"] = self._addon(
+                name, args, "kube-proxy", kube_proxy_configuration(args.kube_proxy_mode)
+            )
+            node_group_dependencies.append(self.addons["vpc-cni"])
+        if ipv6_cni_policy is not None:
+            node_group_dependencies.append(ipv6_cni_policy)
+
+        # Address kubelet hands pods for DNS. IPVS cannot intercept the
+        # kube-dns ClusterIP, so with NodeLocal DNSCache pods must use the
+        # link-local cache address instead.
+        kube_dns_ip = self.cluster.kubernetes_network_config.apply(
+            lambda config: cluster_dns_ip(
+                config.service_ipv6_cidr if ipv6 else config.service_ipv4_cidr
+            )
+        )
+        self.cluster_dns_ip = kube_dns_ip
+        if args.enable_node_local_dns and args.kube_proxy_mode == "ipvs":
+            self.cluster_dns_ip = pulumi.Output.from_input(args.node_local_dns_ip)
+
+        # Launch template
+        self.launch_template = None
+        node_group_storage = {"disk_size": 20}
+        if args.node_launch_template:
+            self.launch_template = NodeLaunchTemplate(
+                f"{name}-nodes",
+                args.node_launch_template,
+                instance_types=args.instance_types,
+                max_pods=self.max_pods_per_node,
+                cluster_dns_ip=self.cluster_dns_ip,
+                tags={"Name": f"{args.name}-nodes"},
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+            # Volumes come from the launch template, which excludes disk_size.
+            node_group_storage = {
+                "ami_type": self.launch_template.ami_type,
+                "launch_template": aws.eks.NodeGroupLaunchTemplateArgs(
+                    id=self.launch_template.launch_template.id,
+                    version=self.launch_template.launch_template.latest_version.apply(str)
+                )
+            }
+
         # Node Group
         self.node_group = aws.eks.NodeGroup(
             f"{name}-nodegroup",
             cluster_name=self.cluster.name,
-            node_role_arn=node_group_role.arn,
+            node_role_arn=self.node_group_role.arn,
             subnet_ids=args.private_subnet_ids,
             scaling_config=aws.eks.NodeGroupScalingConfigArgs(
                 desired_size=args.desired_size,
@@ -105,48 +290,41 @@ class EksCluster(pulumi.ComponentResource):
                 max_size=args.max_size
             ),
             instance_types=args.instance_types,
-            disk_size=20,
+            **node_group_storage,
             tags={
                 "Name": f"{args.name}-nodes",
                 "ManagedBy": "pulumi"
             },
             opts=pulumi.ResourceOptions(
                 parent=self,
-                depends_on=[self.cluster]
+                depends_on=node_group_dependencies
             )
         )
         
+        # CoreDNS needs schedulable nodes before the add-on reports healthy.
+        if args.manage_networking_addons:
+            self.addons["coredns"] = self._addon(
+                name, args, "coredns",
+                coredns_configuration(
+                    args.coredns_autoscaling,
+                    args.coredns_min_replicas,
+                    args.coredns_max_replicas
+                ),
+                depends_on=[self.node_group]
+            )
+        
         # Kubeconfig
         self.kubeconfig = pulumi.Output.all(
             self.cluster.name,
             self.cluster.endpoint,
             self.cluster.certificate_authority.data
-        ).apply(lambda args: """
-apiVersion: v1
-clusters:
-- cluster:
-    server: {1}
-    certificate-authority-data: {2}
-  name: {0}
-contexts:
-- context:
-    cluster: {0}
-    user: {0}
-  name: {0}
-current-context: {0}
-kind: Config
-preferences: {{}}
-users:
-- name: {0}
-  user:
-    exec:
-      apiVersion: client.authentication.k8s.io/v1beta1
-      command: aws-iam-authenticator
-      args:
-        - "token"
-        - "-i"
-        - "{0}"
-""".format(args[0], args[1], args[2]))
+        ).apply(lambda values: render_kubeconfig(
+            values[0],
+            values[1],
+            values[2],
+            role_arn=args.kubeconfig_role_arn,
+            token_cache_command=args.kubeconfig_token_cache_command
+        ))
         
         # Kubernetes provider
         self.k8s_provider = k8s.Provider(
@@ -155,10 +333,95 @@ users:
             opts=pulumi.ResourceOptions(parent=self)
         )
         
+        # NodeLocal DNSCache
+        self.node_local_dns = None
+        if args.enable_node_local_dns:
+            self.node_local_dns = NodeLocalDns(
+                f"{name}-node-local-dns",
+                NodeLocalDnsArgs(
+                    kube_dns_ip=kube_dns_ip,
+                    local_ip=args.node_local_dns_ip,
+                    kube_proxy_mode=args.kube_proxy_mode
+                ),
+                opts=pulumi.ResourceOptions(
+                    parent=self,
+                    provider=self.k8s_provider,
+                    depends_on=[self.node_group]
+                )
+            )
+        
+        # Image pre-pull
+        self.image_prepuller = None
+        if args.node_launch_template and args.node_launch_template.prepull_images:
+            self.image_prepuller = ImagePrePuller(
+                f"{name}-image-prepuller",
+                ImagePrePullerArgs(images=args.node_launch_template.prepull_images),
+                opts=pulumi.ResourceOptions(
+                    parent=self,
+                    provider=self.k8s_provider,
+                    depends_on=[self.node_group]
+                )
+            )
+        
+        # Karpenter shares the node role, which the managed node group has
+        # already mapped into aws-auth, and runs on the managed nodes.
+        self.karpenter = None
+        if args.enable_karpenter:
+            self.karpenter = Karpenter(
+                f"{name}-karpenter",
+                KarpenterArgs(
+                    cluster_name=self.cluster.name,
+                    cluster_endpoint=self.cluster.endpoint,
+                    cluster_security_group_id=self.cluster.vpc_config.cluster_security_group_id,
+                    oidc_provider_arn=self.oidc_provider.arn,
+                    oidc_provider_url=self.oidc_provider.url,
+                    node_role=self.node_group_role,
+                    subnet_ids=args.private_subnet_ids,
+                    instance_types=args.instance_types,
+                    capacity_types=args.karpenter_capacity_types,
+                    cpu_limit=args.karpenter_cpu_limit,
+                    max_pods=self.max_pods_per_node if prefix_delegation else None,
+                    ami_alias=f"{args.node_launch_template.ami_family.lower()}@latest"
+                    if args.node_launch_template else "al2023@latest",
+                    version=args.karpenter_version
+                ),
+                opts=pulumi.ResourceOptions(
+                    parent=self,
+                    provider=self.k8s_provider,
+                    depends_on=[self.node_group]
+                )
+            )
+        
         # Export outputs
         self.register_outputs({
             "cluster": self.cluster,
             "node_group": self.node_group,
             "kubeconfig": self.kubeconfig,
-            "k8s_provider": self.k8s_provider
-        })
\ No newline at end of file
+            "k8s_provider": self.k8s_provider,
+            "max_pods_per_node": self.max_pods_per_node,
+            "cluster_dns_ip": self.cluster_dns_ip
+        })
+
+    def _max_pods(self, instance_types: list, prefix_delegation: bool):
+        try:
+            return min(max_pods_per_node(t, prefix_delegation) for t in instance_types)
+        except ValueError as error:
+            pulumi.log.warn(f"{error}; nodes keep the AMI's default max-pods", resource=self)
+            return None
+
+    def _addon(self, name: str, args: EksClusterArgs, addon_name: str,
+               configuration_values: str, depends_on: list = None) -> aws.eks.Addon:
+        return aws.eks.Addon(
+            f"{name}-{addon_name}",
+            cluster_name=self.cluster.name,
+            addon_name=addon_name,
+            addon_version=args.addon_versions.get(addon_name),
+            configuration_values=configuration_values,
+            resolve_conflicts_on_create="OVERWRITE",
+            resolve_conflicts_on_update="OVERWRITE",
+            tags={
+                "Name": f"{args.name}-{addon_name}",
+                "ManagedBy": "pulumi"
+            },
+            opts=pulumi.ResourceOptions(parent=self, depends_on=depends_on)
+        )
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""AWS EKS IAM Roles for Service Accounts helpers."""
+import json
+
+import pulumi
+
+
+def irsa_assume_role_policy(oidc_provider_arn: pulumi.Input[str],
+                            oidc_provider_url: pulumi.Input[str],
+                            namespace: str,
+                            service_account: str) -> pulumi.Output:
+    """Trust policy letting one service account assume a role through IRSA."""
+    def render(values):
+        provider_arn, provider_url = values
+        issuer = provider_url.replace("https://", "")
+        return json.dumps({
+            "Version": "2012-10-17",
+            "Statement": [{
+                "Effect": "Allow",
+                "Principal": {
+                    "Federated": provider_arn
+                },
+                "Action": "sts:AssumeRoleWithWebIdentity",
+                "Condition": {
+                    "StringEquals": {
+                        f"{issuer}:aud": "sts.amazonaws.com",
+                        f"{issuer}:sub": f"system:serviceaccount:{namespace}:{service_account}"
+                    }
+                }
+            }]
+        })
+
+    return pulumi.Output.all(oidc_provider_arn, oidc_provider_url).apply(render)
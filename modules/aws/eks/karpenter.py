@@ -0,0 +1,310 @@
+"""AWS EKS Karpenter Module."""
+import pulumi
+import pulumi_aws as aws
+import pulumi_kubernetes as k8s
+
+from .irsa import irsa_assume_role_policy
+
+
+# EventBridge patterns Karpenter drains nodes ahead of.
+INTERRUPTION_EVENTS = {
+    "scheduled-change": {
+        "source": ["aws.health"],
+        "detail-type": ["AWS Health Event"]
+    },
+    "spot-interruption": {
+        "source": ["aws.ec2"],
+        "detail-type": ["EC2 Spot Instance Interruption Warning"]
+    },
+    "rebalance": {
+        "source": ["aws.ec2"],
+        "detail-type": ["EC2 Instance Rebalance Recommendation"]
+    },
+    "instance-state-change": {
+        "source": ["aws.ec2"],
+        "detail-type": ["EC2 Instance State-change Notification"]
+    },
+}
+
+
+class KarpenterArgs:
+    def __init__(self,
+                 cluster_name: pulumi.Input[str],
+                 cluster_endpoint: pulumi.Input[str],
+                 cluster_security_group_id: pulumi.Input[str],
+                 oidc_provider_arn: pulumi.Input[str],
+                 oidc_provider_url: pulumi.Input[str],
+                 node_role: aws.iam.Role,
+                 subnet_ids: pulumi.Input[list],
+                 instance_types: list = None,
+                 capacity_types: list = None,
+                 cpu_limit: int = 100,
+                 max_pods: int = None,
+                 ami_alias: str = "al2023@latest",
+                 consolidate_after: str = "1m",
+                 expire_after: str = "720h",
+                 version: str = "1.1.1",
+                 namespace: str = "kube-system"):
+        self.cluster_name = cluster_name
+        self.cluster_endpoint = cluster_endpoint
+        self.cluster_security_group_id = cluster_security_group_id
+        self.oidc_provider_arn = oidc_provider_arn
+        self.oidc_provider_url = oidc_provider_url
+        self.node_role = node_role
+        self.subnet_ids = subnet_ids
+        self.instance_types = instance_types or ["t3.medium"]
+        self.capacity_types = capacity_types or ["on-demand"]
+        self.cpu_limit = cpu_limit
+        self.max_pods = max_pods
+        self.ami_alias = ami_alias
+        self.consolidate_after = consolidate_after
+        self.expire_after = expire_after
+        self.version = version
+        self.namespace = namespace
+
+
+class Karpenter(pulumi.ComponentResource):
+    """Karpenter controller with its IRSA role, interruption queue and default NodePool.
+
+    Kubernetes objects are created through the provider passed in ``opts``.
+    """
+
+    def __init__(self, name: str, args: KarpenterArgs, opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:aws:Karpenter", name, {}, opts)
+
+        service_account = "karpenter"
+
+        # Interruption queue
+        self.queue = aws.sqs.Queue(
+            f"{name}-interruption",
+            message_retention_seconds=300,
+            sqs_managed_sse_enabled=True,
+            tags={"ManagedBy": "pulumi"},
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        aws.sqs.QueuePolicy(
+            f"{name}-interruption-policy",
+            queue_url=self.queue.id,
+            policy=pulumi.Output.json_dumps({
+                "Version": "2012-10-17",
+                "Statement": [{
+                    "Effect": "Allow",
+                    "Principal": {
+                        "Service": ["events.amazonaws.com", "sqs.amazonaws.com"]
+                    },
+                    "Action": "sqs:SendMessage",
+                    "Resource": self.queue.arn
+                }]
+            }),
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        for event, pattern in INTERRUPTION_EVENTS.items():
+            rule = aws.cloudwatch.EventRule(
+                f"{name}-{event}",
+                event_pattern=pulumi.Output.json_dumps(pattern),
+                tags={"ManagedBy": "pulumi"},
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+            aws.cloudwatch.EventTarget(
+                f"{name}-{event}-target",
+                rule=rule.name,
+                arn=self.queue.arn,
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+
+        # Controller role (IRSA)
+        self.controller_role = aws.iam.Role(
+            f"{name}-controller-role",
+            assume_role_policy=irsa_assume_role_policy(
+                args.oidc_provider_arn,
+                args.oidc_provider_url,
+                args.namespace,
+                service_account
+            ),
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        aws.iam.RolePolicy(
+            f"{name}-controller-policy",
+            role=self.controller_role.id,
+            policy=pulumi.Output.json_dumps({
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Sid": "ProvisionCapacity",
+                        "Effect": "Allow",
+                        "Action": [
+                            "ec2:CreateFleet",
+                            "ec2:CreateLaunchTemplate",
+                            "ec2:CreateTags",
+                            "ec2:DeleteLaunchTemplate",
+                            "ec2:RunInstances"
+                        ],
+                        "Resource": "*"
+                    },
+                    {
+                        "Sid": "TerminateOwnedInstances",
+                        "Effect": "Allow",
+                        "Action": "ec2:TerminateInstances",
+                        "Resource": "*",
+                        "Condition": {
+                            "StringLike": {"ec2:ResourceTag/karpenter.sh/nodepool": "*"}
+                        }
+                    },
+                    {
+                        "Sid": "Discovery",
+                        "Effect": "Allow",
+                        "Action": [
+                            "ec2:DescribeAvailabilityZones",
+                            "ec2:DescribeImages",
+                            "ec2:DescribeInstances",
+                            "ec2:DescribeInstanceTypeOfferings",
+                            "ec2:DescribeInstanceTypes",
+                            "ec2:DescribeLaunchTemplates",
+                            "ec2:DescribeSecurityGroups",
+                            "ec2:DescribeSpotPriceHistory",
+                            "ec2:DescribeSubnets",
+                            "pricing:GetProducts",
+                            "ssm:GetParameter"
+                        ],
+                        "Resource": "*"
+                    },
+                    {
+                        "Sid": "PassNodeRole",
+                        "Effect": "Allow",
+                        "Action": "iam:PassRole",
+                        "Resource": args.node_role.arn
+                    },
+                    {
+                        "Sid": "ManageInstanceProfiles",
+                        "Effect": "Allow",
+                        "Action": [
+                            "iam:AddRoleToInstanceProfile",
+                            "iam:CreateInstanceProfile",
+                            "iam:DeleteInstanceProfile",
+                            "iam:GetInstanceProfile",
+                            "iam:ListInstanceProfiles",
+                            "iam:RemoveRoleFromInstanceProfile",
+                            "iam:TagInstanceProfile"
+                        ],
+                        "Resource": "*"
+                    },
+                    {
+                        "Sid": "DescribeCluster",
+                        "Effect": "Allow",
+                        "Action": "eks:DescribeCluster",
+                        "Resource": "*"
+                    },
+                    {
+                        "Sid": "InterruptionQueue",
+                        "Effect": "Allow",
+                        "Action": [
+                            "sqs:DeleteMessage",
+                            "sqs:GetQueueUrl",
+                            "sqs:ReceiveMessage"
+                        ],
+                        "Resource": self.queue.arn
+                    }
+                ]
+            }),
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        # Controller
+        self.release = k8s.helm.v3.Release(
+            f"{name}-release",
+            name="karpenter",
+            chart="oci://public.ecr.aws/karpenter/karpenter",
+            version=args.version,
+            namespace=args.namespace,
+            values={
+                "serviceAccount": {
+                    "name": service_account,
+                    "annotations": {
+                        "eks.amazonaws.com/role-arn": self.controller_role.arn
+                    }
+                },
+                "settings": {
+                    "clusterName": args.cluster_name,
+                    "clusterEndpoint": args.cluster_endpoint,
+                    "interruptionQueue": self.queue.name,
+                    # Launch as soon as pending pods stop arriving instead
+                    # of waiting out the default batching window.
+                    "batchIdleDuration": "1s",
+                    "batchMaxDuration": "10s"
+                },
+                "controller": {
+                    "resources": {
+                        "requests": {"cpu": "250m", "memory": "512Mi"}
+                    }
+                }
+            },
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        # Default EC2NodeClass and NodePool
+        node_class_spec = {
+            "role": args.node_role.name,
+            "amiSelectorTerms": [{"alias": args.ami_alias}],
+            "subnetSelectorTerms": pulumi.Output.from_input(args.subnet_ids).apply(
+                lambda ids: [{"id": subnet_id} for subnet_id in ids]
+            ),
+            "securityGroupSelectorTerms": [{"id": args.cluster_security_group_id}],
+            "tags": {"ManagedBy": "pulumi"}
+        }
+        if args.max_pods:
+            node_class_spec["kubelet"] = {"maxPods": args.max_pods}
+
+        self.node_class = k8s.apiextensions.CustomResource(
+            f"{name}-node-class",
+            api_version="karpenter.k8s.aws/v1",
+            kind="EC2NodeClass",
+            metadata=k8s.meta.v1.ObjectMetaArgs(name="default"),
+            spec=node_class_spec,
+            opts=pulumi.ResourceOptions(parent=self, depends_on=[self.release])
+        )
+
+        self.node_pool = k8s.apiextensions.CustomResource(
+            f"{name}-node-pool",
+            api_version="karpenter.sh/v1",
+            kind="NodePool",
+            metadata=k8s.meta.v1.ObjectMetaArgs(name="default"),
+            spec={
+                "template": {
+                    "spec": {
+                        "nodeClassRef": {
+                            "group": "karpenter.k8s.aws",
+                            "kind": "EC2NodeClass",
+                            "name": self.node_class.metadata["name"]
+                        },
+                        "requirements": [
+                            {
+                                "key": "node.kubernetes.io/instance-type",
+                                "operator": "In",
+                                "values": args.instance_types
+                            },
+                            {
+                                "key": "karpenter.sh/capacity-type",
+                                "operator": "In",
+                                "values": args.capacity_types
+                            }
+                        ],
+                        "expireAfter": args.expire_after
+                    }
+                },
+                "limits": {"cpu": str(args.cpu_limit)},
+                "disruption": {
+                    "consolidationPolicy": "WhenEmptyOrUnderutilized",
+                    "consolidateAfter": args.consolidate_after
+                }
+            },
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        self.register_outputs({
+            "controller_role_arn": self.controller_role.arn,
+            "interruption_queue_name": self.queue.name,
+            "node_pool": self.node_pool
+        })
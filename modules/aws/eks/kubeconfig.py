@@ -0,0 +1,56 @@
+"""AWS EKS Kubeconfig Rendering."""
+
+TEMPLATE = """
+apiVersion: v1
+clusters:
+- cluster:
+    server: {endpoint}
+    certificate-authority-data: {ca_data}
+  name: {name}
+contexts:
+- context:
+    cluster: {name}
+    user: {name}
+  name: {name}
+current-context: {name}
+kind: Config
+preferences: {{}}
+users:
+- name: {name}
+  user:
+    exec:
+      apiVersion: client.authentication.k8s.io/v1beta1
+      command: {command}
+      args:
+{args}
+"""
+
+
+def render_kubeconfig(cluster_name: str,
+                      endpoint: str,
+                      ca_data: str,
+                      role_arn: str = None,
+                      token_cache_command: str = None) -> str:
+    """Render a kubeconfig that authenticates with aws-iam-authenticator.
+
+    With ``token_cache_command`` the authenticator is wrapped by the caching
+    exec plugin (scripts/eks_token_cache.py) so tokens are reused until
+    shortly before they expire.
+    """
+    command = "aws-iam-authenticator"
+    args = ["token", "-i", cluster_name]
+    if role_arn:
+        args += ["-r", role_arn]
+    if token_cache_command:
+        cache_args = ["--cluster", cluster_name]
+        if role_arn:
+            cache_args += ["--role-arn", role_arn]
+        args = cache_args + ["--", command] + args
+        command = token_cache_command
+    return TEMPLATE.format(
+        name=cluster_name,
+        endpoint=endpoint,
+        ca_data=ca_data,
+        command=command,
+        args="\n".join(f'        - "{arg}"' for arg in args)
+    )
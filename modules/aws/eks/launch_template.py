@@ -0,0 +1,292 @@
+"""AWS EKS Node Launch Template Module."""
+import base64
+import json
+import re
+
+import pulumi
+import pulumi_aws as aws
+import pulumi_kubernetes as k8s
+
+
+# Managed node group AMI types per family and architecture.
+AMI_TYPES = {
+    ("AL2023", "x86_64"): "AL2023_x86_64_STANDARD",
+    ("AL2023", "arm64"): "AL2023_ARM_64_STANDARD",
+    ("BOTTLEROCKET", "x86_64"): "BOTTLEROCKET_x86_64",
+    ("BOTTLEROCKET", "arm64"): "BOTTLEROCKET_ARM_64",
+}
+
+# Volume holding container images: AL2023 keeps them on the root volume,
+# Bottlerocket on its separate data volume.
+IMAGE_VOLUME_DEVICES = {
+    "AL2023": "/dev/xvda",
+    "BOTTLEROCKET": "/dev/xvdb",
+}
+
+# Space the image volume needs beyond the image cache (OS, kubelet, logs).
+SYSTEM_RESERVED_GIB = {
+    "AL2023": 20,
+    "BOTTLEROCKET": 10,
+}
+
+# gp3 limits: throughput in MiB/s, and at most 0.25 MiB/s per provisioned IOPS.
+GP3_THROUGHPUT_RANGE = (125, 1000)
+GP3_IOPS_RANGE = (3000, 16000)
+
+# Directories Bottlerocket binds onto the instance-store array.
+EPHEMERAL_STORAGE_DIRS = ["/var/lib/containerd", "/var/lib/kubelet", "/var/log/pods"]
+
+# Families with local NVMe: the "d" variants (m6id, c5d, r5dn, m7gd, ...)
+# and the storage-optimized i/im/is/d families.
+INSTANCE_STORE_FAMILY = re.compile(r"^([a-z]+\d[a-z-]*d|(i|im|is|d)\d)")
+# Graviton families (m6g, c7gn, r6gd, ...).
+ARM_FAMILY = re.compile(r"^[a-z]+\d[a-z]*g")
+
+USER_DATA_BOUNDARY = "//"
+
+
+def has_instance_store(instance_type: str) -> bool:
+    """Return True if ``instance_type`` comes with instance-store NVMe volumes."""
+    return bool(INSTANCE_STORE_FAMILY.match(instance_type.split(".")[0]))
+
+
+def ami_type(ami_family: str, instance_types: list) -> str:
+    """Return the managed node group AMI type for the family and instance types."""
+    architectures = {
+        "arm64" if ARM_FAMILY.match(instance_type.split(".")[0]) else "x86_64"
+        for instance_type in instance_types
+    }
+    if len(architectures) > 1:
+        raise ValueError(f"Instance types {instance_types} mix x86_64 and arm64")
+    key = (ami_family, architectures.pop())
+    if key not in AMI_TYPES:
+        raise ValueError(f"Unsupported AMI family '{ami_family}'; use AL2023 or BOTTLEROCKET")
+    return AMI_TYPES[key]
+
+
+def validate_gp3(throughput: int, iops: int):
+    """Raise ValueError unless throughput and IOPS are a valid gp3 combination."""
+    if not GP3_THROUGHPUT_RANGE[0] <= throughput <= GP3_THROUGHPUT_RANGE[1]:
+        raise ValueError(f"gp3 throughput must be {GP3_THROUGHPUT_RANGE[0]}-{GP3_THROUGHPUT_RANGE[1]} MiB/s")
+    if not GP3_IOPS_RANGE[0] <= iops <= GP3_IOPS_RANGE[1]:
+        raise ValueError(f"gp3 IOPS must be {GP3_IOPS_RANGE[0]}-{GP3_IOPS_RANGE[1]}")
+    if throughput > iops / 4:
+        raise ValueError(f"gp3 throughput {throughput} MiB/s needs at least {throughput * 4} IOPS")
+
+
+def al2023_user_data(max_pods: int, cluster_dns_ip: str, instance_store: bool) -> str:
+    """Render a nodeadm NodeConfig as a MIME multi-part document.
+
+    EKS merges it with the NodeConfig it generates for the node group, so
+    only the settings that differ from the defaults are included.
+    """
+    kubelet_config = {"clusterDNS": [cluster_dns_ip]}
+    if max_pods is not None:
+        kubelet_config["maxPods"] = max_pods
+    spec = {"kubelet": {"config": kubelet_config}}
+    if instance_store:
+        # RAID0 the instance-store volumes and mount containerd and kubelet state on them.
+        spec["instance"] = {"localStorage": {"strategy": "RAID0"}}
+    node_config = json.dumps({
+        "apiVersion": "node.eks.aws/v1alpha1",
+        "kind": "NodeConfig",
+        "spec": spec
+    }, indent=2)
+    return "\n".join([
+        "MIME-Version: 1.0",
+        f'Content-Type: multipart/mixed; boundary="{USER_DATA_BOUNDARY}"',
+        "",
+        f"--{USER_DATA_BOUNDARY}",
+        "Content-Type: application/node.eks.aws",
+        "",
+        node_config,
+        "",
+        f"--{USER_DATA_BOUNDARY}--",
+        ""
+    ])
+
+
+def bottlerocket_user_data(max_pods: int, cluster_dns_ip: str, instance_store: bool) -> str:
+    """Render Bottlerocket TOML settings; EKS adds the cluster connection settings."""
+    lines = ["[settings.kubernetes]"]
+    if max_pods is not None:
+        lines.append(f"max-pods = {max_pods}")
+    lines.append(f"cluster-dns-ip = {json.dumps(cluster_dns_ip)}")
+    if instance_store:
+        commands = [
+            ["apiclient", "ephemeral-storage", "init"],
+            ["apiclient", "ephemeral-storage", "bind", "--dirs", *EPHEMERAL_STORAGE_DIRS],
+        ]
+        lines += [
+            "",
+            "[settings.bootstrap-commands.k8s-ephemeral-storage]",
+            f"commands = {json.dumps(commands)}",
+            "essential = true",
+            'mode = "always"',
+        ]
+    return "\n".join(lines) + "\n"
+
+
+USER_DATA_RENDERERS = {
+    "AL2023": al2023_user_data,
+    "BOTTLEROCKET": bottlerocket_user_data,
+}
+
+
+class NodeLaunchTemplateArgs:
+    def __init__(self,
+                 ami_family: str = "AL2023",
+                 image_cache_size_gib: int = 60,
+                 volume_throughput: int = 250,
+                 volume_iops: int = 3000,
+                 use_instance_store: bool = True,
+                 prepull_images: list = None):
+        self.ami_family = ami_family.upper()
+        self.image_cache_size_gib = image_cache_size_gib
+        self.volume_throughput = volume_throughput
+        self.volume_iops = volume_iops
+        self.use_instance_store = use_instance_store
+        self.prepull_images = prepull_images or []
+
+
+class NodeLaunchTemplate(pulumi.ComponentResource):
+    """Launch template for a managed node group built from structured settings.
+
+    The image volume is a gp3 volume sized for the image cache with its own
+    throughput and IOPS. When every instance type has instance-store NVMe,
+    container and kubelet storage moves onto it. User data sets max-pods
+    and the cluster DNS address in the AMI family's native format; without
+    ``max_pods`` the AMI's default applies.
+    """
+
+    def __init__(self, name: str, args: NodeLaunchTemplateArgs, instance_types: list,
+                 max_pods: int, cluster_dns_ip: pulumi.Input[str], tags: dict = None,
+                 opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:aws:NodeLaunchTemplate", name, {}, opts)
+
+        self.ami_type = ami_type(args.ami_family, instance_types)
+        validate_gp3(args.volume_throughput, args.volume_iops)
+
+        with_instance_store = [t for t in instance_types if has_instance_store(t)]
+        self.instance_store = args.use_instance_store and len(with_instance_store) == len(instance_types)
+        if args.use_instance_store and with_instance_store and not self.instance_store:
+            pulumi.log.warn(
+                f"Only {with_instance_store} of {instance_types} have instance-store NVMe; "
+                "container storage stays on the EBS volume",
+                resource=self
+            )
+
+        render = USER_DATA_RENDERERS[args.ami_family]
+        user_data = pulumi.Output.from_input(cluster_dns_ip).apply(
+            lambda dns_ip: base64.b64encode(
+                render(max_pods, dns_ip, self.instance_store).encode()
+            ).decode()
+        )
+
+        tags = {"ManagedBy": "pulumi", **(tags or {})}
+        self.volume_size = args.image_cache_size_gib + SYSTEM_RESERVED_GIB[args.ami_family]
+        self.launch_template = aws.ec2.LaunchTemplate(
+            f"{name}-lt",
+            update_default_version=True,
+            block_device_mappings=[
+                aws.ec2.LaunchTemplateBlockDeviceMappingArgs(
+                    device_name=IMAGE_VOLUME_DEVICES[args.ami_family],
+                    ebs=aws.ec2.LaunchTemplateBlockDeviceMappingEbsArgs(
+                        volume_size=self.volume_size,
+                        volume_type="gp3",
+                        throughput=args.volume_throughput,
+                        iops=args.volume_iops,
+                        encrypted="true",
+                        delete_on_termination="true"
+                    )
+                )
+            ],
+            metadata_options=aws.ec2.LaunchTemplateMetadataOptionsArgs(
+                http_endpoint="enabled",
+                http_tokens="required",
+                # Pods reach IMDS through one extra hop.
+                http_put_response_hop_limit=2
+            ),
+            user_data=user_data,
+            tag_specifications=[
+                aws.ec2.LaunchTemplateTagSpecificationArgs(resource_type=resource_type, tags=tags)
+                for resource_type in ("instance", "volume")
+            ],
+            tags=tags,
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        self.register_outputs({
+            "launch_template_id": self.launch_template.id,
+            "ami_type": self.ami_type,
+            "instance_store": self.instance_store
+        })
+
+
+class ImagePrePullerArgs:
+    def __init__(self,
+                 images: list,
+                 namespace: str = "kube-system",
+                 pause_image: str = "registry.k8s.io/pause:3.9"):
+        self.images = images
+        self.namespace = namespace
+        self.pause_image = pause_image
+
+
+class ImagePrePuller(pulumi.ComponentResource):
+    """DaemonSet that pulls a list of images onto every node as it joins.
+
+    Each image runs as an init container that exits immediately, so pulls
+    go through kubelet and its ECR credential provider and the images stay
+    in the node's cache. Images must contain ``/bin/sh``. Kubernetes objects
+    are created through the provider passed in ``opts``.
+    """
+
+    def __init__(self, name: str, args: ImagePrePullerArgs, opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:aws:ImagePrePuller", name, {}, opts)
+
+        labels = {"app.kubernetes.io/name": "image-prepuller"}
+        self.daemon_set = k8s.apps.v1.DaemonSet(
+            f"{name}-daemonset",
+            metadata=k8s.meta.v1.ObjectMetaArgs(name="image-prepuller", namespace=args.namespace),
+            spec=k8s.apps.v1.DaemonSetSpecArgs(
+                selector=k8s.meta.v1.LabelSelectorArgs(match_labels=labels),
+                update_strategy=k8s.apps.v1.DaemonSetUpdateStrategyArgs(
+                    type="RollingUpdate",
+                    rolling_update=k8s.apps.v1.RollingUpdateDaemonSetArgs(max_unavailable="100%")
+                ),
+                template=k8s.core.v1.PodTemplateSpecArgs(
+                    metadata=k8s.meta.v1.ObjectMetaArgs(labels=labels),
+                    spec=k8s.core.v1.PodSpecArgs(
+                        priority_class_name="system-node-critical",
+                        tolerations=[k8s.core.v1.TolerationArgs(operator="Exists")],
+                        init_containers=[
+                            k8s.core.v1.ContainerArgs(
+                                name=f"pull-{i}",
+                                image=image,
+                                image_pull_policy="IfNotPresent",
+                                command=["/bin/sh", "-c", "true"],
+                                resources=k8s.core.v1.ResourceRequirementsArgs(
+                                    requests={"cpu": "1m", "memory": "8Mi"}
+                                )
+                            )
+                            for i, image in enumerate(args.images)
+                        ],
+                        containers=[
+                            k8s.core.v1.ContainerArgs(
+                                name="pause",
+                                image=args.pause_image,
+                                resources=k8s.core.v1.ResourceRequirementsArgs(
+                                    requests={"cpu": "1m", "memory": "8Mi"}
+                                )
+                            )
+                        ]
+                    )
+                )
+            ),
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        self.register_outputs({
+            "daemon_set": self.daemon_set
+        })
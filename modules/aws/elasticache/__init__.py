@@ -0,0 +1,3 @@
+from .cache import ElastiCache, ElastiCacheArgs
+
+__all__ = ['ElastiCache', 'ElastiCacheArgs']
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""AWS ElastiCache Module."""
+import pulumi
+import pulumi_aws as aws
+
+
+ENGINES = ("valkey", "redis")
+
+# Newest release of each engine; Redis OSS stops at 7.1 on ElastiCache.
+DEFAULT_ENGINE_VERSIONS = {"valkey": "8.0", "redis": "7.1"}
+
+
+def default_parameter_group(engine: str, engine_version: str, cluster_mode: bool) -> str:
+    """Return the default parameter group for an engine version and cluster mode."""
+    family = f"{engine}{engine_version.split('.')[0]}"
+    return f"default.{family}.cluster.on" if cluster_mode else f"default.{family}"
+
+
+class ElastiCacheArgs:
+    def __init__(self,
+                 name: str,
+                 vpc_id: pulumi.Input[str],
+                 subnet_ids: pulumi.Input[list],
+                 engine: str = "valkey",
+                 engine_version: str = None,
+                 node_type: str = "cache.t4g.small",
+                 cluster_mode: bool = True,
+                 num_shards: int = 1,
+                 replicas_per_shard: int = 1,
+                 port: int = 6379,
+                 transit_encryption: bool = True,
+                 snapshot_retention_limit: int = 1,
+                 allowed_cidr_blocks: list = None):
+        self.name = name
+        self.vpc_id = vpc_id
+        self.subnet_ids = subnet_ids
+        self.engine = engine
+        self.engine_version = engine_version or DEFAULT_ENGINE_VERSIONS.get(engine)
+        self.node_type = node_type
+        self.cluster_mode = cluster_mode
+        self.num_shards = num_shards
+        self.replicas_per_shard = replicas_per_shard
+        self.port = port
+        self.transit_encryption = transit_encryption
+        self.snapshot_retention_limit = snapshot_retention_limit
+        self.allowed_cidr_blocks = allowed_cidr_blocks or ["10.0.0.0/8"]
+
+
+class ElastiCache(pulumi.ComponentResource):
+    """Redis or Valkey replication group in private subnets.
+
+    In cluster mode keys are spread over ``num_shards`` shards and both
+    endpoints are the configuration endpoint, which cluster-aware clients
+    use for discovery; reads go to replicas with ``READONLY``. Without
+    cluster mode the primary and reader endpoints are separate.
+    """
+
+    def __init__(self, name: str, args: ElastiCacheArgs, opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:aws:ElastiCache", name, {}, opts)
+
+        if args.engine not in ENGINES:
+            raise ValueError(f"Unsupported cache engine '{args.engine}'; use valkey or redis")
+        if not args.cluster_mode and args.num_shards != 1:
+            raise ValueError("num_shards must be 1 unless cluster_mode is enabled")
+        if args.cluster_mode and args.replicas_per_shard < 1:
+            raise ValueError("cluster_mode needs at least one replica per shard for failover")
+
+        # Cache Subnet Group
+        subnet_group = aws.elasticache.SubnetGroup(
+            f"{name}-subnet-group",
+            subnet_ids=args.subnet_ids,
+            description=f"Subnet group for {args.name}",
+            tags={
+                "Name": f"{args.name}-subnet-group",
+                "ManagedBy": "pulumi"
+            },
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        # Security Group
+        security_group = aws.ec2.SecurityGroup(
+            f"{name}-security-group",
+            vpc_id=args.vpc_id,
+            description=f"Security group for {args.name} cache",
+            ingress=[aws.ec2.SecurityGroupIngressArgs(
+                protocol="tcp",
+                from_port=args.port,
+                to_port=args.port,
+                cidr_blocks=args.allowed_cidr_blocks
+            )],
+            tags={
+                "Name": f"{args.name}-security-group",
+                "ManagedBy": "pulumi"
+            },
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        # Replication Group
+        failover = args.replicas_per_shard > 0
+        self.replication_group = aws.elasticache.ReplicationGroup(
+            f"{name}-replication-group",
+            replication_group_id=args.name,
+            description=f"{args.engine} cache for {args.name}",
+            engine=args.engine,
+            engine_version=args.engine_version,
+            node_type=args.node_type,
+            port=args.port,
+            parameter_group_name=default_parameter_group(
+                args.engine, args.engine_version, args.cluster_mode
+            ),
+            cluster_mode="enabled" if args.cluster_mode else "disabled",
+            num_node_groups=args.num_shards,
+            replicas_per_node_group=args.replicas_per_shard,
+            automatic_failover_enabled=failover,
+            multi_az_enabled=failover,
+            subnet_group_name=subnet_group.name,
+            security_group_ids=[security_group.id],
+            transit_encryption_enabled=args.transit_encryption,
+            at_rest_encryption_enabled=True,
+            snapshot_retention_limit=args.snapshot_retention_limit,
+            tags={
+                "Name": args.name,
+                "ManagedBy": "pulumi"
+            },
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        if args.cluster_mode:
+            self.primary_endpoint = self.replication_group.configuration_endpoint_address
+            self.reader_endpoint = self.replication_group.configuration_endpoint_address
+        else:
+            self.primary_endpoint = self.replication_group.primary_endpoint_address
+            self.reader_endpoint = self.replication_group.reader_endpoint_address
+
+        # Export outputs
+        self.register_outputs({
+            "replication_group": self.replication_group,
+            "primary_endpoint": self.primary_endpoint,
+            "reader_endpoint": self.reader_endpoint
+        })
@@ -3,6 +3,19 @@ import pulumi
 import pulumi_aws as aws
 
 
+# Classes Performance Insights does not support.
+PERFORMANCE_INSIGHTS_UNSUPPORTED = {
+    "db.t2.micro", "db.t2.small",
+    "db.t3.micro", "db.t3.small",
+    "db.t4g.micro", "db.t4g.small",
+}
+
+
+def parameter_group_family(engine: str, engine_version: str) -> str:
+    """``postgres``, ``13.7`` -> ``postgres13``."""
+    return f"{engine}{engine_version.split('.')[0]}"
+
+
 class RdsDatabaseArgs:
     def __init__(self,
                  name: str,
@@ -16,7 +29,13 @@ class RdsDatabaseArgs:
                  username: str = "admin",
                  multi_az: bool = False,
                  backup_retention_period: int = 7,
-                 storage_encrypted: bool = True):
+                 storage_encrypted: bool = True,
+                 deletion_protection: bool = False,
+                 allowed_cidr_blocks: list = None,
+                 enable_observability: bool = False,
+                 performance_insights_retention_days: int = 7,
+                 monitoring_interval: int = 60,
+                 slow_query_threshold_ms: int = 500):
         self.name = name
         self.vpc_id = vpc_id
         self.subnet_ids = subnet_ids
@@ -29,6 +48,12 @@ class RdsDatabaseArgs:
         self.multi_az = multi_az
         self.backup_retention_period = backup_retention_period
         self.storage_encrypted = storage_encrypted
+        self.deletion_protection = deletion_protection
+        self.allowed_cidr_blocks = allowed_cidr_blocks or ["10.0.0.0/8"]
+        self.enable_observability = enable_observability
+        self.performance_insights_retention_days = performance_insights_retention_days
+        self.monitoring_interval = monitoring_interval
+        self.slow_query_threshold_ms = slow_query_threshold_ms
 
 
 class RdsDatabase(pulumi.ComponentResource):
@@ -55,7 +80,7 @@ class RdsDatabase(pulumi.ComponentResource):
                 protocol="tcp",
                 from_port=5432,
                 to_port=5432,
-                cidr_blocks=["10.0.0.0/8"]  # Allow from VPC
+                cidr_blocks=args.allowed_cidr_blocks
             )],
             tags={
                 "Name": f"{args.name}-security-group",
@@ -64,6 +89,13 @@ class RdsDatabase(pulumi.ComponentResource):
             opts=pulumi.ResourceOptions(parent=self)
         )
         
+        # Performance instrumentation
+        self.monitoring_role = None
+        self.parameter_group = None
+        observability = {}
+        if args.enable_observability:
+            observability = self._observability(name, args)
+        
         # Database Instance
         self.instance = aws.rds.Instance(
             f"{name}-instance",
@@ -81,7 +113,8 @@ class RdsDatabase(pulumi.ComponentResource):
             backup_retention_period=args.backup_retention_period,
             storage_encrypted=args.storage_encrypted,
             skip_final_snapshot=True,
-            deletion_protection=False,  # Set to True for production
+            deletion_protection=args.deletion_protection,
+            **observability,
             tags={
                 "Name": args.name,
                 "ManagedBy": "pulumi"
@@ -89,9 +122,102 @@ class RdsDatabase(pulumi.ComponentResource):
             opts=pulumi.ResourceOptions(parent=self)
         )
         
+        # Performance Insights and Enhanced Monitoring address the instance
+        # by its resource ID.
+        self.resource_id = self.instance.resource_id
+        self.monitoring_role_arn = self.monitoring_role.arn if self.monitoring_role else None
+        
         # Export outputs
         self.register_outputs({
             "instance": self.instance,
             "endpoint": self.instance.endpoint,
-            "username": self.instance.username
-        })
\ No newline at end of file
+            "username": self.instance.username,
+            "resource_id": self.resource_id,
+            "monitoring_role_arn": self.monitoring_role_arn
+        })
+    
+    def _observability(self, name: str, args: RdsDatabaseArgs) -> dict:
+        """Create the monitoring role and parameter group; return instance arguments."""
+        days = args.performance_insights_retention_days
+        if not (days in (7, 731) or (days % 31 == 0 and 31 <= days <= 713)):
+            raise ValueError(
+                f"Performance Insights retention {days} must be 7, 731 or a multiple of 31"
+            )
+        if args.monitoring_interval not in (1, 5, 10, 15, 30, 60):
+            raise ValueError("monitoring_interval must be 1, 5, 10, 15, 30 or 60 seconds")
+        
+        self.monitoring_role = aws.iam.Role(
+            f"{name}-monitoring-role",
+            assume_role_policy=pulumi.Output.json_dumps({
+                "Version": "2012-10-17",
+                "Statement": [{
+                    "Effect": "Allow",
+                    "Principal": {
+                        "Service": "monitoring.rds.amazonaws.com"
+                    },
+                    "Action": "sts:AssumeRole"
+                }]
+            }),
+            managed_policy_arns=[
+                "arn:aws:iam::aws:policy/service-role/AmazonRDSEnhancedMonitoringRole"
+            ],
+            tags={
+                "Name": f"{args.name}-monitoring-role",
+                "ManagedBy": "pulumi"
+            },
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+        
+        # Static parameters apply at the next reboot.
+        self.parameter_group = aws.rds.ParameterGroup(
+            f"{name}-parameter-group",
+            family=parameter_group_family(args.engine, args.engine_version),
+            description=f"Query instrumentation for {args.name}",
+            parameters=[
+                aws.rds.ParameterGroupParameterArgs(
+                    name="shared_preload_libraries",
+                    value="pg_stat_statements",
+                    apply_method="pending-reboot"
+                ),
+                aws.rds.ParameterGroupParameterArgs(
+                    name="pg_stat_statements.track", value="top"
+                ),
+                aws.rds.ParameterGroupParameterArgs(
+                    name="pg_stat_statements.max",
+                    value="10000",
+                    apply_method="pending-reboot"
+                ),
+                aws.rds.ParameterGroupParameterArgs(
+                    name="track_activity_query_size",
+                    value="4096",
+                    apply_method="pending-reboot"
+                ),
+                aws.rds.ParameterGroupParameterArgs(name="track_io_timing", value="1"),
+                aws.rds.ParameterGroupParameterArgs(
+                    name="log_min_duration_statement",
+                    value=str(args.slow_query_threshold_ms)
+                ),
+            ],
+            tags={
+                "Name": f"{args.name}-parameter-group",
+                "ManagedBy": "pulumi"
+            },
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+        
+        performance_insights = args.instance_class not in PERFORMANCE_INSIGHTS_UNSUPPORTED
+        if not performance_insights:
+            pulumi.log.warn(
+                f"Performance Insights is not available on {args.instance_class}; "
+                "enabling Enhanced Monitoring and pg_stat_statements only",
+                resource=self
+            )
+        return {
+            "parameter_group_name": self.parameter_group.name,
+            "performance_insights_enabled": performance_insights,
+            "performance_insights_retention_period":
+                args.performance_insights_retention_days if performance_insights else None,
+            "monitoring_interval": args.monitoring_interval,
+            "monitoring_role_arn": self.monitoring_role.arn,
+            "enabled_cloudwatch_logs_exports": ["postgresql"],
+        }
\ No newline at end of file
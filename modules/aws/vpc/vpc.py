@@ -1,8 +1,31 @@
 """AWS VPC Module."""
+import ipaddress
+
 import pulumi
 import pulumi_aws as aws
 
 
+# Flow log fields; scripts/flow_log_analyzer.py reads these columns.
+FLOW_LOG_FIELDS = [
+    "version", "account-id", "interface-id", "srcaddr", "dstaddr", "srcport", "dstport",
+    "protocol", "packets", "bytes", "start", "end", "action", "log-status",
+    "vpc-id", "subnet-id", "instance-id", "az-id", "pkt-srcaddr", "pkt-dstaddr",
+    "flow-direction", "traffic-path", "pkt-src-aws-service", "pkt-dst-aws-service",
+]
+
+# Well-known prefix DNS64 synthesizes IPv4-only destinations into; NAT
+# gateways translate it back to IPv4 (NAT64).
+NAT64_PREFIX = "64:ff9b::/96"
+
+
+def ipv6_subnet_cidr(vpc_ipv6_cidr: str, index: int) -> str:
+    """Return the ``index``-th /64 of the VPC's IPv6 block."""
+    network = ipaddress.ip_network(vpc_ipv6_cidr)
+    if index >= 2 ** (64 - network.prefixlen):
+        raise ValueError(f"{vpc_ipv6_cidr} has no /64 number {index}")
+    return str(ipaddress.ip_network((int(network.network_address) + (index << 64), 64)))
+
+
 class VpcArgs:
     def __init__(self,
                  name: str,
@@ -11,6 +34,14 @@ class VpcArgs:
                  single_nat_gateway: bool = False,
                  enable_dns_hostnames: bool = True,
                  enable_dns_support: bool = True,
+                 enable_ipv6: bool = False,
+                 enable_dns64: bool = True,
+                 enable_flow_logs: bool = False,
+                 flow_logs_bucket_arn: str = None,
+                 flow_logs_retention_days: int = 30,
+                 flow_logs_traffic_type: str = "ALL",
+                 flow_logs_aggregation_interval: int = 60,
+                 flow_logs_force_destroy: bool = False,
                  tags: dict = None):
         self.name = name
         self.cidr_block = cidr_block
@@ -18,6 +49,14 @@ class VpcArgs:
         self.single_nat_gateway = single_nat_gateway
         self.enable_dns_hostnames = enable_dns_hostnames
         self.enable_dns_support = enable_dns_support
+        self.enable_ipv6 = enable_ipv6
+        self.enable_dns64 = enable_dns64
+        self.enable_flow_logs = enable_flow_logs
+        self.flow_logs_bucket_arn = flow_logs_bucket_arn
+        self.flow_logs_retention_days = flow_logs_retention_days
+        self.flow_logs_traffic_type = flow_logs_traffic_type
+        self.flow_logs_aggregation_interval = flow_logs_aggregation_interval
+        self.flow_logs_force_destroy = flow_logs_force_destroy
         self.tags = tags or {}
 
 
@@ -39,6 +78,8 @@ class Vpc(pulumi.ComponentResource):
             cidr_block=args.cidr_block,
             enable_dns_hostnames=args.enable_dns_hostnames,
             enable_dns_support=args.enable_dns_support,
+            # Amazon-provided /56; each subnet takes one /64 of it.
+            assign_generated_ipv6_cidr_block=args.enable_ipv6,
             tags=base_tags,
             opts=pulumi.ResourceOptions(parent=self)
         )
@@ -51,21 +92,37 @@ class Vpc(pulumi.ComponentResource):
             opts=pulumi.ResourceOptions(parent=self)
         )
         
+        # Egress-only Internet Gateway for outbound IPv6 from private subnets
+        self.egress_only_igw = None
+        if args.enable_ipv6:
+            self.egress_only_igw = aws.ec2.EgressOnlyInternetGateway(
+                f"{name}-eigw",
+                vpc_id=self.vpc.id,
+                tags={**base_tags, "Name": f"{args.name}-eigw"},
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+        
         # Create subnets
         self.public_subnets = []
         self.private_subnets = []
         
-        # Create 2 public and 2 private subnets across 2 AZs
+        # Create 2 public and 2 private subnets across 2 AZs; private
+        # subnets start at the 11th /24, so the block must hold 12 of them.
         availability_zones = ["a", "b"]
+        network = ipaddress.ip_network(args.cidr_block)
+        if network.prefixlen > 20:
+            raise ValueError(f"VPC cidr_block {args.cidr_block} must be a /20 or larger")
+        subnet_cidrs = list(network.subnets(new_prefix=24))
         
         for i, az in enumerate(availability_zones):
             # Public Subnet
             public_subnet = aws.ec2.Subnet(
                 f"{name}-public-{az}",
                 vpc_id=self.vpc.id,
-                cidr_block=f"10.0.{i}.0/24",
-                availability_zone=f"{pulumi.get_region()}{az}",
+                cidr_block=str(subnet_cidrs[i]),
+                availability_zone=f"{aws.config.region}{az}",
                 map_public_ip_on_launch=True,
+                **self._ipv6_subnet_args(args, i, dns64=False),
                 tags={**base_tags, "Name": f"{args.name}-public-{az}"},
                 opts=pulumi.ResourceOptions(parent=self)
             )
@@ -75,21 +132,28 @@ class Vpc(pulumi.ComponentResource):
             private_subnet = aws.ec2.Subnet(
                 f"{name}-private-{az}",
                 vpc_id=self.vpc.id,
-                cidr_block=f"10.0.{i + 10}.0/24",
-                availability_zone=f"{pulumi.get_region()}{az}",
+                cidr_block=str(subnet_cidrs[i + 10]),
+                availability_zone=f"{aws.config.region}{az}",
+                **self._ipv6_subnet_args(args, i + 10, dns64=args.enable_dns64),
                 tags={**base_tags, "Name": f"{args.name}-private-{az}"},
                 opts=pulumi.ResourceOptions(parent=self)
             )
             self.private_subnets.append(private_subnet)
         
         # Create Route Tables
+        public_routes = [aws.ec2.RouteTableRouteArgs(
+            cidr_block="0.0.0.0/0",
+            gateway_id=self.igw.id,
+        )]
+        if args.enable_ipv6:
+            public_routes.append(aws.ec2.RouteTableRouteArgs(
+                ipv6_cidr_block="::/0",
+                gateway_id=self.igw.id,
+            ))
         self.public_route_table = aws.ec2.RouteTable(
             f"{name}-public-rt",
             vpc_id=self.vpc.id,
-            routes=[aws.ec2.RouteTableRouteArgs(
-                cidr_block="0.0.0.0/0",
-                gateway_id=self.igw.id,
-            )],
+            routes=public_routes,
             tags={**base_tags, "Name": f"{args.name}-public-rt"},
             opts=pulumi.ResourceOptions(parent=self)
         )
@@ -104,9 +168,9 @@ class Vpc(pulumi.ComponentResource):
             )
         
         # Create NAT Gateway if enabled
+        self.private_route_tables = []
+        self.nat_gateways = []
         if args.enable_nat_gateway:
-            self.nat_gateways = []
-            
             for i, subnet in enumerate(self.public_subnets):
                 if args.single_nat_gateway and i > 0:
                     # Reuse first NAT Gateway
@@ -130,23 +194,50 @@ class Vpc(pulumi.ComponentResource):
                     )
                 )
                 self.nat_gateways.append(nat_gw)
-            
-            # Create private route tables with NAT Gateway routes
-            self.private_route_tables = []
+        
+        # Create private route tables with NAT Gateway and egress-only
+        # gateway routes. Routes are separate resources so other components
+        # (e.g. VPN attachments) can add their own without the table
+        # removing them.
+        if args.enable_nat_gateway or args.enable_ipv6:
             for i, subnet in enumerate(self.private_subnets):
                 nat_gw_index = 0 if args.single_nat_gateway else i
                 
                 private_rt = aws.ec2.RouteTable(
                     f"{name}-private-rt-{i}",
                     vpc_id=self.vpc.id,
-                    routes=[aws.ec2.RouteTableRouteArgs(
-                        cidr_block="0.0.0.0/0",
-                        nat_gateway_id=self.nat_gateways[nat_gw_index].id,
-                    )],
                     tags={**base_tags, "Name": f"{args.name}-private-rt-{i}"},
                     opts=pulumi.ResourceOptions(parent=self)
                 )
                 
+                if self.nat_gateways:
+                    aws.ec2.Route(
+                        f"{name}-private-nat-route-{i}",
+                        route_table_id=private_rt.id,
+                        destination_cidr_block="0.0.0.0/0",
+                        nat_gateway_id=self.nat_gateways[nat_gw_index].id,
+                        opts=pulumi.ResourceOptions(parent=self)
+                    )
+                
+                if args.enable_ipv6:
+                    # IPv6 egress bypasses the NAT gateways entirely.
+                    aws.ec2.Route(
+                        f"{name}-private-ipv6-route-{i}",
+                        route_table_id=private_rt.id,
+                        destination_ipv6_cidr_block="::/0",
+                        egress_only_gateway_id=self.egress_only_igw.id,
+                        opts=pulumi.ResourceOptions(parent=self)
+                    )
+                    if args.enable_dns64 and self.nat_gateways:
+                        # IPv6-only clients reach IPv4-only services via NAT64.
+                        aws.ec2.Route(
+                            f"{name}-private-nat64-route-{i}",
+                            route_table_id=private_rt.id,
+                            destination_ipv6_cidr_block=NAT64_PREFIX,
+                            nat_gateway_id=self.nat_gateways[nat_gw_index].id,
+                            opts=pulumi.ResourceOptions(parent=self)
+                        )
+                
                 aws.ec2.RouteTableAssociation(
                     f"{name}-private-rta-{i}",
                     subnet_id=subnet.id,
@@ -155,13 +246,132 @@ class Vpc(pulumi.ComponentResource):
                 )
                 self.private_route_tables.append(private_rt)
         
+        # Flow logs
+        self.flow_log = None
+        self.flow_logs_bucket = None
+        self.flow_logs_bucket_arn = None
+        if args.enable_flow_logs:
+            self._create_flow_logs(name, args, base_tags)
+        
         # Export outputs
         self.vpc_id = self.vpc.id
+        self.ipv6_cidr_block = self.vpc.ipv6_cidr_block if args.enable_ipv6 else None
         self.public_subnet_ids = [subnet.id for subnet in self.public_subnets]
         self.private_subnet_ids = [subnet.id for subnet in self.private_subnets]
+        self.private_route_table_ids = [rt.id for rt in self.private_route_tables]
         
         self.register_outputs({
             "vpc_id": self.vpc_id,
             "public_subnet_ids": self.public_subnet_ids,
             "private_subnet_ids": self.private_subnet_ids,
-        })
\ No newline at end of file
+            "private_route_table_ids": self.private_route_table_ids,
+            "ipv6_cidr_block": self.ipv6_cidr_block,
+            "flow_logs_bucket_arn": self.flow_logs_bucket_arn,
+        })
+    
+    def _ipv6_subnet_args(self, args: VpcArgs, index: int, dns64: bool) -> dict:
+        """Subnet arguments giving the subnet the ``index``-th /64 of the VPC block."""
+        if not args.enable_ipv6:
+            return {}
+        return {
+            "ipv6_cidr_block": self.vpc.ipv6_cidr_block.apply(
+                lambda block: ipv6_subnet_cidr(block, index)
+            ),
+            "assign_ipv6_address_on_creation": True,
+            "enable_dns64": dns64,
+            "enable_resource_name_dns_aaaa_record_on_launch": True,
+        }
+    
+    def _create_flow_logs(self, name: str, args: VpcArgs, base_tags: dict):
+        """Deliver flow logs to S3 as hourly-partitioned Parquet."""
+        bucket_arn = args.flow_logs_bucket_arn
+        if bucket_arn is None:
+            self.flow_logs_bucket = aws.s3.BucketV2(
+                f"{name}-flow-logs",
+                force_destroy=args.flow_logs_force_destroy,
+                tags={**base_tags, "Name": f"{args.name}-flow-logs"},
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+            bucket_arn = self.flow_logs_bucket.arn
+            
+            aws.s3.BucketPublicAccessBlock(
+                f"{name}-flow-logs-public-access",
+                bucket=self.flow_logs_bucket.id,
+                block_public_acls=True,
+                block_public_policy=True,
+                ignore_public_acls=True,
+                restrict_public_buckets=True,
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+            
+            aws.s3.BucketServerSideEncryptionConfigurationV2(
+                f"{name}-flow-logs-encryption",
+                bucket=self.flow_logs_bucket.id,
+                rules=[aws.s3.BucketServerSideEncryptionConfigurationV2RuleArgs(
+                    apply_server_side_encryption_by_default=aws.s3.BucketServerSideEncryptionConfigurationV2RuleApplyServerSideEncryptionByDefaultArgs(
+                        sse_algorithm="AES256"
+                    )
+                )],
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+            
+            aws.s3.BucketLifecycleConfigurationV2(
+                f"{name}-flow-logs-lifecycle",
+                bucket=self.flow_logs_bucket.id,
+                rules=[aws.s3.BucketLifecycleConfigurationV2RuleArgs(
+                    id="expire-flow-logs",
+                    status="Enabled",
+                    filter=aws.s3.BucketLifecycleConfigurationV2RuleFilterArgs(prefix=""),
+                    expiration=aws.s3.BucketLifecycleConfigurationV2RuleExpirationArgs(
+                        days=args.flow_logs_retention_days
+                    )
+                )],
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+            
+            # Log delivery service access
+            aws.s3.BucketPolicy(
+                f"{name}-flow-logs-policy",
+                bucket=self.flow_logs_bucket.id,
+                policy=pulumi.Output.json_dumps({
+                    "Version": "2012-10-17",
+                    "Statement": [
+                        {
+                            "Sid": "AWSLogDeliveryWrite",
+                            "Effect": "Allow",
+                            "Principal": {"Service": "delivery.logs.amazonaws.com"},
+                            "Action": "s3:PutObject",
+                            "Resource": pulumi.Output.concat(bucket_arn, "/AWSLogs/*"),
+                            "Condition": {
+                                "StringEquals": {"s3:x-amz-acl": "bucket-owner-full-control"}
+                            }
+                        },
+                        {
+                            "Sid": "AWSLogDeliveryAclCheck",
+                            "Effect": "Allow",
+                            "Principal": {"Service": "delivery.logs.amazonaws.com"},
+                            "Action": "s3:GetBucketAcl",
+                            "Resource": bucket_arn
+                        }
+                    ]
+                }),
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+        
+        self.flow_log = aws.ec2.FlowLog(
+            f"{name}-flow-log",
+            vpc_id=self.vpc.id,
+            traffic_type=args.flow_logs_traffic_type,
+            log_destination_type="s3",
+            log_destination=bucket_arn,
+            log_format=" ".join(f"${{{field}}}" for field in FLOW_LOG_FIELDS),
+            max_aggregation_interval=args.flow_logs_aggregation_interval,
+            destination_options=aws.ec2.FlowLogDestinationOptionsArgs(
+                file_format="parquet",
+                hive_compatible_partitions=True,
+                per_hour_partition=True
+            ),
+            tags={**base_tags, "Name": f"{args.name}-flow-log"},
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+        self.flow_logs_bucket_arn = bucket_arn
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .ha_vpn import HaVpnMesh, HaVpnMeshArgs, allocate_inside_cidrs, validate_asn, validate_disjoint_ranges, validate_inside_cidrs
+
+__all__ = ['HaVpnMesh', 'HaVpnMeshArgs', 'allocate_inside_cidrs', 'validate_asn', 'validate_disjoint_ranges', 'validate_inside_cidrs']
@@ -0,0 +1,327 @@
+"""AWS to GCP HA VPN Module."""
+import ipaddress
+
+import pulumi
+import pulumi_aws as aws
+import pulumi_gcp as gcp
+
+
+# Tunnels per GCP HA VPN gateway: two AWS VPN connections, two tunnels each.
+TUNNELS_PER_GATEWAY = 4
+
+# Link-local /30s AWS refuses as tunnel inside CIDRs.
+RESERVED_INSIDE_CIDRS = [
+    ipaddress.ip_network(cidr) for cidr in [
+        "169.254.0.0/30",
+        "169.254.1.0/30",
+        "169.254.2.0/30",
+        "169.254.3.0/30",
+        "169.254.4.0/30",
+        "169.254.5.0/30",
+        "169.254.169.252/30",
+    ]
+]
+LINK_LOCAL = ipaddress.ip_network("169.254.0.0/16")
+
+# Private ASN ranges accepted by both Transit Gateway and Cloud Router.
+PRIVATE_ASN_RANGES = [(64512, 65534), (4200000000, 4294967294)]
+
+
+def validate_asn(asn: int, label: str) -> int:
+    """Raise ValueError unless ``asn`` is a private 16- or 32-bit ASN."""
+    if not any(low <= asn <= high for low, high in PRIVATE_ASN_RANGES):
+        raise ValueError(
+            f"{label} ASN {asn} must be in 64512-65534 or 4200000000-4294967294"
+        )
+    return asn
+
+
+def validate_inside_cidrs(cidrs: list) -> list:
+    """Validate tunnel inside CIDRs and return them as networks.
+
+    Each must be a distinct /30 in 169.254.0.0/16 outside the ranges AWS
+    reserves.
+    """
+    networks = []
+    for cidr in cidrs:
+        network = ipaddress.ip_network(cidr)
+        if network.prefixlen != 30 or not network.subnet_of(LINK_LOCAL):
+            raise ValueError(f"Tunnel inside CIDR {cidr} must be a /30 within 169.254.0.0/16")
+        if network in RESERVED_INSIDE_CIDRS:
+            raise ValueError(f"Tunnel inside CIDR {cidr} is reserved by AWS")
+        if any(network.overlaps(other) for other in networks):
+            raise ValueError(f"Tunnel inside CIDR {cidr} overlaps another tunnel")
+        networks.append(network)
+    return networks
+
+
+def validate_disjoint_ranges(aws_ranges: list, gcp_ranges: list) -> list:
+    """Raise ValueError if any AWS range overlaps any GCP range.
+
+    Returns the GCP ranges, which the AWS side routes through the VPN.
+    """
+    for aws_range in aws_ranges:
+        for gcp_range in gcp_ranges:
+            if ipaddress.ip_network(aws_range).overlaps(ipaddress.ip_network(gcp_range)):
+                raise ValueError(f"AWS range {aws_range} overlaps GCP range {gcp_range}")
+    return list(gcp_ranges)
+
+
+def allocate_inside_cidrs(pool: str, count: int) -> list:
+    """Return ``count`` consecutive usable /30s from ``pool``."""
+    candidates = (
+        subnet for subnet in ipaddress.ip_network(pool).subnets(new_prefix=30)
+        if subnet not in RESERVED_INSIDE_CIDRS
+    )
+    cidrs = [str(subnet) for _, subnet in zip(range(count), candidates)]
+    if len(cidrs) < count:
+        raise ValueError(f"Inside CIDR pool {pool} has room for only {len(cidrs)} tunnels")
+    return cidrs
+
+
+class HaVpnMeshArgs:
+    def __init__(self,
+                 name: str,
+                 aws_vpc_id: pulumi.Input[str],
+                 aws_subnet_ids: pulumi.Input[list],
+                 aws_route_table_ids: list,
+                 aws_cidr_block: pulumi.Input[str],
+                 gcp_network: pulumi.Input[str],
+                 gcp_cidr_blocks: pulumi.Input[list],
+                 gcp_region: str = "us-central1",
+                 gcp_project: str = None,
+                 gateway_count: int = 1,
+                 aws_asn: int = 64512,
+                 gcp_asn: int = 65000,
+                 tunnel_inside_cidrs: list = None,
+                 inside_cidr_pool: str = "169.254.100.0/24",
+                 tags: dict = None):
+        self.name = name
+        self.aws_vpc_id = aws_vpc_id
+        self.aws_subnet_ids = aws_subnet_ids
+        self.aws_route_table_ids = aws_route_table_ids
+        self.aws_cidr_block = aws_cidr_block
+        self.gcp_network = gcp_network
+        self.gcp_cidr_blocks = gcp_cidr_blocks
+        self.gcp_region = gcp_region
+        self.gcp_project = gcp_project
+        self.gateway_count = gateway_count
+        self.aws_asn = aws_asn
+        self.gcp_asn = gcp_asn
+        self.tunnel_inside_cidrs = tunnel_inside_cidrs
+        self.inside_cidr_pool = inside_cidr_pool
+        self.tags = tags or {}
+
+
+class HaVpnMesh(pulumi.ComponentResource):
+    """BGP-routed HA VPN between an AWS VPC and a GCP network.
+
+    AWS terminates on a Transit Gateway with ECMP enabled; GCP on
+    ``gateway_count`` HA VPN gateways sharing one Cloud Router. Every gateway
+    carries four tunnels and all peers advertise at the same priority, so
+    both sides spread flows across every tunnel and aggregate bandwidth
+    grows with ``gateway_count``.
+    """
+
+    def __init__(self, name: str, args: HaVpnMeshArgs, opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:common:HaVpnMesh", name, {}, opts)
+
+        # Validate locally before anything reaches either cloud.
+        validate_asn(args.aws_asn, "AWS")
+        validate_asn(args.gcp_asn, "GCP")
+        if args.aws_asn == args.gcp_asn:
+            raise ValueError("AWS and GCP ASNs must differ for eBGP peering")
+        if args.gateway_count < 1:
+            raise ValueError("gateway_count must be at least 1")
+        if not isinstance(args.aws_route_table_ids, (list, tuple)):
+            raise ValueError("aws_route_table_ids must be a list with one entry per route table")
+
+        tunnel_count = TUNNELS_PER_GATEWAY * args.gateway_count
+        inside_cidrs = validate_inside_cidrs(
+            args.tunnel_inside_cidrs or allocate_inside_cidrs(args.inside_cidr_pool, tunnel_count)
+        )
+        if len(inside_cidrs) != tunnel_count:
+            raise ValueError(
+                f"Expected {tunnel_count} tunnel inside CIDRs, got {len(inside_cidrs)}"
+            )
+
+        tags = {"Name": args.name, "ManagedBy": "pulumi", **args.tags}
+        child_opts = pulumi.ResourceOptions(parent=self)
+
+        # AWS side
+        self.transit_gateway = aws.ec2transitgateway.TransitGateway(
+            f"{name}-tgw",
+            description=f"{args.name} cross-cloud VPN",
+            amazon_side_asn=args.aws_asn,
+            vpn_ecmp_support="enable",
+            default_route_table_association="enable",
+            default_route_table_propagation="enable",
+            tags=tags,
+            opts=child_opts
+        )
+
+        self.vpc_attachment = aws.ec2transitgateway.VpcAttachment(
+            f"{name}-vpc-attachment",
+            transit_gateway_id=self.transit_gateway.id,
+            vpc_id=args.aws_vpc_id,
+            subnet_ids=args.aws_subnet_ids,
+            tags=tags,
+            opts=child_opts
+        )
+
+        # The ranges may be outputs of other stacks, so the overlap check runs
+        # once they resolve and fails the deployment before any route lands.
+        gcp_ranges = pulumi.Output.all(args.aws_cidr_block, args.gcp_cidr_blocks).apply(
+            lambda ranges: validate_disjoint_ranges([ranges[0]], ranges[1])
+        )
+        self.gcp_prefix_list = aws.ec2.ManagedPrefixList(
+            f"{name}-gcp-ranges",
+            name=f"{args.name}-gcp-ranges",
+            address_family="IPv4",
+            max_entries=gcp_ranges.apply(len),
+            entries=gcp_ranges.apply(lambda ranges: [
+                aws.ec2.ManagedPrefixListEntryArgs(cidr=cidr, description=f"{args.name} GCP")
+                for cidr in ranges
+            ]),
+            tags=tags,
+            opts=child_opts
+        )
+
+        # Send GCP-bound traffic from the private subnets to the TGW.
+        self.aws_routes = [
+            aws.ec2.Route(
+                f"{name}-gcp-route-{i}",
+                route_table_id=route_table_id,
+                destination_prefix_list_id=self.gcp_prefix_list.id,
+                transit_gateway_id=self.transit_gateway.id,
+                opts=pulumi.ResourceOptions(parent=self, depends_on=[self.vpc_attachment])
+            )
+            for i, route_table_id in enumerate(args.aws_route_table_ids)
+        ]
+
+        # GCP side
+        self.router = gcp.compute.Router(
+            f"{name}-router",
+            name=f"{args.name}-router",
+            region=args.gcp_region,
+            network=args.gcp_network,
+            project=args.gcp_project,
+            bgp=gcp.compute.RouterBgpArgs(asn=args.gcp_asn),
+            opts=child_opts
+        )
+
+        self.gateways = []
+        self.vpn_connections = []
+        self.tunnels = []
+        for g in range(args.gateway_count):
+            gateway = gcp.compute.HaVpnGateway(
+                f"{name}-gateway-{g}",
+                name=f"{args.name}-gateway-{g}",
+                region=args.gcp_region,
+                network=args.gcp_network,
+                project=args.gcp_project,
+                opts=child_opts
+            )
+            self.gateways.append(gateway)
+
+            # One AWS VPN connection per HA VPN interface.
+            connections = []
+            for interface in range(2):
+                customer_gateway = aws.ec2.CustomerGateway(
+                    f"{name}-cgw-{g}-{interface}",
+                    bgp_asn=str(args.gcp_asn),
+                    ip_address=gateway.vpn_interfaces[interface].ip_address,
+                    type="ipsec.1",
+                    tags={**tags, "Name": f"{args.name}-cgw-{g}-{interface}"},
+                    opts=child_opts
+                )
+                first = inside_cidrs[(g * 2 + interface) * 2]
+                second = inside_cidrs[(g * 2 + interface) * 2 + 1]
+                connection = aws.ec2.VpnConnection(
+                    f"{name}-vpn-{g}-{interface}",
+                    customer_gateway_id=customer_gateway.id,
+                    transit_gateway_id=self.transit_gateway.id,
+                    type="ipsec.1",
+                    static_routes_only=False,
+                    tunnel1_inside_cidr=str(first),
+                    tunnel2_inside_cidr=str(second),
+                    tunnel1_ike_versions=["ikev2"],
+                    tunnel2_ike_versions=["ikev2"],
+                    tags={**tags, "Name": f"{args.name}-vpn-{g}-{interface}"},
+                    opts=child_opts
+                )
+                connections.append((interface, connection))
+                self.vpn_connections.append(connection)
+
+            peer_addresses = []
+            for _, connection in connections:
+                peer_addresses += [connection.tunnel1_address, connection.tunnel2_address]
+            external_gateway = gcp.compute.ExternalVpnGateway(
+                f"{name}-aws-gateway-{g}",
+                name=f"{args.name}-aws-gateway-{g}",
+                project=args.gcp_project,
+                redundancy_type="FOUR_IPS_REDUNDANCY",
+                interfaces=[
+                    gcp.compute.ExternalVpnGatewayInterfaceArgs(id=k, ip_address=address)
+                    for k, address in enumerate(peer_addresses)
+                ],
+                opts=child_opts
+            )
+
+            for interface, connection in connections:
+                for t, shared_secret in enumerate([connection.tunnel1_preshared_key,
+                                                   connection.tunnel2_preshared_key]):
+                    k = interface * 2 + t
+                    inside = inside_cidrs[g * TUNNELS_PER_GATEWAY + k]
+                    aws_ip, gcp_ip = inside[1], inside[2]
+                    tunnel_name = f"{args.name}-tunnel-{g}-{k}"
+
+                    tunnel = gcp.compute.VPNTunnel(
+                        f"{name}-tunnel-{g}-{k}",
+                        name=tunnel_name,
+                        region=args.gcp_region,
+                        project=args.gcp_project,
+                        vpn_gateway=gateway.id,
+                        vpn_gateway_interface=interface,
+                        peer_external_gateway=external_gateway.id,
+                        peer_external_gateway_interface=k,
+                        shared_secret=shared_secret,
+                        router=self.router.id,
+                        ike_version=2,
+                        opts=child_opts
+                    )
+                    self.tunnels.append(tunnel)
+
+                    router_interface = gcp.compute.RouterInterface(
+                        f"{name}-interface-{g}-{k}",
+                        name=f"{tunnel_name}-interface",
+                        router=self.router.name,
+                        region=args.gcp_region,
+                        project=args.gcp_project,
+                        ip_range=f"{gcp_ip}/30",
+                        vpn_tunnel=tunnel.name,
+                        opts=child_opts
+                    )
+
+                    # Equal priority on every peer keeps ECMP across tunnels.
+                    gcp.compute.RouterPeer(
+                        f"{name}-peer-{g}-{k}",
+                        name=f"{tunnel_name}-peer",
+                        router=self.router.name,
+                        region=args.gcp_region,
+                        project=args.gcp_project,
+                        interface=router_interface.name,
+                        ip_address=str(gcp_ip),
+                        peer_ip_address=str(aws_ip),
+                        peer_asn=args.aws_asn,
+                        advertised_route_priority=100,
+                        opts=child_opts
+                    )
+
+        self.tunnel_count = tunnel_count
+
+        self.register_outputs({
+            "transit_gateway_id": self.transit_gateway.id,
+            "router_name": self.router.name,
+            "tunnel_count": self.tunnel_count,
+        })
@@ -0,0 +1,3 @@
+from .routing import GlobalRouting, GlobalRoutingArgs, IngressEndpoint, latency_region
+
+__all__ = ['GlobalRouting', 'GlobalRoutingArgs', 'IngressEndpoint', 'latency_region']
\ No newline at end of file
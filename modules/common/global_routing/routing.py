@@ -0,0 +1,187 @@
+"""Route 53 Global Routing Module."""
+import ipaddress
+
+import pulumi
+import pulumi_aws as aws
+
+
+ROUTING_POLICIES = ("latency", "weighted")
+
+# Route 53 measures latency to AWS regions only; GCP regions are routed as
+# the nearest AWS region.
+GCP_LATENCY_REGIONS = {
+    "us-central1": "us-east-2",
+    "us-east1": "us-east-1",
+    "us-east4": "us-east-1",
+    "us-west1": "us-west-2",
+    "us-west2": "us-west-1",
+    "northamerica-northeast1": "ca-central-1",
+    "europe-west1": "eu-west-1",
+    "europe-west2": "eu-west-2",
+    "europe-west3": "eu-central-1",
+    "europe-west4": "eu-central-1",
+    "asia-northeast1": "ap-northeast-1",
+    "asia-southeast1": "ap-southeast-1",
+    "australia-southeast1": "ap-southeast-2",
+}
+
+
+def latency_region(cloud: str, region: str) -> str:
+    """Return the AWS region Route 53 measures latency to for a cloud region."""
+    if cloud == "aws":
+        return region
+    if region not in GCP_LATENCY_REGIONS:
+        raise ValueError(f"No latency region mapped for GCP region '{region}'")
+    return GCP_LATENCY_REGIONS[region]
+
+
+def _is_ip(address: str) -> bool:
+    try:
+        ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return True
+
+
+class IngressEndpoint:
+    """Ingress load balancer of one cluster: a DNS name (EKS) or an IP (GKE)."""
+
+    def __init__(self,
+                 name: str,
+                 cloud: str,
+                 region: str,
+                 address: str,
+                 weight: int = 1):
+        self.name = name
+        self.cloud = cloud
+        self.region = region
+        self.address = address
+        self.weight = weight
+
+
+class GlobalRoutingArgs:
+    def __init__(self,
+                 hostname: str,
+                 zone_id: pulumi.Input[str],
+                 endpoints: list,
+                 routing_policy: str = "latency",
+                 health_check_path: str = "/healthz",
+                 health_check_port: int = 443,
+                 health_check_protocol: str = "HTTPS",
+                 failure_threshold: int = 3,
+                 request_interval: int = 30,
+                 ttl: int = 60,
+                 tags: dict = None):
+        self.hostname = hostname.rstrip(".")
+        self.zone_id = zone_id
+        self.endpoints = endpoints
+        self.routing_policy = routing_policy
+        self.health_check_path = health_check_path
+        self.health_check_port = health_check_port
+        self.health_check_protocol = health_check_protocol
+        self.failure_threshold = failure_threshold
+        self.request_interval = request_interval
+        self.ttl = ttl
+        self.tags = tags or {}
+
+
+class GlobalRouting(pulumi.ComponentResource):
+    """One global hostname answering with the nearest or weighted healthy ingress.
+
+    Every endpoint gets a Route 53 health check and a CNAME record set at
+    ``hostname``. With ``latency`` routing each resolver gets the endpoint in
+    the region closest to it; with ``weighted`` routing answers are split by
+    ``weight``, and endpoints with weight 0 only receive traffic once every
+    weighted endpoint is unhealthy. Unhealthy endpoints drop out of the
+    answers under either policy. IP endpoints are first given an A record
+    at ``<name>.<hostname>`` so all record sets at the hostname share a type.
+
+    Route 53 sends the probed FQDN as Host and SNI, so only IP endpoints are
+    checked under ``hostname``; DNS endpoints are checked under their own
+    name and ``health_check_path`` must answer on any Host.
+    """
+
+    def __init__(self, name: str, args: GlobalRoutingArgs, opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:common:GlobalRouting", name, {}, opts)
+
+        if args.routing_policy not in ROUTING_POLICIES:
+            raise ValueError(
+                f"Unsupported routing policy '{args.routing_policy}'; use latency or weighted"
+            )
+        if not args.endpoints:
+            raise ValueError("GlobalRouting needs at least one ingress endpoint")
+        if len({endpoint.name for endpoint in args.endpoints}) != len(args.endpoints):
+            raise ValueError("Ingress endpoint names must be unique")
+        if args.routing_policy == "weighted":
+            if any(endpoint.weight < 0 or endpoint.weight > 255 for endpoint in args.endpoints):
+                raise ValueError("Weights must be between 0 and 255")
+            if not any(endpoint.weight for endpoint in args.endpoints):
+                raise ValueError("At least one endpoint needs a non-zero weight")
+
+        self.health_checks = {}
+        self.records = {}
+        for endpoint in args.endpoints:
+            is_ip = _is_ip(endpoint.address)
+
+            self.health_checks[endpoint.name] = aws.route53.HealthCheck(
+                f"{name}-{endpoint.name}-health",
+                type=args.health_check_protocol,
+                # IP endpoints are probed with the global name as Host and SNI;
+                # DNS endpoints can only be probed under their own name.
+                ip_address=endpoint.address if is_ip else None,
+                fqdn=args.hostname if is_ip else endpoint.address,
+                port=args.health_check_port,
+                resource_path=args.health_check_path,
+                enable_sni=args.health_check_protocol == "HTTPS",
+                failure_threshold=args.failure_threshold,
+                request_interval=args.request_interval,
+                tags={
+                    "Name": f"{args.hostname}-{endpoint.name}",
+                    "ManagedBy": "pulumi",
+                    **args.tags
+                },
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+
+            target = endpoint.address
+            if is_ip:
+                target = f"{endpoint.name}.{args.hostname}"
+                aws.route53.Record(
+                    f"{name}-{endpoint.name}-address",
+                    zone_id=args.zone_id,
+                    name=target,
+                    type="A",
+                    ttl=args.ttl,
+                    records=[endpoint.address],
+                    opts=pulumi.ResourceOptions(parent=self)
+                )
+
+            if args.routing_policy == "latency":
+                policy = {"latency_routing_policies": [aws.route53.RecordLatencyRoutingPolicyArgs(
+                    region=latency_region(endpoint.cloud, endpoint.region)
+                )]}
+            else:
+                policy = {"weighted_routing_policies": [aws.route53.RecordWeightedRoutingPolicyArgs(
+                    weight=endpoint.weight
+                )]}
+
+            self.records[endpoint.name] = aws.route53.Record(
+                f"{name}-{endpoint.name}",
+                zone_id=args.zone_id,
+                name=args.hostname,
+                type="CNAME",
+                ttl=args.ttl,
+                records=[target],
+                set_identifier=f"{endpoint.name}-{endpoint.region}",
+                health_check_id=self.health_checks[endpoint.name].id,
+                **policy,
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+
+        self.hostname = pulumi.Output.from_input(args.hostname)
+
+        # Export outputs
+        self.register_outputs({
+            "hostname": self.hostname,
+            "health_check_ids": {key: check.id for key, check in self.health_checks.items()}
+        })
@@ -0,0 +1,3 @@
+from .cached_reference import CachedStackReference, CachedStackReferenceArgs
+
+__all__ = ['CachedStackReference', 'CachedStackReferenceArgs']
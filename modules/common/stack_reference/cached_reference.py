@@ -0,0 +1,95 @@
+"""Stack Reference with a Local Read-Through Cache."""
+import json
+import os
+import re
+import tempfile
+import time
+
+import pulumi
+
+
+class CachedStackReferenceArgs:
+    def __init__(self,
+                 stack_name: str,
+                 cache_dir: str = ".stack-cache",
+                 ttl_seconds: int = 3600,
+                 refresh: bool = None):
+        self.stack_name = stack_name
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        # Previews read from the cache; updates always refetch so they never
+        # act on stale outputs.
+        self.refresh = (not pulumi.runtime.is_dry_run()) if refresh is None else refresh
+
+
+class CachedStackReference:
+    """Reads another stack's outputs, caching non-secret ones on local disk.
+
+    The ``StackReference`` itself is always registered, so previews and
+    updates agree on the stack's resources; on a cache hit only its outputs
+    are served from disk. Secret outputs are never written to the cache and
+    are always read through the backend.
+    """
+
+    def __init__(self, name: str, args: CachedStackReferenceArgs, opts: pulumi.ResourceOptions = None):
+        self.name = name
+        self.args = args
+        self.opts = opts
+        self.cache_path = os.path.join(
+            args.cache_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", args.stack_name) + ".json"
+        )
+        self._reference = None
+        self._cached = None if args.refresh else self._load()
+        self._fetch()
+
+    @property
+    def from_cache(self) -> bool:
+        return self._cached is not None
+
+    def get_output(self, key: str) -> pulumi.Output:
+        """Fetch a stack output, or None if the stack has no such output."""
+        if self._cached is not None and key in self._cached:
+            return pulumi.Output.from_input(self._cached[key])
+        return self._fetch().get_output(key)
+
+    def require_output(self, key: str) -> pulumi.Output:
+        """Fetch a stack output, raising if the stack has no such output."""
+        if self._cached is not None and key in self._cached:
+            return pulumi.Output.from_input(self._cached[key])
+        return self._fetch().require_output(key)
+
+    def _fetch(self) -> pulumi.StackReference:
+        if self._reference is None:
+            self._reference = pulumi.StackReference(self.name, self.args.stack_name, opts=self.opts)
+            pulumi.Output.all(
+                self._reference.outputs,
+                self._reference.secret_output_names
+            ).apply(lambda values: self._store(values[0], values[1]))
+        return self._reference
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("fetched_at", 0) > self.args.ttl_seconds:
+            return None
+        return entry.get("outputs")
+
+    def _store(self, outputs: dict, secret_names: list):
+        # Without the list of secret names (older CLIs) nothing can be
+        # cached safely.
+        if outputs is None or secret_names is None:
+            return
+        secret = set(secret_names)
+        entry = {
+            "stack": self.args.stack_name,
+            "fetched_at": time.time(),
+            "outputs": {key: value for key, value in outputs.items() if key not in secret}
+        }
+        os.makedirs(self.args.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.args.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self.cache_path)
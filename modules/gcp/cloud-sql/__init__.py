@@ -1,3 +0,0 @@
-from .database import CloudSqlDatabase, CloudSqlDatabaseArgs
-
-__all__ = ['CloudSqlDatabase', 'CloudSqlDatabaseArgs']
\ No newline at end of file
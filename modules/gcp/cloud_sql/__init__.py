@@ -0,0 +1,4 @@
+from .database import CloudSqlDatabase, CloudSqlDatabaseArgs
+from .pgbouncer import PgBouncer, PgBouncerArgs, cloud_sql_max_connections
+
+__all__ = ['CloudSqlDatabase', 'CloudSqlDatabaseArgs', 'PgBouncer', 'PgBouncerArgs', 'cloud_sql_max_connections']
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""GCP Cloud SQL Database Module."""
+import pulumi
+import pulumi_gcp as gcp
+
+
+class CloudSqlDatabaseArgs:
+    def __init__(self,
+                 name: str,
+                 database_version: str = "POSTGRES_13",
+                 tier: str = "db-f1-micro",
+                 disk_size: int = 20,
+                 availability_type: str = "ZONAL",
+                 backup_enabled: bool = True,
+                 deletion_protection: bool = False,
+                 enable_observability: bool = False,
+                 slow_query_threshold_ms: int = 500,
+                 query_string_length: int = 4096,
+                 query_plans_per_minute: int = 5,
+                 private_network: pulumi.Input[str] = None,
+                 project: str = None):
+        self.name = name
+        self.database_version = database_version
+        self.tier = tier
+        self.disk_size = disk_size
+        self.availability_type = availability_type
+        self.backup_enabled = backup_enabled
+        self.deletion_protection = deletion_protection
+        self.enable_observability = enable_observability
+        self.slow_query_threshold_ms = slow_query_threshold_ms
+        self.query_string_length = query_string_length
+        self.query_plans_per_minute = query_plans_per_minute
+        self.private_network = private_network
+        self.project = project
+
+
+class CloudSqlDatabase(pulumi.ComponentResource):
+    def __init__(self, name: str, args: CloudSqlDatabaseArgs, opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:gcp:CloudSqlDatabase", name, {}, opts)
+        
+        # Query Insights and the same statement statistics and slow query
+        # logging RdsDatabase enables.
+        observability = {}
+        if args.enable_observability:
+            observability = {
+                "insights_config": gcp.sql.DatabaseInstanceSettingsInsightsConfigArgs(
+                    query_insights_enabled=True,
+                    query_string_length=args.query_string_length,
+                    query_plans_per_minute=args.query_plans_per_minute,
+                    record_application_tags=True,
+                    record_client_address=False
+                ),
+                "database_flags": [
+                    gcp.sql.DatabaseInstanceSettingsDatabaseFlagArgs(name=flag, value=value)
+                    for flag, value in [
+                        ("pg_stat_statements.track", "top"),
+                        ("track_activity_query_size", "4096"),
+                        ("track_io_timing", "on"),
+                        ("log_min_duration_statement", str(args.slow_query_threshold_ms)),
+                    ]
+                ]
+            }
+        
+        # Private IP through private services access: a peering range in
+        # the network that Cloud SQL allocates the instance address from.
+        instance_depends_on = []
+        self.private_services_connection = None
+        if args.private_network is not None:
+            peering_range = gcp.compute.GlobalAddress(
+                f"{name}-psa-range",
+                name=f"{args.name}-psa-range",
+                purpose="VPC_PEERING",
+                address_type="INTERNAL",
+                prefix_length=16,
+                network=args.private_network,
+                project=args.project,
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+            self.private_services_connection = gcp.servicenetworking.Connection(
+                f"{name}-psa",
+                network=args.private_network,
+                service="servicenetworking.googleapis.com",
+                reserved_peering_ranges=[peering_range.name],
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+            instance_depends_on.append(self.private_services_connection)
+        
+        # Cloud SQL Instance
+        self.instance = gcp.sql.DatabaseInstance(
+            f"{name}-instance",
+            name=args.name,
+            database_version=args.database_version,
+            region="us-central1",
+            settings=gcp.sql.DatabaseInstanceSettingsArgs(
+                tier=args.tier,
+                disk_size=args.disk_size,
+                disk_type="PD_SSD",
+                availability_type=args.availability_type,
+                backup_configuration=gcp.sql.DatabaseInstanceSettingsBackupConfigurationArgs(
+                    enabled=args.backup_enabled,
+                    start_time="02:00"
+                ),
+                ip_configuration=gcp.sql.DatabaseInstanceSettingsIpConfigurationArgs(
+                    ipv4_enabled=True,
+                    private_network=args.private_network,
+                    ssl_mode="ENCRYPTED_ONLY"
+                ),
+                **observability
+            ),
+            deletion_protection=args.deletion_protection,
+            project=args.project,
+            opts=pulumi.ResourceOptions(parent=self, depends_on=instance_depends_on)
+        )
+        self.private_ip_address = self.instance.private_ip_address
+        
+        # Database
+        self.database = gcp.sql.Database(
+            f"{name}-database",
+            name="appdb",
+            instance=self.instance.name,
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+        
+        # User
+        self.user = gcp.sql.User(
+            f"{name}-user",
+            name="appuser",
+            instance=self.instance.name,
+            password=pulumi.Config().require_secret("dbPassword"),
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+        
+        # Cloud Monitoring and Query Insights label the instance "project:name".
+        self.database_id = pulumi.Output.concat(self.instance.project, ":", self.instance.name)
+        
+        # Export outputs
+        self.register_outputs({
+            "instance": self.instance,
+            "database_id": self.database_id,
+            "database": self.database,
+            "user": self.user
+        })
\ No newline at end of file
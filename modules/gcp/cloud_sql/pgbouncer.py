@@ -0,0 +1,420 @@
+"""PgBouncer connection pooling for Cloud SQL on GKE."""
+import hashlib
+import re
+
+import pulumi
+import pulumi_gcp as gcp
+import pulumi_kubernetes as k8s
+
+
+POOL_MODES = ("transaction", "session", "statement")
+
+# Default max_connections of Cloud SQL for PostgreSQL by tier memory (GiB).
+SHARED_CORE_MAX_CONNECTIONS = {"db-f1-micro": 25, "db-g1-small": 50}
+MEMORY_MAX_CONNECTIONS = [(6, 100), (7.5, 200), (15, 400), (30, 500), (60, 600), (120, 800)]
+# Connections Cloud SQL keeps for superuser and maintenance sessions.
+RESERVED_CONNECTIONS = 3
+
+PROXY_PORT = 5432
+PGBOUNCER_PORT = 6432
+
+PGBOUNCER_INI = """\
+[databases]
+{databases}
+
+[users]
+{users}
+
+[pgbouncer]
+listen_addr = 0.0.0.0
+listen_port = {port}
+auth_type = scram-sha-256
+auth_file = /etc/pgbouncer/userlist.txt
+pool_mode = {pool_mode}
+default_pool_size = {default_pool_size}
+max_client_conn = {max_client_conn}
+max_db_connections = {max_db_connections}
+server_tls_sslmode = disable
+ignore_startup_parameters = extra_float_digits,options
+"""
+
+
+def cloud_sql_max_connections(tier: str) -> int:
+    """Default max_connections of a Cloud SQL for PostgreSQL tier."""
+    if tier in SHARED_CORE_MAX_CONNECTIONS:
+        return SHARED_CORE_MAX_CONNECTIONS[tier]
+    match = re.fullmatch(r"db-(?:custom|perf-optimized-N)-\d+-(\d+)", tier)
+    if not match:
+        raise ValueError(f"Unknown Cloud SQL tier '{tier}'; set max_server_connections explicitly")
+    memory_gib = int(match.group(1)) / 1024
+    for limit_gib, connections in MEMORY_MAX_CONNECTIONS:
+        if memory_gib < limit_gib:
+            return connections
+    return 1000
+
+
+def render_pgbouncer_ini(databases: list, pool_mode: str, default_pool_size: int,
+                         max_client_conn: int, max_db_connections: int,
+                         pool_sizes: dict = None, max_user_connections: dict = None) -> str:
+    """Render pgbouncer.ini for databases reached through the local Auth Proxy.
+
+    ``pool_sizes`` sets the server pool of each user of a database;
+    ``max_user_connections`` caps a user's server connections across databases.
+    """
+    pool_sizes = pool_sizes or {}
+    lines = []
+    for database in databases:
+        entry = f"{database} = host=127.0.0.1 port={PROXY_PORT} dbname={database}"
+        if database in pool_sizes:
+            entry += f" pool_size={pool_sizes[database]}"
+        lines.append(entry)
+    users = [f"{user} = max_user_connections={limit}"
+             for user, limit in sorted((max_user_connections or {}).items())]
+    return PGBOUNCER_INI.format(
+        databases="\n".join(lines),
+        users="\n".join(users),
+        port=PGBOUNCER_PORT,
+        pool_mode=pool_mode,
+        default_pool_size=default_pool_size,
+        max_client_conn=max_client_conn,
+        max_db_connections=max_db_connections
+    )
+
+
+class PgBouncerArgs:
+    def __init__(self,
+                 name: str,
+                 instance_connection_name: pulumi.Input[str],
+                 k8s_provider: k8s.Provider,
+                 user: pulumi.Input[str],
+                 password: pulumi.Input[str],
+                 databases: list = None,
+                 tier: str = "db-f1-micro",
+                 max_server_connections: int = None,
+                 project: str = None,
+                 region: str = "us-central1",
+                 private_ip: bool = True,
+                 mirror_docker_hub: bool = True,
+                 namespace: str = "pgbouncer",
+                 pool_mode: str = "transaction",
+                 default_pool_size: int = 5,
+                 pool_sizes: dict = None,
+                 max_user_connections: dict = None,
+                 max_client_conn: int = 1000,
+                 min_replicas: int = 2,
+                 max_replicas: int = 4,
+                 target_cpu_utilization: int = 70,
+                 image: str = "edoburu/pgbouncer:v1.23.1-p2",
+                 proxy_image: str = "gcr.io/cloud-sql-connectors/cloud-sql-proxy:2.14.1"):
+        self.name = name
+        self.instance_connection_name = instance_connection_name
+        self.k8s_provider = k8s_provider
+        self.user = user
+        self.password = password
+        self.databases = databases or ["appdb"]
+        self.tier = tier
+        self.max_server_connections = max_server_connections
+        self.project = project
+        self.region = region
+        self.private_ip = private_ip
+        self.mirror_docker_hub = mirror_docker_hub
+        self.namespace = namespace
+        self.pool_mode = pool_mode
+        self.default_pool_size = default_pool_size
+        self.pool_sizes = pool_sizes or {}
+        self.max_user_connections = max_user_connections or {}
+        self.max_client_conn = max_client_conn
+        self.min_replicas = min_replicas
+        self.max_replicas = max_replicas
+        self.target_cpu_utilization = target_cpu_utilization
+        self.image = image
+        self.proxy_image = proxy_image
+
+
+class PgBouncer(pulumi.ComponentResource):
+    """PgBouncer pool in front of a Cloud SQL instance.
+
+    Each pod runs PgBouncer next to a Cloud SQL Auth Proxy sidecar that
+    authenticates through Workload Identity, so the cluster needs a workload
+    pool. The proxy dials the instance's private IP (``private_ip``), and
+    with ``mirror_docker_hub`` the PgBouncer image is pulled through an
+    Artifact Registry remote repository, so private nodes need neither NAT
+    nor a public instance address. The instance's connection budget is split across ``max_replicas``
+    pods and every database with ``max_db_connections``, so scaling out under
+    the HPA never opens more server connections than the tier allows.
+    Applications connect to ``endpoint`` instead of the instance.
+    """
+
+    def __init__(self, name: str, args: PgBouncerArgs, opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:gcp:PgBouncer", name, {}, opts)
+
+        if args.pool_mode not in POOL_MODES:
+            raise ValueError(f"Unsupported pool mode '{args.pool_mode}'; use one of {POOL_MODES}")
+        if not 1 <= args.min_replicas <= args.max_replicas:
+            raise ValueError("Replicas must satisfy 1 <= min_replicas <= max_replicas")
+        unknown = set(args.pool_sizes) - set(args.databases)
+        if unknown:
+            raise ValueError(f"pool_sizes names unknown databases: {', '.join(sorted(unknown))}")
+
+        max_server_connections = args.max_server_connections or cloud_sql_max_connections(args.tier)
+        self.max_db_connections = (max_server_connections - RESERVED_CONNECTIONS) // (
+            args.max_replicas * len(args.databases)
+        )
+        if self.max_db_connections < 1:
+            raise ValueError(
+                f"{max_server_connections} server connections cannot be shared by "
+                f"{args.max_replicas} replicas and {len(args.databases)} databases"
+            )
+        largest_pool = max([args.default_pool_size, *args.pool_sizes.values()])
+        if largest_pool > self.max_db_connections:
+            pulumi.log.warn(
+                f"Pool size {largest_pool} exceeds the {self.max_db_connections} server connections "
+                f"each of {args.max_replicas} PgBouncer replicas may open; pools will be capped",
+                resource=self
+            )
+
+        labels = {"app": "pgbouncer", "instance": args.name}
+        project = args.project or pulumi.Config("gcp").require("project")
+        k8s_opts = pulumi.ResourceOptions(parent=self, provider=args.k8s_provider)
+
+        # Docker Hub pull-through cache on a Google endpoint Private Google
+        # Access reaches. Node service accounts need artifactregistry.reader.
+        image = args.image
+        self.image_repository = None
+        if args.mirror_docker_hub:
+            self.image_repository = gcp.artifactregistry.Repository(
+                f"{name}-dockerhub",
+                repository_id=f"{args.name}-dockerhub",
+                location=args.region,
+                format="DOCKER",
+                mode="REMOTE_REPOSITORY",
+                remote_repository_config=gcp.artifactregistry.RepositoryRemoteRepositoryConfigArgs(
+                    description="Docker Hub",
+                    docker_repository=gcp.artifactregistry.RepositoryRemoteRepositoryConfigDockerRepositoryArgs(
+                        public_repository="DOCKER_HUB"
+                    )
+                ),
+                project=project,
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+            image = pulumi.Output.concat(
+                args.region, "-docker.pkg.dev/", project, "/",
+                self.image_repository.repository_id, "/", args.image
+            )
+
+        # Google service account the Auth Proxy runs as (Workload Identity).
+        service_account = gcp.serviceaccount.Account(
+            f"{name}-gsa",
+            account_id=f"{args.name}-proxy"[:30].rstrip("-"),
+            display_name=f"Cloud SQL Auth Proxy for {args.name}",
+            project=project,
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        gcp.projects.IAMMember(
+            f"{name}-cloudsql-client",
+            project=project,
+            role="roles/cloudsql.client",
+            member=pulumi.Output.concat("serviceAccount:", service_account.email),
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        gcp.serviceaccount.IAMMember(
+            f"{name}-workload-identity",
+            service_account_id=service_account.name,
+            role="roles/iam.workloadIdentityUser",
+            member=f"serviceAccount:{project}.svc.id.goog[{args.namespace}/{args.name}]",
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+
+        namespace = k8s.core.v1.Namespace(
+            f"{name}-namespace",
+            metadata=k8s.meta.v1.ObjectMetaArgs(name=args.namespace),
+            opts=k8s_opts
+        )
+        metadata = k8s.meta.v1.ObjectMetaArgs(
+            name=args.name,
+            namespace=namespace.metadata.name,
+            labels=labels
+        )
+
+        k8s_service_account = k8s.core.v1.ServiceAccount(
+            f"{name}-ksa",
+            metadata=k8s.meta.v1.ObjectMetaArgs(
+                name=args.name,
+                namespace=namespace.metadata.name,
+                annotations={"iam.gke.io/gcp-service-account": service_account.email}
+            ),
+            opts=k8s_opts
+        )
+
+        pgbouncer_ini = render_pgbouncer_ini(
+            args.databases,
+            args.pool_mode,
+            args.default_pool_size,
+            args.max_client_conn,
+            self.max_db_connections,
+            args.pool_sizes,
+            args.max_user_connections
+        )
+        config_map = k8s.core.v1.ConfigMap(
+            f"{name}-config",
+            metadata=metadata,
+            data={"pgbouncer.ini": pgbouncer_ini},
+            opts=k8s_opts
+        )
+
+        userlist = k8s.core.v1.Secret(
+            f"{name}-userlist",
+            metadata=metadata,
+            string_data={
+                "userlist.txt": pulumi.Output.format('"{0}" "{1}"\n', args.user, args.password)
+            },
+            opts=k8s_opts
+        )
+
+        self.deployment = k8s.apps.v1.Deployment(
+            f"{name}-deployment",
+            metadata=metadata,
+            spec=k8s.apps.v1.DeploymentSpecArgs(
+                replicas=args.min_replicas,
+                selector=k8s.meta.v1.LabelSelectorArgs(match_labels=labels),
+                template=k8s.core.v1.PodTemplateSpecArgs(
+                    metadata=k8s.meta.v1.ObjectMetaArgs(
+                        labels=labels,
+                        # Roll the pods when the pool configuration changes.
+                        annotations={"pgbouncer/config-hash": hashlib.sha256(
+                            pgbouncer_ini.encode()
+                        ).hexdigest()[:16]}
+                    ),
+                    spec=k8s.core.v1.PodSpecArgs(
+                        service_account_name=k8s_service_account.metadata.name,
+                        termination_grace_period_seconds=60,
+                        containers=[
+                            k8s.core.v1.ContainerArgs(
+                                name="pgbouncer",
+                                image=image,
+                                ports=[k8s.core.v1.ContainerPortArgs(
+                                    name="pgbouncer", container_port=PGBOUNCER_PORT
+                                )],
+                                readiness_probe=k8s.core.v1.ProbeArgs(
+                                    tcp_socket=k8s.core.v1.TCPSocketActionArgs(port=PGBOUNCER_PORT),
+                                    period_seconds=5
+                                ),
+                                # Let in-flight transactions finish before SIGTERM.
+                                lifecycle=k8s.core.v1.LifecycleArgs(
+                                    pre_stop=k8s.core.v1.LifecycleHandlerArgs(
+                                        exec_=k8s.core.v1.ExecActionArgs(
+                                            command=["/bin/sh", "-c", "killall -INT pgbouncer && sleep 30"]
+                                        )
+                                    )
+                                ),
+                                resources=k8s.core.v1.ResourceRequirementsArgs(
+                                    requests={"cpu": "100m", "memory": "64Mi"},
+                                    limits={"memory": "256Mi"}
+                                ),
+                                volume_mounts=[
+                                    k8s.core.v1.VolumeMountArgs(
+                                        name="config", mount_path="/etc/pgbouncer/pgbouncer.ini",
+                                        sub_path="pgbouncer.ini"
+                                    ),
+                                    k8s.core.v1.VolumeMountArgs(
+                                        name="userlist", mount_path="/etc/pgbouncer/userlist.txt",
+                                        sub_path="userlist.txt"
+                                    )
+                                ]
+                            ),
+                            k8s.core.v1.ContainerArgs(
+                                name="cloud-sql-proxy",
+                                image=args.proxy_image,
+                                args=[
+                                    f"--port={PROXY_PORT}",
+                                    "--structured-logs",
+                                    "--max-sigterm-delay=30s",
+                                    *(["--private-ip"] if args.private_ip else []),
+                                    args.instance_connection_name
+                                ],
+                                resources=k8s.core.v1.ResourceRequirementsArgs(
+                                    requests={"cpu": "50m", "memory": "32Mi"},
+                                    limits={"memory": "128Mi"}
+                                ),
+                                security_context=k8s.core.v1.SecurityContextArgs(run_as_non_root=True)
+                            )
+                        ],
+                        volumes=[
+                            k8s.core.v1.VolumeArgs(
+                                name="config",
+                                config_map=k8s.core.v1.ConfigMapVolumeSourceArgs(
+                                    name=config_map.metadata.name
+                                )
+                            ),
+                            k8s.core.v1.VolumeArgs(
+                                name="userlist",
+                                secret=k8s.core.v1.SecretVolumeSourceArgs(
+                                    secret_name=userlist.metadata.name
+                                )
+                            )
+                        ]
+                    )
+                )
+            ),
+            opts=k8s_opts
+        )
+
+        self.service = k8s.core.v1.Service(
+            f"{name}-service",
+            metadata=metadata,
+            spec=k8s.core.v1.ServiceSpecArgs(
+                selector=labels,
+                ports=[k8s.core.v1.ServicePortArgs(
+                    name="postgres", port=PROXY_PORT, target_port=PGBOUNCER_PORT
+                )]
+            ),
+            opts=k8s_opts
+        )
+
+        k8s.autoscaling.v2.HorizontalPodAutoscaler(
+            f"{name}-hpa",
+            metadata=metadata,
+            spec=k8s.autoscaling.v2.HorizontalPodAutoscalerSpecArgs(
+                scale_target_ref=k8s.autoscaling.v2.CrossVersionObjectReferenceArgs(
+                    api_version="apps/v1",
+                    kind="Deployment",
+                    name=self.deployment.metadata.name
+                ),
+                min_replicas=args.min_replicas,
+                max_replicas=args.max_replicas,
+                metrics=[k8s.autoscaling.v2.MetricSpecArgs(
+                    type="Resource",
+                    resource=k8s.autoscaling.v2.ResourceMetricSourceArgs(
+                        name="cpu",
+                        target=k8s.autoscaling.v2.MetricTargetArgs(
+                            type="Utilization",
+                            average_utilization=args.target_cpu_utilization
+                        )
+                    )
+                )]
+            ),
+            opts=k8s_opts
+        )
+
+        k8s.policy.v1.PodDisruptionBudget(
+            f"{name}-pdb",
+            metadata=metadata,
+            spec=k8s.policy.v1.PodDisruptionBudgetSpecArgs(
+                max_unavailable=1,
+                selector=k8s.meta.v1.LabelSelectorArgs(match_labels=labels)
+            ),
+            opts=k8s_opts
+        )
+
+        self.endpoint = pulumi.Output.concat(
+            self.service.metadata.name, ".", namespace.metadata.name, ".svc.cluster.local:", str(PROXY_PORT)
+        )
+
+        # Export outputs
+        self.register_outputs({
+            "endpoint": self.endpoint,
+            "service_account_email": service_account.email,
+            "max_db_connections": self.max_db_connections
+        })
@@ -0,0 +1,3 @@
+from .instance import Filestore, FilestoreArgs, size_filestore
+
+__all__ = ['Filestore', 'FilestoreArgs', 'size_filestore']
\ No newline at end of file
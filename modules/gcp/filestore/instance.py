@@ -0,0 +1,229 @@
+"""GCP Filestore Module."""
+import math
+
+import pulumi
+import pulumi_gcp as gcp
+import pulumi_kubernetes as k8s
+
+
+# Read throughput per tier in MiB/s. Basic tiers are flat (HDD steps up at
+# 10 TiB); zonal and regional scale with capacity. Capacities are in GiB and
+# grow in ``step_gib`` increments (2.5 TiB from 10 TiB on the scaling tiers).
+# ``gib_month`` is the approximate us-central1 list price, used only to pick
+# the cheapest tier that meets a target.
+FILESTORE_TIERS = {
+    "BASIC_HDD": {"min_gib": 1024, "max_gib": 65536, "step_gib": 1,
+                  "read_mibps": 100, "read_mibps_10tib": 180, "gib_month": 0.20},
+    "BASIC_SSD": {"min_gib": 2560, "max_gib": 65536, "step_gib": 1,
+                  "read_mibps": 1200, "gib_month": 0.30},
+    "ZONAL": {"min_gib": 1024, "max_gib": 102400, "step_gib": 256,
+              "read_mibps_per_tib": 260, "gib_month": 0.28},
+    "REGIONAL": {"min_gib": 1024, "max_gib": 102400, "step_gib": 256,
+                 "read_mibps_per_tib": 120, "gib_month": 0.45},
+}
+
+# StorageClass ``tier`` values of the Filestore CSI driver.
+CSI_TIERS = {
+    "BASIC_HDD": "standard",
+    "BASIC_SSD": "premium",
+    "ZONAL": "zonal",
+    "REGIONAL": "regional",
+}
+
+LARGE_STEP_FROM_GIB = 10240
+LARGE_STEP_GIB = 2560
+
+
+def filestore_read_mibps(tier: str, capacity_gib: int) -> float:
+    """Read throughput of a ``tier`` instance with ``capacity_gib``."""
+    spec = FILESTORE_TIERS[tier]
+    if "read_mibps_per_tib" in spec:
+        return spec["read_mibps_per_tib"] * capacity_gib / 1024
+    if capacity_gib >= 10240 and "read_mibps_10tib" in spec:
+        return spec["read_mibps_10tib"]
+    return spec["read_mibps"]
+
+
+def _round_capacity(tier: str, capacity_gib: float) -> int:
+    spec = FILESTORE_TIERS[tier]
+    capacity_gib = max(spec["min_gib"], capacity_gib)
+    step = spec["step_gib"]
+    if step > 1 and capacity_gib > LARGE_STEP_FROM_GIB:
+        step = LARGE_STEP_GIB
+    return int(math.ceil(capacity_gib / step) * step)
+
+
+def _tier_capacity(tier: str, mibps: float, min_capacity_gib: int) -> int:
+    """Smallest capacity of ``tier`` delivering ``mibps``, or None if none does."""
+    spec = FILESTORE_TIERS[tier]
+    if "read_mibps_per_tib" in spec:
+        capacity = max(min_capacity_gib, mibps / spec["read_mibps_per_tib"] * 1024)
+    elif mibps <= spec["read_mibps"]:
+        capacity = min_capacity_gib
+    elif mibps <= spec.get("read_mibps_10tib", 0):
+        capacity = max(min_capacity_gib, 10240)
+    else:
+        return None
+    capacity = _round_capacity(tier, capacity)
+    return capacity if capacity <= spec["max_gib"] else None
+
+
+def size_filestore(throughput_mbps: float, min_capacity_gib: int = 0,
+                   tiers: tuple = ("BASIC_HDD", "BASIC_SSD", "ZONAL")) -> tuple:
+    """Return the cheapest ``(tier, capacity_gib)`` reading at ``throughput_mbps``.
+
+    Only ``tiers`` are considered; pass ``("REGIONAL",)`` for a regional share.
+    Raises ``ValueError`` when no tier reaches the target.
+    """
+    if throughput_mbps <= 0:
+        raise ValueError("throughput_mbps must be positive")
+    mibps = throughput_mbps * 1000 * 1000 / (1024 * 1024)
+    candidates = []
+    for tier in tiers:
+        capacity = _tier_capacity(tier, mibps, min_capacity_gib)
+        if capacity is not None:
+            candidates.append((capacity * FILESTORE_TIERS[tier]["gib_month"], tier, capacity))
+    if not candidates:
+        raise ValueError(f"No Filestore tier in {list(tiers)} reaches {throughput_mbps} MB/s")
+    _, tier, capacity = min(candidates)
+    return tier, capacity
+
+
+class FilestoreArgs:
+    def __init__(self,
+                 name: str,
+                 network: pulumi.Input[str],
+                 project: str = None,
+                 zone: str = "us-central1-a",
+                 throughput_mbps: float = 100,
+                 min_capacity_gib: int = 0,
+                 regional: bool = False,
+                 share_name: str = "share1",
+                 k8s_provider: k8s.Provider = None,
+                 storage_class_name: str = "filestore",
+                 dynamic_storage_class_name: str = None,
+                 deletion_protection: bool = False):
+        self.name = name
+        self.network = network
+        self.project = project
+        self.zone = zone
+        self.throughput_mbps = throughput_mbps
+        self.min_capacity_gib = min_capacity_gib
+        self.regional = regional
+        self.share_name = share_name
+        self.k8s_provider = k8s_provider
+        self.storage_class_name = storage_class_name
+        self.dynamic_storage_class_name = dynamic_storage_class_name
+        self.deletion_protection = deletion_protection
+
+
+class Filestore(pulumi.ComponentResource):
+    """Filestore NFS share sized for a read throughput target.
+
+    The tier and capacity are the cheapest that read at ``throughput_mbps``
+    (and hold ``min_capacity_gib``); ``regional`` restricts the choice to the
+    regional tier. With a ``k8s_provider`` the share is exposed as a
+    ReadWriteMany PersistentVolume of the Filestore CSI driver, which the
+    cluster must have enabled (``enable_filestore_csi_driver``). Its
+    StorageClass does not provision, so claims that do not fit the share
+    stay pending instead of creating new instances; set
+    ``dynamic_storage_class_name`` to also get a provisioning class of the
+    same tier.
+    """
+
+    def __init__(self, name: str, args: FilestoreArgs, opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:gcp:Filestore", name, {}, opts)
+
+        self.tier, self.capacity_gib = size_filestore(
+            args.throughput_mbps,
+            args.min_capacity_gib,
+            ("REGIONAL",) if args.regional else ("BASIC_HDD", "BASIC_SSD", "ZONAL")
+        )
+        # Regional instances live in the zone's region.
+        location = args.zone.rsplit("-", 1)[0] if args.regional else args.zone
+
+        self.instance = gcp.filestore.Instance(
+            f"{name}-instance",
+            name=args.name,
+            location=location,
+            tier=self.tier,
+            file_shares=gcp.filestore.InstanceFileSharesArgs(
+                name=args.share_name,
+                capacity_gb=self.capacity_gib
+            ),
+            networks=[gcp.filestore.InstanceNetworkArgs(
+                network=args.network,
+                modes=["MODE_IPV4"]
+            )],
+            deletion_protection_enabled=args.deletion_protection,
+            project=args.project,
+            opts=pulumi.ResourceOptions(parent=self)
+        )
+        self.ip_address = self.instance.networks.apply(lambda networks: networks[0].ip_addresses[0])
+
+        self.storage_class = None
+        self.dynamic_storage_class = None
+        self.persistent_volume = None
+        if args.k8s_provider is not None:
+            k8s_opts = pulumi.ResourceOptions(parent=self, provider=args.k8s_provider)
+            # Claims in this class only bind the pre-provisioned share.
+            self.storage_class = k8s.storage.v1.StorageClass(
+                f"{name}-storage-class",
+                metadata=k8s.meta.v1.ObjectMetaArgs(name=args.storage_class_name),
+                provisioner="kubernetes.io/no-provisioner",
+                reclaim_policy="Retain",
+                volume_binding_mode="Immediate",
+                opts=k8s_opts
+            )
+
+            if args.dynamic_storage_class_name:
+                # Every claim in this class creates a new Filestore instance.
+                self.dynamic_storage_class = k8s.storage.v1.StorageClass(
+                    f"{name}-dynamic-storage-class",
+                    metadata=k8s.meta.v1.ObjectMetaArgs(name=args.dynamic_storage_class_name),
+                    provisioner="filestore.csi.storage.gke.io",
+                    parameters={
+                        "tier": CSI_TIERS[self.tier],
+                        "network": args.network
+                    },
+                    allow_volume_expansion=True,
+                    reclaim_policy="Retain",
+                    volume_binding_mode="WaitForFirstConsumer",
+                    opts=k8s_opts
+                )
+
+            # Pre-provisioned share, bound by claims for the storage class.
+            self.persistent_volume = k8s.core.v1.PersistentVolume(
+                f"{name}-persistent-volume",
+                metadata=k8s.meta.v1.ObjectMetaArgs(name=args.name),
+                spec=k8s.core.v1.PersistentVolumeSpecArgs(
+                    storage_class_name=args.storage_class_name,
+                    capacity={"storage": f"{self.capacity_gib}Gi"},
+                    access_modes=["ReadWriteMany"],
+                    persistent_volume_reclaim_policy="Retain",
+                    csi=k8s.core.v1.CSIPersistentVolumeSourceArgs(
+                        driver="filestore.csi.storage.gke.io",
+                        volume_handle=pulumi.Output.concat(
+                            "modeInstance/", location, "/", self.instance.name, "/", args.share_name
+                        ),
+                        volume_attributes={
+                            "ip": self.ip_address,
+                            "volume": args.share_name
+                        }
+                    )
+                ),
+                opts=pulumi.ResourceOptions(
+                    parent=self,
+                    provider=args.k8s_provider,
+                    depends_on=[self.storage_class]
+                )
+            )
+
+        # Export outputs
+        self.register_outputs({
+            "instance": self.instance,
+            "tier": self.tier,
+            "capacity_gib": self.capacity_gib,
+            "ip_address": self.ip_address,
+            "storage_class": self.storage_class
+        })
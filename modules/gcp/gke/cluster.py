@@ -14,7 +14,9 @@ class GkeClusterArgs:
                  max_node_count: int = 3,
                  machine_type: str = "e2-medium",
                  enable_private_nodes: bool = True,
-                 kubernetes_version: str = "1.27"):
+                 kubernetes_version: str = "1.27",
+                 enable_filestore_csi_driver: bool = False,
+                 workload_identity_project: str = None):
         self.name = name
         self.location = location
         self.network = network
@@ -24,6 +26,8 @@ class GkeClusterArgs:
         self.machine_type = machine_type
         self.enable_private_nodes = enable_private_nodes
         self.kubernetes_version = kubernetes_version
+        self.enable_filestore_csi_driver = enable_filestore_csi_driver
+        self.workload_identity_project = workload_identity_project
 
 
 class GkeCluster(pulumi.ComponentResource):
@@ -50,6 +54,14 @@ class GkeCluster(pulumi.ComponentResource):
                 cluster_ipv4_cidr_block="/16",
                 services_ipv4_cidr_block="/22"
             ),
+            addons_config=gcp.container.ClusterAddonsConfigArgs(
+                gcp_filestore_csi_driver_config=gcp.container.ClusterAddonsConfigGcpFilestoreCsiDriverConfigArgs(
+                    enabled=True
+                )
+            ) if args.enable_filestore_csi_driver else None,
+            workload_identity_config=gcp.container.ClusterWorkloadIdentityConfigArgs(
+                workload_pool=f"{args.workload_identity_project}.svc.id.goog"
+            ) if args.workload_identity_project else None,
             opts=pulumi.ResourceOptions(parent=self)
         )
         
@@ -68,7 +80,11 @@ class GkeCluster(pulumi.ComponentResource):
                 oauth_scopes=[
                     "https://www.googleapis.com/auth/cloud-platform"
                 ],
-                tags=["gke-node", args.name]
+                tags=["gke-node", args.name],
+                # Pods get their Google credentials from the GKE metadata server.
+                workload_metadata_config=gcp.container.NodePoolNodeConfigWorkloadMetadataConfigArgs(
+                    mode="GKE_METADATA"
+                ) if args.workload_identity_project else None
             ),
             autoscaling=gcp.container.NodePoolAutoscalingArgs(
                 min_node_count=args.min_node_count,
@@ -0,0 +1,3 @@
+from .cache import Memorystore, MemorystoreArgs
+
+__all__ = ['Memorystore', 'MemorystoreArgs']
\ No newline at end of file
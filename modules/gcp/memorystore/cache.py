@@ -0,0 +1,204 @@
+"""GCP Memorystore Module."""
+import pulumi
+import pulumi_gcp as gcp
+
+
+ENGINES = ("VALKEY", "REDIS")
+
+# Service classes Private Service Connect policies are issued for.
+SERVICE_CLASSES = {
+    "VALKEY": "gcp-memorystore",
+    "REDIS": "gcp-memorystore-redis",
+}
+
+# Node types shared by Valkey and Redis Cluster; Redis Cluster spells them
+# with a REDIS_ prefix.
+NODE_TYPES = ("SHARED_CORE_NANO", "STANDARD_SMALL", "HIGHMEM_MEDIUM", "HIGHMEM_XLARGE")
+
+# Memorystore for Redis (non-cluster) only offers read replicas on Standard
+# tier instances of at least this size, with 1-5 replicas.
+READ_REPLICA_MIN_MEMORY_GB = 5
+READ_REPLICA_MAX_COUNT = 5
+
+
+def engine_node_type(engine: str, node_type: str) -> str:
+    """Return ``node_type`` spelled the way ``engine``'s API expects it."""
+    base = node_type.upper().removeprefix("REDIS_")
+    if base not in NODE_TYPES:
+        raise ValueError(f"Unsupported node type '{node_type}'; use one of {', '.join(NODE_TYPES)}")
+    return f"REDIS_{base}" if engine.upper() == "REDIS" else base
+
+
+def _psc_endpoint(endpoints: list, connection_type: str) -> str:
+    """Return the address of the first PSC connection of ``connection_type``."""
+    for endpoint in endpoints or []:
+        for connection in endpoint.connections or []:
+            auto = connection.psc_auto_connection
+            if auto and auto.connection_type == connection_type:
+                return auto.ip_address
+    return None
+
+
+class MemorystoreArgs:
+    def __init__(self,
+                 name: str,
+                 network: pulumi.Input[str],
+                 subnetwork: pulumi.Input[str] = None,
+                 project: str = None,
+                 region: str = "us-central1",
+                 engine: str = "VALKEY",
+                 engine_version: str = None,
+                 node_type: str = "SHARED_CORE_NANO",
+                 cluster_mode: bool = True,
+                 shard_count: int = 1,
+                 replica_count: int = 1,
+                 memory_size_gb: int = 5,
+                 transit_encryption: bool = True,
+                 create_service_connection_policy: bool = True,
+                 deletion_protection: bool = False):
+        self.name = name
+        self.network = network
+        self.subnetwork = subnetwork
+        self.project = project
+        self.region = region
+        self.engine = engine.upper()
+        self.engine_version = engine_version
+        self.node_type = node_type
+        self.cluster_mode = cluster_mode
+        self.shard_count = shard_count
+        self.replica_count = replica_count
+        self.memory_size_gb = memory_size_gb
+        self.transit_encryption = transit_encryption
+        self.create_service_connection_policy = create_service_connection_policy
+        self.deletion_protection = deletion_protection
+
+
+class Memorystore(pulumi.ComponentResource):
+    """Memorystore for Valkey or Redis on a VPC network.
+
+    Valkey instances and Redis clusters are reached through Private Service
+    Connect endpoints in ``subnetwork``; non-cluster Redis uses a Standard
+    tier instance peered with ``network`` and read replicas. In cluster mode
+    both endpoints are the discovery endpoint cluster-aware clients start from.
+    """
+
+    def __init__(self, name: str, args: MemorystoreArgs, opts: pulumi.ResourceOptions = None):
+        super().__init__("modules:gcp:Memorystore", name, {}, opts)
+
+        if args.engine not in ENGINES:
+            raise ValueError(f"Unsupported cache engine '{args.engine}'; use VALKEY or REDIS")
+        if not args.cluster_mode and args.shard_count != 1:
+            raise ValueError("shard_count must be 1 unless cluster_mode is enabled")
+        redis_instance = args.engine == "REDIS" and not args.cluster_mode
+        if redis_instance and args.replica_count:
+            if args.memory_size_gb < READ_REPLICA_MIN_MEMORY_GB:
+                raise ValueError(
+                    f"Redis read replicas need memory_size_gb >= {READ_REPLICA_MIN_MEMORY_GB}; "
+                    f"got {args.memory_size_gb} (set replica_count=0 for a smaller instance)"
+                )
+            if args.replica_count > READ_REPLICA_MAX_COUNT:
+                raise ValueError(f"Redis instances support at most {READ_REPLICA_MAX_COUNT} read replicas")
+        node_type = engine_node_type(args.engine, args.node_type)
+        uses_psc = args.engine == "VALKEY" or args.cluster_mode
+        if uses_psc and args.subnetwork is None:
+            raise ValueError("subnetwork is required for Private Service Connect endpoints")
+
+        # Private Service Connect policy letting Memorystore create endpoints
+        # in the subnetwork. One is allowed per network, region and service class.
+        depends_on = []
+        self.service_connection_policy = None
+        if uses_psc and args.create_service_connection_policy:
+            self.service_connection_policy = gcp.networkconnectivity.ServiceConnectionPolicy(
+                f"{name}-psc-policy",
+                name=f"{args.name}-psc-policy",
+                location=args.region,
+                service_class=SERVICE_CLASSES[args.engine],
+                network=args.network,
+                psc_config=gcp.networkconnectivity.ServiceConnectionPolicyPscConfigArgs(
+                    subnetworks=[args.subnetwork]
+                ),
+                project=args.project,
+                opts=pulumi.ResourceOptions(parent=self)
+            )
+            depends_on.append(self.service_connection_policy)
+
+        child_opts = pulumi.ResourceOptions(parent=self, depends_on=depends_on)
+        if args.engine == "VALKEY":
+            self.instance = gcp.memorystore.Instance(
+                f"{name}-instance",
+                instance_id=args.name,
+                location=args.region,
+                engine_version=args.engine_version,
+                node_type=node_type,
+                mode="CLUSTER" if args.cluster_mode else "CLUSTER_DISABLED",
+                shard_count=args.shard_count,
+                replica_count=args.replica_count,
+                transit_encryption_mode="SERVER_AUTHENTICATION"
+                if args.transit_encryption else "TRANSIT_ENCRYPTION_DISABLED",
+                desired_auto_created_endpoints=[
+                    gcp.memorystore.InstanceDesiredAutoCreatedEndpointArgs(
+                        network=args.network,
+                        project_id=args.project or pulumi.Config("gcp").require("project")
+                    )
+                ],
+                deletion_protection_enabled=args.deletion_protection,
+                project=args.project,
+                opts=child_opts
+            )
+            if args.cluster_mode:
+                self.primary_endpoint = self.instance.endpoints.apply(
+                    lambda endpoints: _psc_endpoint(endpoints, "CONNECTION_TYPE_DISCOVERY")
+                )
+                self.reader_endpoint = self.primary_endpoint
+            else:
+                self.primary_endpoint = self.instance.endpoints.apply(
+                    lambda endpoints: _psc_endpoint(endpoints, "CONNECTION_TYPE_PRIMARY")
+                )
+                self.reader_endpoint = self.instance.endpoints.apply(
+                    lambda endpoints: _psc_endpoint(endpoints, "CONNECTION_TYPE_READER")
+                )
+        elif args.cluster_mode:
+            self.instance = gcp.redis.Cluster(
+                f"{name}-cluster",
+                name=args.name,
+                region=args.region,
+                node_type=node_type,
+                shard_count=args.shard_count,
+                replica_count=args.replica_count,
+                transit_encryption_mode="TRANSIT_ENCRYPTION_MODE_SERVER_AUTHENTICATION"
+                if args.transit_encryption else "TRANSIT_ENCRYPTION_MODE_DISABLED",
+                psc_configs=[gcp.redis.ClusterPscConfigArgs(network=args.network)],
+                deletion_protection_enabled=args.deletion_protection,
+                project=args.project,
+                opts=child_opts
+            )
+            self.primary_endpoint = self.instance.discovery_endpoints.apply(
+                lambda endpoints: endpoints[0].address if endpoints else None
+            )
+            self.reader_endpoint = self.primary_endpoint
+        else:
+            self.instance = gcp.redis.Instance(
+                f"{name}-instance",
+                name=args.name,
+                region=args.region,
+                tier="STANDARD_HA",
+                memory_size_gb=args.memory_size_gb,
+                redis_version=args.engine_version,
+                replica_count=args.replica_count,
+                read_replicas_mode="READ_REPLICAS_ENABLED"
+                if args.replica_count else "READ_REPLICAS_DISABLED",
+                authorized_network=args.network,
+                transit_encryption_mode="SERVER_AUTHENTICATION"
+                if args.transit_encryption else "DISABLED",
+                project=args.project,
+                opts=child_opts
+            )
+            self.primary_endpoint = self.instance.host
+            self.reader_endpoint = self.instance.read_endpoint
+
+        # Export outputs
+        self.register_outputs({
+            "instance": self.instance,
+            "primary_endpoint": self.primary_endpoint,
+            "reader_endpoint": self.reader_endpoint
+        })
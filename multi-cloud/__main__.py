@@ -3,83 +3,230 @@ import pulumi
 import pulumi_aws as aws
 import pulumi_gcp as gcp
 
-from modules.aws.vpc import Vpc as AwsVpc
-from modules.aws.eks import EksCluster as AwsEks
-from modules.gcp.gke import GkeCluster as GcpGke
+from modules.aws.vpc import Vpc as AwsVpc, VpcArgs as AwsVpcArgs
+from modules.aws.eks import EksCluster as AwsEks, EksClusterArgs as AwsEksArgs
+from modules.gcp.gke import GkeCluster as GcpGke, GkeClusterArgs as GcpGkeArgs
+from modules.common.stack_reference import CachedStackReference, CachedStackReferenceArgs
+from modules.common.cross_cloud_vpn import HaVpnMesh, HaVpnMeshArgs
+from modules.common.global_routing import GlobalRouting, GlobalRoutingArgs, IngressEndpoint
 
 
 class MultiCloudInfrastructure:
     def __init__(self):
         self.config = pulumi.Config()
         self.stack = pulumi.get_stack()
-        
+        self.gcp_region = pulumi.Config("gcp").get("region") or "us-central1"
+        self.aws_region = pulumi.Config("aws").get("region") or "us-west-2"
+
+        # "compose" reuses the networks and clusters the aws/ and gcp/ stacks
+        # already manage; "standalone" creates a dedicated set.
+        self.mode = self.config.get("mode") or "compose"
+        if self.mode == "compose":
+            self.compose_from_stacks()
+        elif self.mode == "standalone":
+            self.create_infrastructure()
+        else:
+            raise ValueError(f"Unknown multi-cloud mode '{self.mode}'")
+
+        # Cross-cloud networking
+        self.vpn = None
+        enable_vpn = self.config.get_bool("enableCrossCloudVpn")
+        if enable_vpn if enable_vpn is not None else self.stack == "production":
+            self.setup_cross_cloud_networking()
+
+        # Global traffic routing
+        self.global_routing = None
+        if self.config.get("globalHostname"):
+            self.setup_global_routing()
+
+        # Export outputs
+        self.export_outputs()
+
+    def compose_from_stacks(self):
+        """Read network and cluster identifiers from the per-cloud stacks."""
+        organization = pulumi.get_organization()
+        cache_dir = self.config.get("stackOutputCacheDir") or ".stack-cache"
+        ttl_seconds = self.config.get_int("stackOutputCacheTtl") or 3600
+
+        aws_stack = CachedStackReference(
+            f"aws-stack-{self.stack}",
+            CachedStackReferenceArgs(
+                stack_name=self.config.get("awsStack")
+                or f"{organization}/aws-infrastructure/{self.stack}",
+                cache_dir=cache_dir,
+                ttl_seconds=ttl_seconds
+            )
+        )
+        gcp_stack = CachedStackReference(
+            f"gcp-stack-{self.stack}",
+            CachedStackReferenceArgs(
+                stack_name=self.config.get("gcpStack")
+                or f"{organization}/gcp-infrastructure/{self.stack}",
+                cache_dir=cache_dir,
+                ttl_seconds=ttl_seconds
+            )
+        )
+
+        self.aws_vpc_id = aws_stack.require_output("vpc_id")
+        # The VPN routes and overlap check use the ranges the stacks
+        # actually deployed, not this project's standalone defaults.
+        self.aws_cidr_block = aws_stack.require_output("vpc_cidr_block")
+        self.aws_private_subnet_ids = aws_stack.require_output("private_subnet_ids")
+        self.aws_public_subnet_ids = aws_stack.require_output("public_subnet_ids")
+        # Routes are declared per table, so the count must be known up front.
+        route_table_ids = aws_stack.require_output("private_route_table_ids")
+        self.aws_private_route_table_ids = [
+            route_table_ids.apply(lambda ids, i=i: ids[i])
+            for i in range(self.config.get_int("awsPrivateRouteTableCount") or 2)
+        ]
+        self.aws_eks_cluster_name = aws_stack.require_output("eks_cluster_name")
+
+        self.gcp_vpc_name = gcp_stack.require_output("vpc_name")
+        self.gcp_network = self.gcp_vpc_name
+        self.gcp_subnet_names = gcp_stack.require_output("subnet_names")
+        self.gcp_cidr_blocks = gcp_stack.require_output("subnet_cidr_blocks")
+        self.gcp_gke_cluster_name = gcp_stack.require_output("gke_cluster_name")
+
+    def create_infrastructure(self):
+        """Create a dedicated AWS VPC and EKS cluster, GCP network and GKE cluster."""
+        self.aws_cidr_block = self.config.get("awsCidrBlock") or "10.100.0.0/16"
+        gcp_cidr_block = self.config.get("gcpCidrBlock") or "10.200.0.0/16"
+
         # AWS Infrastructure
         self.aws_vpc = AwsVpc(
-            name=f"multi-cloud-aws-{self.stack}",
-            cidr_block="10.100.0.0/16",
-            enable_nat_gateway=True,
-            single_nat_gateway=self.stack != "production"
+            f"multi-cloud-aws-{self.stack}",
+            AwsVpcArgs(
+                name=f"multi-cloud-aws-{self.stack}",
+                cidr_block=self.aws_cidr_block,
+                enable_nat_gateway=True,
+                single_nat_gateway=self.stack != "production"
+            )
         )
-        
+
         self.aws_eks = AwsEks(
-            name=f"multi-cloud-eks-{self.stack}",
-            vpc_id=self.aws_vpc.vpc_id,
-            private_subnet_ids=self.aws_vpc.private_subnet_ids,
-            public_subnet_ids=self.aws_vpc.public_subnet_ids,
-            min_size=1,
-            max_size=3
+            f"multi-cloud-eks-{self.stack}",
+            AwsEksArgs(
+                name=f"multi-cloud-eks-{self.stack}",
+                vpc_id=self.aws_vpc.vpc_id,
+                private_subnet_ids=self.aws_vpc.private_subnet_ids,
+                public_subnet_ids=self.aws_vpc.public_subnet_ids,
+                min_size=1,
+                max_size=3
+            )
         )
-        
+
         # GCP Infrastructure
         self.gcp_vpc = gcp.compute.Network(
             f"multi-cloud-gcp-{self.stack}",
             name=f"multi-cloud-gcp-{self.stack}",
             auto_create_subnetworks=False,
-            project=self.config.require("gcp:project")
+            project=pulumi.Config("gcp").require("project")
         )
-        
+
         gcp_subnet = gcp.compute.Subnetwork(
             f"multi-cloud-gcp-subnet-{self.stack}",
             name=f"multi-cloud-gcp-subnet-{self.stack}",
-            ip_cidr_range="10.200.0.0/16",
-            region="us-central1",
+            ip_cidr_range=gcp_cidr_block,
+            region=self.gcp_region,
             network=self.gcp_vpc.id
         )
-        
+
         self.gcp_gke = GcpGke(
-            name=f"multi-cloud-gke-{self.stack}",
-            location="us-central1",
-            network=self.gcp_vpc.id,
-            subnetwork=gcp_subnet.id,
-            min_node_count=1,
-            max_node_count=3
+            f"multi-cloud-gke-{self.stack}",
+            GcpGkeArgs(
+                name=f"multi-cloud-gke-{self.stack}",
+                location=self.gcp_region,
+                network=self.gcp_vpc.id,
+                subnetwork=gcp_subnet.id,
+                min_node_count=1,
+                max_node_count=3
+            )
         )
-        
-        # Cross-cloud networking (example: VPC Peering)
-        if self.stack == "production":
-            self.setup_cross_cloud_networking()
-        
-        # Export outputs
-        self.export_outputs()
-    
+
+        self.aws_vpc_id = self.aws_vpc.vpc_id
+        self.aws_private_subnet_ids = self.aws_vpc.private_subnet_ids
+        self.aws_public_subnet_ids = self.aws_vpc.public_subnet_ids
+        self.aws_private_route_table_ids = self.aws_vpc.private_route_table_ids
+        self.aws_eks_cluster_name = self.aws_eks.cluster.name
+
+        self.gcp_vpc_name = self.gcp_vpc.name
+        self.gcp_network = self.gcp_vpc.id
+        self.gcp_subnet_names = [gcp_subnet.name]
+        self.gcp_cidr_blocks = [gcp_cidr_block]
+        self.gcp_gke_cluster_name = self.gcp_gke.cluster.name
+
     def setup_cross_cloud_networking(self):
-        """Setup cross-cloud networking (VPC peering, etc.)"""
-        # This is a simplified example - real implementation would be more complex
-        pulumi.log.info("Setting up cross-cloud networking for production")
-    
+        """Connect the AWS VPC and GCP network with a BGP-routed HA VPN."""
+        self.vpn = HaVpnMesh(
+            f"cross-cloud-vpn-{self.stack}",
+            HaVpnMeshArgs(
+                name=f"cross-cloud-vpn-{self.stack}",
+                aws_vpc_id=self.aws_vpc_id,
+                aws_subnet_ids=self.aws_private_subnet_ids,
+                aws_route_table_ids=self.aws_private_route_table_ids,
+                aws_cidr_block=self.aws_cidr_block,
+                gcp_network=self.gcp_network,
+                gcp_cidr_blocks=self.gcp_cidr_blocks,
+                gcp_region=self.gcp_region,
+                gateway_count=self.config.get_int("vpnGatewayCount") or 1,
+                aws_asn=self.config.get_int("vpnAwsAsn") or 64512,
+                gcp_asn=self.config.get_int("vpnGcpAsn") or 65000,
+                tunnel_inside_cidrs=self.config.get_object("vpnTunnelInsideCidrs"),
+                tags={"Environment": self.stack}
+            )
+        )
+
+    def setup_global_routing(self):
+        """Route one hostname to the nearer or weighted healthy cluster ingress."""
+        weights = self.config.get_object("globalRoutingWeights") or {}
+        endpoints = []
+        for cloud, region, address in [
+            ("aws", self.aws_region, self.config.get("awsIngressHostname")),
+            ("gcp", self.gcp_region, self.config.get("gcpIngressAddress")),
+        ]:
+            if address:
+                endpoints.append(IngressEndpoint(
+                    name=cloud,
+                    cloud=cloud,
+                    region=region,
+                    address=address,
+                    weight=weights.get(region, 1)
+                ))
+
+        self.global_routing = GlobalRouting(
+            f"global-routing-{self.stack}",
+            GlobalRoutingArgs(
+                hostname=self.config.require("globalHostname"),
+                zone_id=self.config.require("globalZoneId"),
+                endpoints=endpoints,
+                routing_policy=self.config.get("globalRoutingPolicy") or "latency",
+                health_check_path=self.config.get("globalHealthCheckPath") or "/healthz",
+                tags={"Environment": self.stack}
+            )
+        )
+
     def export_outputs(self):
         """Export important resource identifiers."""
+        pulumi.export("mode", self.mode)
+
         # AWS outputs
-        pulumi.export("aws_vpc_id", self.aws_vpc.vpc_id)
-        pulumi.export("aws_eks_cluster_name", self.aws_eks.cluster.name)
-        
+        pulumi.export("aws_vpc_id", self.aws_vpc_id)
+        pulumi.export("aws_eks_cluster_name", self.aws_eks_cluster_name)
+
         # GCP outputs
-        pulumi.export("gcp_vpc_name", self.gcp_vpc.name)
-        pulumi.export("gcp_gke_cluster_name", self.gcp_gke.cluster.name)
-        
+        pulumi.export("gcp_vpc_name", self.gcp_vpc_name)
+        pulumi.export("gcp_gke_cluster_name", self.gcp_gke_cluster_name)
+
+        # Cross-cloud VPN
+        if self.vpn is not None:
+            pulumi.export("vpn_transit_gateway_id", self.vpn.transit_gateway.id)
+            pulumi.export("vpn_tunnel_count", self.vpn.tunnel_count)
+
         # Multi-cloud endpoints
+        if self.global_routing is not None:
+            pulumi.export("global_hostname", self.global_routing.hostname)
         pulumi.export("multi_cloud_ready", True)
 
 
 # Create multi-cloud infrastructure
-infra = MultiCloudInfrastructure()
\ No newline at end of file
+infra = MultiCloudInfrastructure()
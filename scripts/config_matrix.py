@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""Configuration-matrix simulator for sizing what-ifs.
+
+Runs stack programs under mocks for every combination of the ``--set``
+values, spread over a process pool, and for each variant reports:
+
+* the number of resources the program creates,
+* node and pod capacity (min / desired / max nodes, pods at desired and max),
+* an approximate hourly and monthly cost from a local price table.
+
+Keys are only applied to projects whose ``Pulumi.yaml`` declares them, so
+``--set minNodes=1,3 --set dbTier=db-f1-micro,db-g1-small`` varies the AWS
+program over 2 variants and the GCP program over 4. Billable resources
+missing from the price table are listed as unpriced rather than counted as
+free. Request- and traffic-billed services (S3, SQS, Route 53 queries, flow
+log delivery, data transfer) are outside the estimate.
+
+Usage:
+    python scripts/config_matrix.py aws gcp --set minNodes=1,2,3
+                                            [--set natStrategy=single,per-az,none]
+                                            [--set databaseInstanceClass=db.t3.micro,db.m6g.large]
+                                            [--set dbTier=db-f1-micro,db-custom-2-7680]
+                                            [--set machineType=e2-medium,e2-standard-4]
+                                            [--stack dev] [--config key=value]
+                                            [--prices prices.json] [--processes N] [--json]
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.deploy_graph import parse_config  # noqa: E402
+from scripts.resource_graph import capture_program  # noqa: E402
+
+HOURS_PER_MONTH = 730
+
+# Approximate on-demand list prices in USD per hour (us-west-2 and
+# us-central1). Override or extend any table with --prices <file.json>.
+PRICES = {
+    "resource": {
+        "aws:eks/cluster:Cluster": 0.10,
+        "aws:ec2/natGateway:NatGateway": 0.045,
+        "aws:ec2/eip:Eip": 0.005,
+        "gcp:container/cluster:Cluster": 0.10,
+        "aws:ec2/vpnConnection:VpnConnection": 0.05,
+        "aws:ec2transitgateway/vpcAttachment:VpcAttachment": 0.05,
+        "gcp:compute/vPNTunnel:VPNTunnel": 0.05,
+        "aws:route53/healthCheck:HealthCheck": 0.75 / 730,
+    },
+    "ec2": {
+        "t3.medium": 0.0416, "t3.large": 0.0832, "t3.xlarge": 0.1664,
+        "m6i.large": 0.096, "m6i.xlarge": 0.192, "m7g.large": 0.0816,
+        "m6id.large": 0.1187, "c6id.large": 0.1008,
+    },
+    "rds": {
+        "db.t3.micro": 0.018, "db.t3.small": 0.036, "db.t3.medium": 0.072,
+        "db.t4g.medium": 0.065, "db.m6g.large": 0.152, "db.r6g.large": 0.225,
+    },
+    "elasticache": {
+        "cache.t4g.small": 0.032, "cache.t4g.medium": 0.065, "cache.r7g.large": 0.219,
+    },
+    "gce": {
+        "e2-medium": 0.0335, "e2-standard-2": 0.067, "e2-standard-4": 0.134,
+        "n2-standard-2": 0.0971, "n2-standard-4": 0.1942,
+    },
+    "cloudsql": {
+        "db-f1-micro": 0.0105, "db-g1-small": 0.0350,
+        "db-custom-1-3840": 0.0659, "db-custom-2-7680": 0.1318,
+    },
+    "memorystore": {
+        "SHARED_CORE_NANO": 0.0302, "STANDARD_SMALL": 0.1164, "HIGHMEM_MEDIUM": 0.2107,
+        "REDIS_SHARED_CORE_NANO": 0.0302, "REDIS_STANDARD_SMALL": 0.1164,
+        "REDIS_HIGHMEM_MEDIUM": 0.2107,
+    },
+    # Memorystore for Redis instances, per GB of capacity (5-10 GB band).
+    "redis_gb": {
+        "BASIC": 0.027, "STANDARD_HA": 0.054,
+    },
+    # Per GB-month, converted to hourly when priced.
+    "storage_gb_month": {
+        "rds": 0.115,
+        "cloudsql": 0.17,
+        "filestore:BASIC_HDD": 0.20,
+        "filestore:BASIC_SSD": 0.30,
+        "filestore:ZONAL": 0.28,
+        "filestore:REGIONAL": 0.45,
+    },
+}
+
+# Billable resources priced by usage or without a price line item yet; they
+# are always reported as unpriced unless --prices adds them to "resource".
+UNPRICED_BILLABLE_TYPES = {
+    "aws:efs/fileSystem:FileSystem",
+}
+
+# Regional GKE node pools run ``node_count`` nodes in each of these zones.
+GKE_REGIONAL_ZONES = 3
+GKE_DEFAULT_MAX_PODS = 110
+
+
+def _int(value, default: int = 0) -> int:
+    return int(value) if value is not None else default
+
+
+def _gke_zones(location: str) -> int:
+    # Zones end in a letter suffix (us-central1-a), regions do not.
+    return 1 if location and location[-2] == "-" else GKE_REGIONAL_ZONES
+
+
+def _eks_prefix_delegation(graph) -> bool:
+    for addon in graph.by_type().get("aws:eks/addon:Addon", []):
+        if addon.inputs.get("addonName") == "vpc-cni":
+            env = json.loads(addon.inputs.get("configurationValues") or "{}").get("env", {})
+            return env.get("ENABLE_PREFIX_DELEGATION") == "true"
+    return False
+
+
+def _eks_max_pods(instance_types: list, prefix_delegation: bool):
+    from modules.aws.eks.addons import max_pods_per_node
+    try:
+        return min(max_pods_per_node(t, prefix_delegation) for t in instance_types)
+    except ValueError:
+        return None
+
+
+def price_items(node) -> list:
+    """``(table, key, quantity)`` line items for one resource, or [] if it is not billed."""
+    inputs = node.inputs
+    if node.type == "aws:eks/nodeGroup:NodeGroup":
+        scaling = inputs.get("scalingConfig") or {}
+        nodes = max(_int(scaling.get("minSize")), _int(scaling.get("desiredSize")))
+        return [("ec2", (inputs.get("instanceTypes") or ["?"])[0], nodes)]
+    if node.type == "aws:rds/instance:Instance":
+        copies = 2 if inputs.get("multiAz") else 1
+        return [("rds", inputs.get("instanceClass"), copies),
+                ("storage_gb_month", "rds", _int(inputs.get("allocatedStorage")) * copies)]
+    if node.type == "aws:elasticache/replicationGroup:ReplicationGroup":
+        nodes = _int(inputs.get("numNodeGroups"), 1) * (1 + _int(inputs.get("replicasPerNodeGroup")))
+        return [("elasticache", inputs.get("nodeType"), nodes)]
+    if node.type == "gcp:container/nodePool:NodePool":
+        nodes = _int(inputs.get("nodeCount")) * _gke_zones(inputs.get("location"))
+        return [("gce", (inputs.get("nodeConfig") or {}).get("machineType"), nodes)]
+    if node.type == "gcp:sql/databaseInstance:DatabaseInstance":
+        settings = inputs.get("settings") or {}
+        copies = 2 if settings.get("availabilityType") == "REGIONAL" else 1
+        return [("cloudsql", settings.get("tier"), copies),
+                ("storage_gb_month", "cloudsql", _int(settings.get("diskSize")) * copies)]
+    if node.type == "gcp:memorystore/instance:Instance":
+        nodes = _int(inputs.get("shardCount"), 1) * (1 + _int(inputs.get("replicaCount")))
+        return [("memorystore", inputs.get("nodeType"), nodes)]
+    if node.type == "gcp:redis/cluster:Cluster":
+        nodes = _int(inputs.get("shardCount"), 1) * (1 + _int(inputs.get("replicaCount")))
+        return [("memorystore", inputs.get("nodeType"), nodes)]
+    if node.type == "gcp:redis/instance:Instance":
+        # Redis instances are billed per GB of capacity by tier.
+        return [("redis_gb", inputs.get("tier") or "BASIC", _int(inputs.get("memorySizeGb"), 1))]
+    if node.type == "gcp:filestore/instance:Instance":
+        capacity_gb = sum(_int(share.get("capacityGb")) for share in
+                          ([inputs["fileShares"]] if isinstance(inputs.get("fileShares"), dict)
+                           else inputs.get("fileShares") or []))
+        return [("storage_gb_month", f"filestore:{inputs.get('tier')}", capacity_gb)]
+    if node.type in PRICES["resource"] or node.type in UNPRICED_BILLABLE_TYPES:
+        return [("resource", node.type, 1)]
+    return []
+
+
+def price_graph(graph, prices: dict = None) -> dict:
+    """Approximate hourly cost of a captured graph and the line items left unpriced."""
+    prices = prices or PRICES
+    hourly = 0.0
+    unpriced = set()
+    for node in graph.custom_resources():
+        for table, key, quantity in price_items(node):
+            price = prices.get(table, {}).get(key)
+            if price is None:
+                unpriced.add(f"{table}:{key}")
+                continue
+            if table == "storage_gb_month":
+                price /= HOURS_PER_MONTH
+            hourly += price * quantity
+    return {"hourly": round(hourly, 4), "unpriced": sorted(unpriced)}
+
+
+def capacity(graph) -> dict:
+    """Node counts across node groups and pools, and the pods they can hold."""
+    totals = {"min": 0, "desired": 0, "max": 0, "pods_desired": 0, "pods_max": 0}
+    known = True
+    resources = graph.by_type()
+    pools = []
+    if resources.get("aws:eks/nodeGroup:NodeGroup"):
+        prefix_delegation = _eks_prefix_delegation(graph)
+        for group in resources["aws:eks/nodeGroup:NodeGroup"]:
+            scaling = group.inputs.get("scalingConfig") or {}
+            minimum = _int(scaling.get("minSize"))
+            pools.append((minimum, max(minimum, _int(scaling.get("desiredSize"))),
+                          _int(scaling.get("maxSize")),
+                          _eks_max_pods(group.inputs.get("instanceTypes") or [], prefix_delegation)))
+    for pool in resources.get("gcp:container/nodePool:NodePool", []):
+        zones = _gke_zones(pool.inputs.get("location"))
+        autoscaling = pool.inputs.get("autoscaling") or {}
+        count = _int(pool.inputs.get("nodeCount"))
+        pools.append((_int(autoscaling.get("minNodeCount"), count) * zones, count * zones,
+                      _int(autoscaling.get("maxNodeCount"), count) * zones,
+                      _int(pool.inputs.get("maxPodsPerNode"), GKE_DEFAULT_MAX_PODS)))
+    for minimum, desired, maximum, max_pods in pools:
+        totals["min"] += minimum
+        totals["desired"] += desired
+        totals["max"] += maximum
+        if max_pods is None:
+            known = False
+            continue
+        totals["pods_desired"] += desired * max_pods
+        totals["pods_max"] += maximum * max_pods
+    if not known:
+        totals["pods_desired"] = totals["pods_max"] = None
+    return totals
+
+
+def expand_matrix(projects: list, matrix: dict, fixed: dict = None) -> list:
+    """Return ``(project, variant, config)`` for every combination per project.
+
+    ``variant`` holds only the varied keys; keys a project does not declare
+    are left out of its variants.
+    """
+    fixed = fixed or {}
+    declared = {}
+    for project in projects:
+        with open(os.path.join(REPO_ROOT, project, "Pulumi.yaml")) as f:
+            template = (yaml.safe_load(f).get("template") or {}).get("config") or {}
+        declared[project] = set(template)
+    unknown = set(matrix) - set().union(*declared.values())
+    if unknown:
+        raise ValueError(f"No project declares {', '.join(sorted(unknown))}")
+
+    variants = []
+    for project in projects:
+        keys = [key for key in matrix if key in declared[project]]
+        for values in itertools.product(*(matrix[key] for key in keys)):
+            variant = dict(zip(keys, values))
+            variants.append((project, variant, {**fixed, **variant}))
+    return variants
+
+
+def simulate(project: str, stack: str, variant: dict, config: dict, prices: dict = None) -> dict:
+    """Capture one variant and summarize its size, capacity and cost."""
+    result = {"project": project, "variant": variant}
+    try:
+        graph = capture_program(os.path.join(REPO_ROOT, project), stack, config)
+    except Exception as e:  # a variant the program rejects is a result too
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+    cost = price_graph(graph, prices)
+    result.update({
+        "resources": len(graph.custom_resources()),
+        "capacity": capacity(graph),
+        "hourly": cost["hourly"],
+        "monthly": round(cost["hourly"] * HOURS_PER_MONTH, 2),
+        "unpriced": cost["unpriced"],
+    })
+    return result
+
+
+def run_matrix(variants: list, stack: str = "dev", prices: dict = None,
+               processes: int = None) -> list:
+    """Simulate every variant, in matrix order, across a process pool."""
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(simulate, project, stack, variant, config, prices)
+                   for project, variant, config in variants]
+        return [future.result() for future in futures]
+
+
+def _merge_prices(overrides: dict) -> dict:
+    prices = {table: dict(entries) for table, entries in PRICES.items()}
+    for table, entries in overrides.items():
+        prices.setdefault(table, {}).update(entries)
+    return prices
+
+
+def format_results(results: list) -> str:
+    header = ("project", "variant", "resources", "nodes min/des/max", "pods des/max", "$/hour", "$/month")
+    rows = []
+    for result in results:
+        variant = " ".join(f"{k}={v}" for k, v in result["variant"].items()) or "(defaults)"
+        if "error" in result:
+            rows.append((result["project"], variant, "error", result["error"], "", "", ""))
+            continue
+        cap = result["capacity"]
+        pods = "?" if cap["pods_max"] is None else f"{cap['pods_desired']}/{cap['pods_max']}"
+        unpriced = "*" if result["unpriced"] else ""
+        rows.append((result["project"], variant, str(result["resources"]),
+                     f"{cap['min']}/{cap['desired']}/{cap['max']}", pods,
+                     f"{result['hourly']:.4f}{unpriced}", f"{result['monthly']:.2f}{unpriced}"))
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+             for row in [header] + rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    unpriced = sorted({item for result in results for item in result.get("unpriced", [])})
+    if unpriced:
+        lines.append("")
+        lines.append(f"* excludes unpriced items: {', '.join(unpriced)}")
+    return "\n".join(lines)
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("projects", nargs="+", help="Project directories (aws, gcp)")
+    parser.add_argument("--set", action="append", metavar="KEY=V1,V2,...", dest="matrix",
+                        help="Config key and the values to vary it over")
+    parser.add_argument("--stack", default="dev")
+    parser.add_argument("--config", action="append", metavar="KEY=VALUE",
+                        help="Config applied to every variant")
+    parser.add_argument("--prices", help="JSON file of price tables merged over the defaults")
+    parser.add_argument("--processes", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    matrix = {key: value.split(",") for key, value in parse_config(args.matrix).items()}
+    prices = PRICES
+    if args.prices:
+        with open(args.prices) as f:
+            prices = _merge_prices(json.load(f))
+
+    try:
+        variants = expand_matrix(args.projects, matrix, parse_config(args.config))
+    except ValueError as e:
+        parser.error(str(e))
+    results = run_matrix(variants, args.stack, prices, args.processes)
+    print(json.dumps(results, indent=2) if args.json else format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Slow-query and top-SQL report across RDS and Cloud SQL.
+
+Pulls query statistics for each database target from the sources the
+``enable_observability`` option of ``RdsDatabase`` and ``CloudSqlDatabase``
+turns on, and normalizes them into one JSON format so the clouds can be
+compared side by side:
+
+* ``pg_stat_statements`` over a direct connection (both clouds),
+* Performance Insights top SQL by database load (RDS),
+* slow query log lines written by ``log_min_duration_statement``, exported
+  from CloudWatch Logs or Cloud Logging (both clouds).
+
+Every query entry carries ``query`` (normalized), ``calls``, ``total_ms``,
+``mean_ms`` and ``max_ms``; fields a source does not provide are null.
+
+Usage:
+    python scripts/db_query_report.py --target aws=postgresql://... --target gcp=postgresql://...
+                                      [--slow-log aws=rds.log] [--slow-log gcp=cloudsql.log]
+                                      [--performance-insights aws=db-ABC123 --region us-west-2]
+                                      [--top 20] [--hours 24] [--text]
+
+Requires psycopg (or psycopg2) for --target and boto3 for --performance-insights.
+"""
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+# log_min_duration_statement lines, e.g.
+#   duration: 1532.204 ms  statement: SELECT ...
+#   duration: 812.1 ms  execute <unnamed>: SELECT ...
+SLOW_LOG_PATTERN = re.compile(
+    r"duration: (?P<ms>[\d.]+) ms\s+(?:statement|execute [^:]*): (?P<query>.*)$"
+)
+
+# Literals replaced by placeholders so repeated statements group together.
+NORMALIZE_PATTERNS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\$\d+"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\s+"), " "),
+]
+
+TOP_SQL_QUERY = """
+SELECT query, calls, total_exec_time, mean_exec_time, max_exec_time, rows
+FROM pg_stat_statements
+WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+ORDER BY total_exec_time DESC
+LIMIT %s
+"""
+
+EXTENSION_QUERY = "SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'"
+
+
+def normalize_query(query: str) -> str:
+    """Replace literals and parameters with ``?`` and collapse whitespace."""
+    for pattern, replacement in NORMALIZE_PATTERNS:
+        query = pattern.sub(replacement, query)
+    return query.strip().rstrip(";")
+
+
+def _entry(query: str, calls=None, total_ms=None, mean_ms=None, max_ms=None, **extra) -> dict:
+    return {
+        "query": query,
+        "calls": calls,
+        "total_ms": total_ms,
+        "mean_ms": mean_ms,
+        "max_ms": max_ms,
+        **extra,
+    }
+
+
+def parse_slow_log(lines) -> list:
+    """Return ``(duration_ms, query)`` for every slow statement in the log lines."""
+    statements = []
+    for line in lines:
+        match = SLOW_LOG_PATTERN.search(line.rstrip("\n"))
+        if match:
+            statements.append((float(match.group("ms")), match.group("query")))
+    return statements
+
+
+def summarize_slow_log(statements: list, top: int = 20) -> list:
+    """Group slow statements by normalized text, slowest total first."""
+    groups = defaultdict(list)
+    for duration, query in statements:
+        groups[normalize_query(query)].append(duration)
+    entries = [
+        _entry(query, calls=len(durations), total_ms=round(sum(durations), 3),
+               mean_ms=round(sum(durations) / len(durations), 3), max_ms=max(durations))
+        for query, durations in groups.items()
+    ]
+    entries.sort(key=lambda entry: entry["total_ms"], reverse=True)
+    return entries[:top]
+
+
+def _connect(dsn: str):
+    try:
+        import psycopg
+        return psycopg.connect(dsn)
+    except ImportError:
+        pass
+    try:
+        import psycopg2
+        return psycopg2.connect(dsn)
+    except ImportError:
+        sys.exit("db_query_report.py --target requires psycopg: pip install psycopg[binary]")
+
+
+def fetch_top_sql(dsn: str, top: int = 20, connection=None) -> list:
+    """Top statements by total execution time from pg_stat_statements.
+
+    The report is read-only: when the extension is not created in the
+    target database it exits asking the operator to create it.
+    """
+    if connection is None:
+        connection = _connect(dsn)
+    try:
+        cursor = connection.cursor()
+        cursor.execute(EXTENSION_QUERY)
+        if cursor.fetchone() is None:
+            sys.exit(
+                "pg_stat_statements is not installed in this database; as a user with "
+                "CREATE privilege run: CREATE EXTENSION pg_stat_statements"
+            )
+        cursor.execute(TOP_SQL_QUERY, (top,))
+        rows = cursor.fetchall()
+    finally:
+        connection.close()
+    return [
+        _entry(normalize_query(query), calls=calls, total_ms=round(total, 3),
+               mean_ms=round(mean, 3), max_ms=round(maximum, 3), rows=row_count)
+        for query, calls, total, mean, maximum, row_count in rows
+    ]
+
+
+def fetch_performance_insights(resource_id: str, region: str = None, hours: int = 24,
+                               top: int = 20, client=None) -> list:
+    """Top SQL by average active sessions from Performance Insights."""
+    if client is None:
+        try:
+            import boto3
+        except ImportError:
+            sys.exit("db_query_report.py --performance-insights requires boto3: pip install boto3")
+        client = boto3.client("pi", region_name=region)
+    end = datetime.now(timezone.utc)
+    response = client.describe_dimension_keys(
+        ServiceType="RDS",
+        Identifier=resource_id,
+        StartTime=end - timedelta(hours=hours),
+        EndTime=end,
+        Metric="db.load.avg",
+        GroupBy={"Group": "db.sql_tokenized", "Limit": top},
+    )
+    return [
+        _entry(normalize_query(key["Dimensions"].get("db.sql_tokenized.statement", "")),
+               db_load=key.get("Total"))
+        for key in response.get("Keys", [])
+    ]
+
+
+def _cloud(name: str) -> str:
+    for cloud in ("aws", "gcp"):
+        if name == cloud or name.startswith(f"{cloud}-"):
+            return cloud
+    return None
+
+
+def build_report(targets: dict, slow_logs: dict, insights: dict, region: str = None,
+                 hours: int = 24, top: int = 20) -> list:
+    """Collect every source per target name into the common format."""
+    report = []
+    for name in sorted(set(targets) | set(slow_logs) | set(insights)):
+        section = {"target": name, "cloud": _cloud(name), "top_sql": None,
+                   "slow_queries": None, "performance_insights": None}
+        if name in targets:
+            section["top_sql"] = fetch_top_sql(targets[name], top)
+        if name in slow_logs:
+            with open(slow_logs[name]) as f:
+                section["slow_queries"] = summarize_slow_log(parse_slow_log(f), top)
+        if name in insights:
+            section["performance_insights"] = fetch_performance_insights(
+                insights[name], region, hours, top
+            )
+        report.append(section)
+    return report
+
+
+def format_report(report: list) -> str:
+    lines = []
+    for section in report:
+        lines.append(f"{section['target']} ({section['cloud'] or 'unknown cloud'})")
+        for label, key, metric in [("Top SQL", "top_sql", "total_ms"),
+                                   ("Slow queries", "slow_queries", "total_ms"),
+                                   ("Performance Insights", "performance_insights", "db_load")]:
+            if section[key] is None:
+                continue
+            lines.append(f"  {label}:")
+            for entry in section[key]:
+                value = entry.get(metric)
+                calls = entry["calls"] if entry["calls"] is not None else "-"
+                lines.append(f"    {value if value is not None else '-':>12} {metric}  "
+                             f"{calls:>8} calls  {entry['query'][:100]}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _pairs(values: list, flag: str) -> dict:
+    pairs = {}
+    for value in values or []:
+        name, sep, rest = value.partition("=")
+        if not sep:
+            raise SystemExit(f"{flag} expects NAME=VALUE, got {value!r}")
+        pairs[name] = rest
+    return pairs
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--target", action="append", metavar="NAME=DSN",
+                        help="Read pg_stat_statements from a database")
+    parser.add_argument("--slow-log", action="append", metavar="NAME=PATH",
+                        help="Summarize an exported slow query log")
+    parser.add_argument("--performance-insights", action="append", metavar="NAME=RESOURCE_ID",
+                        help="Read top SQL from Performance Insights (rds_resource_id output)")
+    parser.add_argument("--region", help="AWS region for Performance Insights")
+    parser.add_argument("--hours", type=int, default=24, help="Performance Insights window")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--text", action="store_true", help="Print a table instead of JSON")
+    args = parser.parse_args(argv)
+
+    targets = _pairs(args.target, "--target")
+    slow_logs = _pairs(args.slow_log, "--slow-log")
+    insights = _pairs(args.performance_insights, "--performance-insights")
+    if not (targets or slow_logs or insights):
+        parser.error("give at least one --target, --slow-log or --performance-insights")
+
+    report = build_report(targets, slow_logs, insights, args.region, args.hours, args.top)
+    print(format_report(report) if args.text else json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,7 +21,7 @@ print_error() {
     echo -e "${RED}[ERROR]${NC} $1"
 }
 
-USAGE="Usage: $0 <provider> <stack> [--refresh] [--target] [--skip-preview]"
+USAGE="Usage: $0 <provider> <stack> [--refresh] [--target] [--skip-preview] [--skip-policy]"
 
 if [ $# -lt 2 ]; then
     print_error "Missing arguments"
@@ -35,6 +35,7 @@ shift 2
 
 EXTRA_ARGS=""
 SKIP_PREVIEW=false
+SKIP_POLICY=false
 
 while [[ $# -gt 0 ]]; do
     case $1 in
@@ -50,6 +51,10 @@ while [[ $# -gt 0 ]]; do
         SKIP_PREVIEW=true
         shift
         ;;
+        --skip-policy)
+        SKIP_POLICY=true
+        shift
+        ;;
         *)
         print_error "Unknown option: $1"
         echo $USAGE
@@ -83,6 +88,26 @@ validate_stack() {
     esac
 }
 
+# Run a pulumi operation with its engine event log recorded by
+# scripts/deploy_telemetry.py, keyed by stack and commit.
+run_with_telemetry() {
+    local operation=$1
+    local stack=$2
+    shift 2
+    local events
+    events=$(mktemp)
+    local status=0
+    
+    pulumi $operation --event-log "$events" "$@" || status=$?
+    python ../scripts/deploy_telemetry.py record \
+        --stack "$PROVIDER/$stack" \
+        --commit "$(git rev-parse HEAD 2>/dev/null || echo unknown)" \
+        --operation $operation "$events" \
+        || print_warning "Could not record deploy telemetry"
+    rm -f "$events"
+    return $status
+}
+
 deploy_stack() {
     local provider=$1
     local stack=$2
@@ -110,9 +135,18 @@ deploy_stack() {
         pulumi stack init $stack
     fi
     
+    # Policy preflight (Python programs only)
+    if [ "$SKIP_POLICY" = false ] && [ -f "__main__.py" ]; then
+        print_status "Running policy preflight..."
+        if ! python ../scripts/policy_preflight.py $provider --stack $stack; then
+            print_error "Policy preflight failed; fix the violations or pass --skip-policy"
+            exit 1
+        fi
+    fi
+    
     # Refresh state
     print_status "Refreshing stack state..."
-    pulumi refresh --yes
+    run_with_telemetry refresh $stack --yes
     
     # Preview changes
     if [ "$SKIP_PREVIEW" = false ]; then
@@ -122,7 +156,7 @@ deploy_stack() {
     
     # Deploy
     print_status "Deploying infrastructure..."
-    pulumi up --yes $EXTRA_ARGS
+    run_with_telemetry up $stack --yes $EXTRA_ARGS
     
     cd ..
 }
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""Deployment critical-path estimator.
+
+Captures the resource graph of a Python stack program under mocks, annotates
+each resource with a typical create duration and reports:
+
+* the critical path (the longest chain of dependent creates),
+* total work, average parallelism and peak width of the DAG,
+* the estimated wall time for a given ``pulumi up --parallel`` value,
+* ``depends_on`` edges that are redundant (already implied by an output the
+  resource consumes), over-broad (target a component) or that lengthen the
+  critical path.
+
+Usage:
+    python scripts/deploy_graph.py aws [--stack dev] [--config key=value]
+                                       [--durations durations.json] [--parallel N]
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.resource_graph import capture_program  # noqa: E402
+
+# Typical create durations in seconds, from observed deploys. Override or
+# extend with --durations <file.json>.
+TYPICAL_CREATE_SECONDS = {
+    "aws:ec2/vpc:Vpc": 5,
+    "aws:ec2/subnet:Subnet": 6,
+    "aws:ec2/internetGateway:InternetGateway": 4,
+    "aws:ec2/eip:Eip": 2,
+    "aws:ec2/natGateway:NatGateway": 110,
+    "aws:ec2/routeTable:RouteTable": 4,
+    "aws:ec2/routeTableAssociation:RouteTableAssociation": 2,
+    "aws:ec2/route:Route": 2,
+    "aws:ec2/managedPrefixList:ManagedPrefixList": 3,
+    "aws:ec2/egressOnlyInternetGateway:EgressOnlyInternetGateway": 3,
+    "aws:ec2/customerGateway:CustomerGateway": 3,
+    "aws:ec2/vpnConnection:VpnConnection": 300,
+    "aws:ec2transitgateway/transitGateway:TransitGateway": 150,
+    "aws:ec2transitgateway/vpcAttachment:VpcAttachment": 60,
+    "aws:ec2/securityGroup:SecurityGroup": 5,
+    "aws:iam/role:Role": 3,
+    "aws:iam/rolePolicyAttachment:RolePolicyAttachment": 2,
+    "aws:eks/cluster:Cluster": 600,
+    "aws:eks/nodeGroup:NodeGroup": 240,
+    "aws:ec2/launchTemplate:LaunchTemplate": 5,
+    "aws:eks/addon:Addon": 60,
+    "aws:rds/subnetGroup:SubnetGroup": 2,
+    "aws:rds/instance:Instance": 420,
+    "aws:rds/parameterGroup:ParameterGroup": 5,
+    "aws:elasticache/subnetGroup:SubnetGroup": 2,
+    "aws:elasticache/replicationGroup:ReplicationGroup": 720,
+    "aws:efs/fileSystem:FileSystem": 10,
+    "aws:efs/mountTarget:MountTarget": 90,
+    "aws:route53/healthCheck:HealthCheck": 5,
+    "aws:route53/record:Record": 45,
+    "aws:s3/bucketV2:BucketV2": 3,
+    "aws:s3/bucket:Bucket": 3,
+    "gcp:compute/network:Network": 25,
+    "gcp:compute/subnetwork:Subnetwork": 20,
+    "gcp:compute/router:Router": 20,
+    "gcp:compute/haVpnGateway:HaVpnGateway": 20,
+    "gcp:compute/externalVpnGateway:ExternalVpnGateway": 10,
+    "gcp:compute/vPNTunnel:VPNTunnel": 30,
+    "gcp:container/cluster:Cluster": 420,
+    "gcp:container/nodePool:NodePool": 300,
+    "gcp:sql/databaseInstance:DatabaseInstance": 600,
+    "gcp:sql/database:Database": 15,
+    "gcp:sql/user:User": 10,
+    "gcp:storage/bucket:Bucket": 3,
+    "gcp:networkconnectivity/serviceConnectionPolicy:ServiceConnectionPolicy": 10,
+    "gcp:memorystore/instance:Instance": 900,
+    "gcp:redis/cluster:Cluster": 900,
+    "gcp:redis/instance:Instance": 420,
+    "gcp:filestore/instance:Instance": 480,
+    "gcp:compute/globalAddress:GlobalAddress": 10,
+    "gcp:servicenetworking/connection:Connection": 60,
+    "gcp:artifactregistry/repository:Repository": 10,
+    "gcp:serviceaccount/account:Account": 3,
+    "gcp:serviceaccount/iAMMember:IAMMember": 5,
+    "gcp:projects/iAMMember:IAMMember": 10,
+    "pulumi:providers:kubernetes": 1,
+    "kubernetes:helm.sh/v3:Release": 60,
+    "kubernetes:storage.k8s.io/v1:StorageClass": 1,
+    "kubernetes:core/v1:PersistentVolume": 1,
+    "kubernetes:core/v1:Namespace": 1,
+    "kubernetes:core/v1:ServiceAccount": 1,
+    "kubernetes:core/v1:ConfigMap": 1,
+    "kubernetes:core/v1:Secret": 1,
+    "kubernetes:core/v1:Service": 2,
+    "kubernetes:apps/v1:Deployment": 60,
+    "kubernetes:autoscaling/v2:HorizontalPodAutoscaler": 1,
+    "kubernetes:policy/v1:PodDisruptionBudget": 1,
+}
+DEFAULT_CREATE_SECONDS = 5
+
+
+def _dependents(edges: dict) -> dict:
+    dependents = {urn: [] for urn in edges}
+    for urn, deps in edges.items():
+        for dep in deps:
+            dependents[dep].append(urn)
+    return dependents
+
+
+class DeployGraph:
+    """Dependency DAG of the custom resources in a captured resource graph."""
+
+    def __init__(self, graph, durations: dict = None):
+        self.graph = graph
+        self.durations = {**TYPICAL_CREATE_SECONDS, **(durations or {})}
+        self.nodes = {node.urn: node for node in graph.custom_resources()}
+        self.edges = {urn: graph.deploy_dependencies(node) & self.nodes.keys()
+                      for urn, node in self.nodes.items()}
+
+    def duration(self, urn: str) -> float:
+        return self.durations.get(self.nodes[urn].type, DEFAULT_CREATE_SECONDS)
+
+    def topological_order(self, edges: dict = None) -> list:
+        edges = edges or self.edges
+        dependents = _dependents(edges)
+        pending = {urn: len(deps) for urn, deps in edges.items()}
+        ready = sorted(urn for urn, count in pending.items() if count == 0)
+        order = []
+        while ready:
+            urn = ready.pop()
+            order.append(urn)
+            for dependent in dependents[urn]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(edges):
+            raise ValueError("Resource graph contains a dependency cycle")
+        return order
+
+    def earliest_finish(self, edges: dict = None) -> dict:
+        """Finish time of each resource with unlimited parallelism."""
+        edges = edges or self.edges
+        finish = {}
+        for urn in self.topological_order(edges):
+            start = max((finish[dep] for dep in edges[urn]), default=0)
+            finish[urn] = start + self.duration(urn)
+        return finish
+
+    def critical_path(self, edges: dict = None) -> list:
+        """Longest chain of dependent creates, first resource first."""
+        edges = edges or self.edges
+        finish = self.earliest_finish(edges)
+        if not finish:
+            return []
+        urn = max(finish, key=finish.get)
+        path = [urn]
+        while edges[urn]:
+            urn = max(edges[urn], key=finish.get)
+            path.append(urn)
+        return list(reversed(path))
+
+    def critical_path_seconds(self, edges: dict = None) -> float:
+        return max(self.earliest_finish(edges).values(), default=0)
+
+    def total_work_seconds(self) -> float:
+        return sum(self.duration(urn) for urn in self.nodes)
+
+    def peak_width(self) -> int:
+        """Most resources in flight at once with unlimited parallelism."""
+        finish = self.earliest_finish()
+        events = []
+        for urn, end in finish.items():
+            events.append((end - self.duration(urn), 1))
+            events.append((end, -1))
+        width = peak = 0
+        # Ends sort before starts at the same instant.
+        for _, delta in sorted(events):
+            width += delta
+            peak = max(peak, width)
+        return peak
+
+    def simulate(self, parallel: int) -> float:
+        """Wall time when at most ``parallel`` operations run concurrently.
+
+        Ready resources are started in order of their remaining critical
+        path length, which approximates the engine's behaviour well enough
+        for comparing choices.
+        """
+        tail = self._longest_tail()
+        dependents = _dependents(self.edges)
+        pending = {urn: len(deps) for urn, deps in self.edges.items()}
+        ready = [(-tail[urn], urn) for urn, count in pending.items() if count == 0]
+        heapq.heapify(ready)
+        running = []
+        now = 0.0
+        while ready or running:
+            while ready and len(running) < parallel:
+                _, urn = heapq.heappop(ready)
+                heapq.heappush(running, (now + self.duration(urn), urn))
+            now, urn = heapq.heappop(running)
+            for dependent in dependents[urn]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    heapq.heappush(ready, (-tail[dependent], dependent))
+        return now
+
+    def _longest_tail(self) -> dict:
+        dependents = _dependents(self.edges)
+        tail = {}
+        for urn in reversed(self.topological_order()):
+            tail[urn] = self.duration(urn) + max((tail[d] for d in dependents[urn]), default=0)
+        return tail
+
+    def _reachable(self, start: str, edges: dict) -> set:
+        seen = set()
+        stack = list(edges[start])
+        while stack:
+            urn = stack.pop()
+            if urn in seen:
+                continue
+            seen.add(urn)
+            stack.extend(edges.get(urn, ()))
+        return seen
+
+    def depends_on_findings(self) -> list:
+        """Classify every explicit ``depends_on`` edge between resources.
+
+        Returns dicts with ``kind`` set to ``redundant`` (the target is already
+        reached through consumed outputs), ``over-broad`` (the target is a
+        component, so the resource waits for all of its children) or
+        ``serializing`` (the edge adds time to the critical path).
+        """
+        findings = []
+        baseline = self.critical_path_seconds()
+        for urn, node in self.nodes.items():
+            for target in sorted(node.explicit_dependencies):
+                target_node = self.graph.nodes.get(target)
+                if target_node is None:
+                    continue
+                finding = {
+                    "resource": node.name,
+                    "type": node.type,
+                    "depends_on": target_node.name,
+                    "source": node.source,
+                }
+                if not target_node.custom:
+                    findings.append({**finding, "kind": "over-broad",
+                                     "detail": "targets a component; waits on all of its children"})
+                    continue
+                others = {dep for dep in self.edges[urn] if dep != target}
+                implied = target in node.implicit_dependencies or any(
+                    target in self._reachable(dep, self.edges) for dep in others
+                )
+                if implied:
+                    findings.append({**finding, "kind": "redundant",
+                                     "detail": "already implied by consumed outputs"})
+                    continue
+                without = {**self.edges, urn: others}
+                saved = baseline - self.critical_path_seconds(without)
+                if saved > 0:
+                    findings.append({**finding, "kind": "serializing",
+                                     "detail": f"adds {saved:.0f}s to the critical path"})
+        return findings
+
+    def summary(self, parallel: int = None) -> dict:
+        critical = self.critical_path_seconds()
+        work = self.total_work_seconds()
+        finish = self.earliest_finish()
+        result = {
+            "project": self.graph.project,
+            "stack": self.graph.stack,
+            "resources": len(self.nodes),
+            "total_work_seconds": work,
+            "critical_path_seconds": critical,
+            "average_parallelism": round(work / critical, 2) if critical else 0,
+            "peak_width": self.peak_width(),
+            "critical_path": [
+                {
+                    "type": self.nodes[urn].type,
+                    "name": self.nodes[urn].name,
+                    "seconds": self.duration(urn),
+                    "finish": finish[urn],
+                }
+                for urn in self.critical_path()
+            ],
+            "depends_on": self.depends_on_findings(),
+        }
+        if parallel:
+            result["parallel"] = parallel
+            result["estimated_wall_seconds"] = self.simulate(parallel)
+        return result
+
+
+def format_summary(summary: dict) -> str:
+    lines = [
+        f"{summary['project']} ({summary['stack']}): {summary['resources']} resources",
+        f"  total work:          {summary['total_work_seconds']:.0f}s",
+        f"  critical path:       {summary['critical_path_seconds']:.0f}s",
+        f"  average parallelism: {summary['average_parallelism']}",
+        f"  peak width:          {summary['peak_width']}",
+    ]
+    if "estimated_wall_seconds" in summary:
+        lines.append(f"  wall time @ --parallel {summary['parallel']}: "
+                     f"{summary['estimated_wall_seconds']:.0f}s")
+    lines.append("")
+    lines.append("Critical path:")
+    for step in summary["critical_path"]:
+        lines.append(f"  {step['finish']:>6.0f}s  +{step['seconds']:<4.0f} {step['type']}  {step['name']}")
+    if summary["depends_on"]:
+        lines.append("")
+        lines.append("depends_on findings:")
+        for finding in summary["depends_on"]:
+            lines.append(f"  [{finding['kind']}] {finding['resource']} -> {finding['depends_on']}: "
+                         f"{finding['detail']} ({finding['source']})")
+    return "\n".join(lines)
+
+
+def parse_config(pairs: list) -> dict:
+    config = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition("=")
+        config[key] = value
+    return config
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("project", help="Project directory (aws, gcp, multi-cloud)")
+    parser.add_argument("--stack", default="dev")
+    parser.add_argument("--config", action="append", metavar="KEY=VALUE")
+    parser.add_argument("--durations", help="JSON file mapping type tokens to seconds")
+    parser.add_argument("--parallel", type=int, help="Estimate wall time for pulumi up --parallel N")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    durations = None
+    if args.durations:
+        with open(args.durations) as f:
+            durations = json.load(f)
+
+    graph = capture_program(os.path.join(REPO_ROOT, args.project), args.stack,
+                            parse_config(args.config))
+    summary = DeployGraph(graph, durations).summary(args.parallel)
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Per-resource deploy timing telemetry.
+
+Reads the engine event log written by ``pulumi up|refresh|destroy
+--event-log <file>`` and records every resource step (create, update,
+replace, delete, refresh, ...) with its duration, retries, provider and
+outcome in a local SQLite database keyed by stack and commit. The report
+shows the slowest resource types across deploys and flags types whose
+latest deploy was markedly slower than their history.
+
+Usage:
+    python scripts/deploy_telemetry.py record --stack <s> --commit <sha> --operation up events.jsonl
+    python scripts/deploy_telemetry.py report [--stack <s>] [--top 10] [--threshold 1.5] [--json]
+
+Environment:
+    DEPLOY_TELEMETRY_DB   database path (default .telemetry/deploys.db in the repo)
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import statistics
+import sys
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB = os.path.join(REPO_ROOT, ".telemetry", "deploys.db")
+
+# Diagnostics that indicate a provider retried a request.
+RETRY_PATTERN = re.compile(r"\bretry(ing)?\b|\bretries\b", re.IGNORECASE)
+# Steps that do no provider work.
+IGNORED_OPS = {"same"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deploys (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stack TEXT NOT NULL,
+    commit_sha TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    started_at INTEGER,
+    finished_at INTEGER,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS deploys_stack_commit ON deploys (stack, commit_sha);
+CREATE TABLE IF NOT EXISTS steps (
+    deploy_id INTEGER NOT NULL REFERENCES deploys (id),
+    urn TEXT NOT NULL,
+    type TEXT NOT NULL,
+    op TEXT NOT NULL,
+    provider TEXT,
+    started_at INTEGER,
+    duration_seconds INTEGER,
+    retries INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS steps_type ON steps (type);
+"""
+
+
+def _provider_package(provider: str) -> str:
+    """``urn:...::pulumi:providers:aws::default_7_0_0::id`` -> ``aws``."""
+    if not provider:
+        return None
+    match = re.search(r"pulumi:providers:([^:]+)", provider)
+    return match.group(1) if match else provider
+
+
+class EventCollector:
+    """Turns engine events into completed resource steps."""
+
+    def __init__(self):
+        self.steps = []
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self._pending = {}
+        self._retries = defaultdict(int)
+
+    def feed(self, event: dict):
+        timestamp = event.get("timestamp")
+        if timestamp is not None:
+            if self.started_at is None:
+                self.started_at = timestamp
+            self.finished_at = timestamp
+
+        if "resourcePreEvent" in event:
+            pre = event["resourcePreEvent"]
+            metadata = pre.get("metadata") or {}
+            if pre.get("planning") or metadata.get("op") in IGNORED_OPS:
+                return
+            self._pending[(metadata["urn"], metadata["op"])] = (timestamp, metadata)
+        elif "resOutputsEvent" in event:
+            self._finish(event["resOutputsEvent"], timestamp, failed=False)
+        elif "resOpFailedEvent" in event:
+            self._finish(event["resOpFailedEvent"], timestamp, failed=True)
+        elif "diagnosticEvent" in event:
+            diagnostic = event["diagnosticEvent"]
+            if diagnostic.get("urn") and RETRY_PATTERN.search(diagnostic.get("message") or ""):
+                self._retries[diagnostic["urn"]] += 1
+        elif "summaryEvent" in event:
+            self.result = "failed" if any(step["failed"] for step in self.steps) else "succeeded"
+
+    def _finish(self, payload: dict, timestamp: int, failed: bool):
+        if payload.get("planning"):
+            return
+        metadata = payload.get("metadata") or {}
+        key = (metadata.get("urn"), metadata.get("op"))
+        if key not in self._pending:
+            return
+        started, pre_metadata = self._pending.pop(key)
+        self.steps.append({
+            "urn": key[0],
+            "type": pre_metadata.get("type") or metadata.get("type"),
+            "op": key[1],
+            "provider": _provider_package(pre_metadata.get("provider")),
+            "started_at": started,
+            "duration_seconds": (timestamp - started) if None not in (timestamp, started) else None,
+            "retries": self._retries.pop(key[0], 0),
+            "failed": failed,
+        })
+
+
+def read_events(path: str):
+    """Yield events from a newline-delimited JSON event log."""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    path = path or os.environ.get("DEPLOY_TELEMETRY_DB") or DEFAULT_DB
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    return db
+
+
+def record(db: sqlite3.Connection, events, stack: str, commit: str, operation: str) -> int:
+    """Store the steps of one engine run and return its deploy id."""
+    collector = EventCollector()
+    for event in events:
+        collector.feed(event)
+
+    with db:
+        cursor = db.execute(
+            "INSERT INTO deploys (stack, commit_sha, operation, started_at, finished_at, result)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (stack, commit, operation, collector.started_at, collector.finished_at,
+             collector.result or "incomplete")
+        )
+        deploy_id = cursor.lastrowid
+        db.executemany(
+            "INSERT INTO steps (deploy_id, urn, type, op, provider, started_at,"
+            " duration_seconds, retries, failed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(deploy_id, s["urn"], s["type"], s["op"], s["provider"], s["started_at"],
+              s["duration_seconds"], s["retries"], int(s["failed"])) for s in collector.steps]
+        )
+    return deploy_id
+
+
+def report(db: sqlite3.Connection, stack: str = None, top: int = 10,
+           threshold: float = 1.5, min_seconds: int = 30) -> dict:
+    """Summarize step durations per resource type and operation and flag regressions.
+
+    A (type, op) pair regresses when its median duration in the latest
+    deploy that ran it exceeds ``threshold`` times its median over earlier
+    deploys and the difference is at least ``min_seconds``.
+    """
+    query = (
+        "SELECT d.id, d.commit_sha, s.type, s.op, s.duration_seconds, s.retries, s.provider"
+        " FROM steps s JOIN deploys d ON d.id = s.deploy_id"
+        " WHERE s.failed = 0 AND s.duration_seconds IS NOT NULL"
+    )
+    params = []
+    if stack:
+        query += " AND d.stack = ?"
+        params.append(stack)
+
+    by_type = defaultdict(lambda: defaultdict(list))
+    retries = defaultdict(int)
+    by_provider = defaultdict(list)
+    commits = {}
+    for deploy_id, commit, type_token, op, duration, step_retries, provider in db.execute(query, params):
+        by_type[(type_token, op)][deploy_id].append(duration)
+        retries[(type_token, op)] += step_retries
+        commits[deploy_id] = commit
+        if provider:
+            by_provider[provider].append(duration)
+
+    slowest = []
+    regressions = []
+    for (type_token, op), deploys in by_type.items():
+        durations = [d for values in deploys.values() for d in values]
+        slowest.append({
+            "type": type_token,
+            "op": op,
+            "steps": len(durations),
+            "deploys": len(deploys),
+            "median_seconds": statistics.median(durations),
+            "max_seconds": max(durations),
+            "retries": retries[(type_token, op)],
+        })
+
+        if len(deploys) < 2:
+            continue
+        latest = max(deploys)
+        latest_median = statistics.median(deploys[latest])
+        baseline = statistics.median(d for deploy_id, values in deploys.items()
+                                     if deploy_id != latest for d in values)
+        if latest_median >= baseline * threshold and latest_median - baseline >= min_seconds:
+            regressions.append({
+                "type": type_token,
+                "op": op,
+                "commit": commits[latest],
+                "median_seconds": latest_median,
+                "baseline_seconds": baseline,
+            })
+
+    slowest.sort(key=lambda row: row["median_seconds"], reverse=True)
+    return {
+        "slowest_types": slowest[:top],
+        "provider_latency": {
+            provider: {"steps": len(durations), "median_seconds": statistics.median(durations)}
+            for provider, durations in sorted(by_provider.items())
+        },
+        "regressions": regressions,
+    }
+
+
+def format_report(summary: dict) -> str:
+    lines = ["Slowest resource types:"]
+    for row in summary["slowest_types"]:
+        lines.append(
+            f"  {row['median_seconds']:>7.0f}s median {row['max_seconds']:>6.0f}s max "
+            f"{row['steps']:>4} steps {row['retries']:>3} retries  {row['type']} ({row['op']})"
+        )
+    lines += ["", "Provider latency:"]
+    for provider, row in summary["provider_latency"].items():
+        lines.append(f"  {row['median_seconds']:>7.0f}s median {row['steps']:>4} steps  {provider}")
+    lines += ["", "Regressions:"]
+    for row in summary["regressions"]:
+        lines.append(
+            f"  {row['type']} ({row['op']}): {row['median_seconds']:.0f}s at {row['commit'][:12]} "
+            f"(baseline {row['baseline_seconds']:.0f}s)"
+        )
+    if not summary["regressions"]:
+        lines.append("  none")
+    return "\n".join(lines)
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", help="SQLite database path")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Store an engine event log")
+    record_parser.add_argument("events", help="File written by pulumi --event-log")
+    record_parser.add_argument("--stack", required=True)
+    record_parser.add_argument("--commit", required=True)
+    record_parser.add_argument("--operation", choices=["up", "refresh", "destroy"], required=True)
+
+    report_parser = commands.add_parser("report", help="Show slowest types and regressions")
+    report_parser.add_argument("--stack")
+    report_parser.add_argument("--top", type=int, default=10)
+    report_parser.add_argument("--threshold", type=float, default=1.5,
+                               help="Latest/baseline median ratio that counts as a regression")
+    report_parser.add_argument("--min-seconds", type=int, default=30,
+                               help="Ignore regressions smaller than this")
+    report_parser.add_argument("--json", action="store_true")
+
+    args = parser.parse_args(argv)
+    db = connect(args.db)
+
+    if args.command == "record":
+        deploy_id = record(db, read_events(args.events), args.stack, args.commit, args.operation)
+        count = db.execute("SELECT COUNT(*) FROM steps WHERE deploy_id = ?", (deploy_id,)).fetchone()[0]
+        print(f"Recorded {count} resource steps for {args.stack}@{args.commit[:12]} ({args.operation})")
+        return 0
+
+    summary = report(db, args.stack, args.top, args.threshold, args.min_seconds)
+    print(json.dumps(summary, indent=2) if args.json else format_report(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Caching kubectl exec credential plugin for EKS.
+
+Wraps a token command (``aws-iam-authenticator token -i <cluster>`` or
+``aws eks get-token --cluster-name <cluster>``) and reuses its
+ExecCredential until shortly before it expires, so kubectl, the deploy
+tooling and the Pulumi Kubernetes provider stop paying an STS round-trip on
+every client start. Tokens are cached per cluster, role and AWS profile;
+concurrent callers serialise on a lock file so only one of them fetches.
+
+Usage (as the kubeconfig ``exec`` command):
+    eks_token_cache.py --cluster <name> [--role-arn <arn>] -- <token command...>
+
+Environment:
+    EKS_TOKEN_CACHE_DIR   cache directory (default ~/.kube/cache/eks-tokens)
+"""
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".kube", "cache", "eks-tokens")
+# Refresh this many seconds before expiry so a token never expires in flight.
+DEFAULT_REFRESH_SKEW = 60
+
+
+def parse_expiration(credential: dict) -> float:
+    """Return the credential's expiry as a UNIX timestamp, or None."""
+    stamp = (credential.get("status") or {}).get("expirationTimestamp")
+    if not stamp:
+        return None
+    return datetime.fromisoformat(stamp.replace("Z", "+00:00")).timestamp()
+
+
+def fetch_credential(command: list) -> dict:
+    """Run the upstream token command and parse its ExecCredential."""
+    result = subprocess.run(command, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)
+
+
+class TokenCache:
+    def __init__(self, directory: str = None, refresh_skew: float = DEFAULT_REFRESH_SKEW,
+                 clock=time.time):
+        self.directory = os.path.expanduser(
+            directory or os.environ.get("EKS_TOKEN_CACHE_DIR") or DEFAULT_CACHE_DIR
+        )
+        self.refresh_skew = refresh_skew
+        self.clock = clock
+
+    def path(self, cluster: str, role_arn: str = None) -> str:
+        key = "\0".join([cluster, role_arn or "", os.environ.get("AWS_PROFILE", "")])
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def read(self, path: str) -> dict:
+        """Return the cached credential at ``path`` if it is still fresh."""
+        try:
+            with open(path) as f:
+                credential = json.load(f)
+        except (OSError, ValueError):
+            return None
+        expires = parse_expiration(credential)
+        if expires is None or expires - self.refresh_skew <= self.clock():
+            return None
+        return credential
+
+    def write(self, path: str, credential: dict):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(credential, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, cluster: str, role_arn: str, fetch) -> dict:
+        """Return a fresh credential, calling ``fetch()`` only on a cache miss."""
+        path = self.path(cluster, role_arn)
+        credential = self.read(path)
+        if credential is not None:
+            return credential
+
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        with open(path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                # Another caller may have refreshed while we waited.
+                credential = self.read(path)
+                if credential is None:
+                    credential = fetch()
+                    if parse_expiration(credential) is not None:
+                        self.write(path, credential)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        return credential
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Caching EKS exec credential plugin")
+    parser.add_argument("--cluster", required=True)
+    parser.add_argument("--role-arn")
+    parser.add_argument("--cache-dir")
+    parser.add_argument("--refresh-skew", type=float, default=DEFAULT_REFRESH_SKEW)
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("missing token command after --")
+
+    cache = TokenCache(args.cache_dir, args.refresh_skew)
+    try:
+        credential = cache.get(args.cluster, args.role_arn, lambda: fetch_credential(command))
+    except subprocess.CalledProcessError as e:
+        sys.stderr.write(e.stderr or "")
+        return e.returncode
+    json.dump(credential, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Offline VPC flow log analyzer.
+
+Streams the Parquet flow logs written by ``Vpc`` (``enable_flow_logs``) in
+columnar batches and reports:
+
+* top talkers: the source/destination pairs moving the most bytes,
+* NAT bytes per subnet: egress to public addresses routed through an
+  in-VPC resource (``traffic-path`` 1, i.e. a NAT gateway),
+* cross-AZ flows: bytes between addresses in different availability zones.
+
+Only egress records are counted, so a flow seen by both of its ENIs is
+counted once. Memory stays bounded on multi-GB days: one batch is held at
+a time, top talkers are tracked with a fixed-size Space-Saving sketch, and
+the remaining state is keyed by VPC addresses and subnets, not by flows.
+
+Usage:
+    python scripts/flow_log_analyzer.py <file-or-dir>... [--top 20] [--capacity 2000]
+                                        [--batch-size 65536] [--json]
+
+Requires pyarrow (``pip install pyarrow``).
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+from collections import Counter
+
+# Parquet column names of the fields in modules/aws/vpc FLOW_LOG_FIELDS
+# that the analyzer reads.
+COLUMNS = ["srcaddr", "dstaddr", "bytes", "subnet_id", "az_id", "flow_direction", "traffic_path"]
+
+# traffic-path value for traffic routed through another resource in the VPC.
+TRAFFIC_PATH_IN_VPC = 1
+
+# Addresses that never leave private networking: RFC 1918, shared (CGNAT),
+# link-local and IPv6 unique-local/link-local.
+PRIVATE_ADDRESS_PATTERN = (
+    r"^(10\.|192\.168\.|172\.(1[6-9]|2[0-9]|3[01])\.|169\.254\.|"
+    r"100\.(6[4-9]|[7-9][0-9]|1[01][0-9]|12[0-7])\.|f[cd][0-9a-f]{2}:|fe80:)"
+)
+
+
+class HeavyHitters:
+    """Weighted Space-Saving sketch keeping at most ``capacity`` counters.
+
+    A reported count overestimates the true total by at most its ``error``;
+    any key whose true total exceeds total/capacity is guaranteed to be kept.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        # Min-heap of (count, key); entries go stale when a count grows and
+        # are skipped on eviction.
+        self._heap = []
+
+    def update(self, key, weight: int):
+        if key in self.counts:
+            self.counts[key] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = weight
+            self.errors[key] = 0
+        else:
+            minimum, evicted = self._pop_minimum()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[key] = minimum + weight
+            self.errors[key] = minimum
+        heapq.heappush(self._heap, (self.counts[key], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, k) for k, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_minimum(self) -> tuple:
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == count:
+                return count, key
+
+    def top(self, n: int) -> list:
+        """Return the ``n`` largest ``(key, count, error)`` triples."""
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return [(key, count, self.errors[key]) for key, count in ranked[:n]]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.compute  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        sys.exit("flow_log_analyzer.py requires pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def parquet_files(paths: list) -> list:
+    """Expand files and directories (searched recursively) into Parquet files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in names if name.endswith(".parquet"))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def iter_batches(paths: list, columns: list, batch_size: int):
+    """Yield record batches of ``columns`` one at a time across all files."""
+    pa = _require_pyarrow()
+    for path in parquet_files(paths):
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+            yield batch
+
+
+def _sums(table, keys: list):
+    """Yield ``(*keys, bytes)`` tuples of ``table`` grouped by ``keys``."""
+    grouped = table.group_by(keys).aggregate([("bytes", "sum")])
+    return zip(*(grouped[key].to_pylist() for key in keys), grouped["bytes_sum"].to_pylist())
+
+
+def analyze(paths: list, top: int = 20, capacity: int = 2000, batch_size: int = 65536) -> dict:
+    """Stream the flow logs under ``paths`` and return the report."""
+    pa = _require_pyarrow()
+    pc = pa.compute
+
+    talkers = HeavyHitters(capacity)
+    nat_bytes = Counter()
+    address_az = {}
+    # Bytes from an AZ to a private destination; resolved to the
+    # destination's AZ once every address has been seen.
+    to_private = Counter()
+    records = 0
+    egress_bytes = 0
+
+    for batch in iter_batches(paths, COLUMNS, batch_size):
+        table = pa.Table.from_batches([batch])
+        records += table.num_rows
+        egress = table.filter(pc.equal(table["flow_direction"], "egress"))
+        if egress.num_rows == 0:
+            continue
+        egress_bytes += pc.sum(egress["bytes"]).as_py() or 0
+
+        for src, dst, total in _sums(egress, ["srcaddr", "dstaddr"]):
+            talkers.update((src, dst), total)
+
+        for src, az, _ in _sums(egress, ["srcaddr", "az_id"]):
+            if az:
+                address_az[src] = az
+
+        private = pc.match_substring_regex(egress["dstaddr"], PRIVATE_ADDRESS_PATTERN)
+        nat = egress.filter(pc.and_(
+            pc.equal(egress["traffic_path"], TRAFFIC_PATH_IN_VPC),
+            pc.invert(private)
+        ))
+        for subnet, total in _sums(nat, ["subnet_id"]):
+            nat_bytes[subnet] += total
+
+        for az, dst, total in _sums(egress.filter(private), ["az_id", "dstaddr"]):
+            to_private[(az, dst)] += total
+
+    cross_az = Counter()
+    same_az_bytes = 0
+    unresolved_bytes = 0
+    for (src_az, dst), total in to_private.items():
+        dst_az = address_az.get(dst)
+        if src_az is None or dst_az is None:
+            unresolved_bytes += total
+        elif src_az != dst_az:
+            cross_az[(src_az, dst_az)] += total
+        else:
+            same_az_bytes += total
+
+    return {
+        "files": len(parquet_files(paths)),
+        "records": records,
+        "egress_bytes": egress_bytes,
+        "top_talkers": [
+            {"srcaddr": src, "dstaddr": dst, "bytes": count, "max_overcount": error}
+            for (src, dst), count, error in talkers.top(top)
+        ],
+        "nat_bytes_by_subnet": dict(nat_bytes.most_common()),
+        "cross_az": [
+            {"src_az": src_az, "dst_az": dst_az, "bytes": total}
+            for (src_az, dst_az), total in cross_az.most_common()
+        ],
+        "cross_az_bytes": sum(cross_az.values()),
+        "same_az_bytes": same_az_bytes,
+        "unresolved_private_bytes": unresolved_bytes,
+    }
+
+
+def _human(num_bytes: int) -> str:
+    value = float(num_bytes)
+    for unit in ["B", "KiB", "MiB", "GiB", "TiB"]:
+        if value < 1024 or unit == "TiB":
+            return f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"Scanned {report['records']} records in {report['files']} files "
+        f"({_human(report['egress_bytes'])} egress)",
+        "",
+        "Top talkers:",
+    ]
+    for talker in report["top_talkers"]:
+        lines.append(f"  {_human(talker['bytes']):>12}  {talker['srcaddr']} -> {talker['dstaddr']}")
+    lines += ["", "NAT bytes per subnet:"]
+    for subnet, total in report["nat_bytes_by_subnet"].items():
+        lines.append(f"  {_human(total):>12}  {subnet}")
+    lines += ["", f"Cross-AZ flows ({_human(report['cross_az_bytes'])} total):"]
+    for flow in report["cross_az"]:
+        lines.append(f"  {_human(flow['bytes']):>12}  {flow['src_az']} -> {flow['dst_az']}")
+    return "\n".join(lines)
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="+", help="Parquet files or directories (e.g. one day's partition)")
+    parser.add_argument("--top", type=int, default=20, help="Number of top talkers to report")
+    parser.add_argument("--capacity", type=int, default=2000,
+                        help="Counters kept for top talkers; bounds memory and error")
+    parser.add_argument("--batch-size", type=int, default=65536, help="Rows per streamed batch")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = analyze(args.paths, args.top, args.capacity, args.batch_size)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
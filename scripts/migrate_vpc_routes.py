@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Adopt inline private NAT routes as standalone aws.ec2.Route resources.
+
+Older versions of the Vpc module declared the private subnets' 0.0.0.0/0
+NAT route inline on each ``<name>-private-rt-<i>`` route table; it is now a
+separate ``<name>-private-nat-route-<i>`` resource. Dropping an inline route
+from state leaves it in AWS, so a plain ``pulumi up`` on an existing stack
+fails with RouteAlreadyExists. This script reads a stack export and writes a
+``pulumi import`` file that adopts the existing routes under their new names,
+so the upgrade is a no-op for the routes and private subnets keep egress.
+
+Usage:
+    pulumi stack export --file state.json
+    python scripts/migrate_vpc_routes.py state.json > routes-import.json
+    pulumi import --file routes-import.json --protect=false --generate-code=false
+    pulumi up
+
+Stacks that are already migrated, or have no NAT routes, produce an empty
+import file.
+"""
+import argparse
+import json
+import re
+import sys
+
+ROUTE_TABLE_TYPE = "aws:ec2/routeTable:RouteTable"
+ROUTE_TYPE = "aws:ec2/route:Route"
+PRIVATE_ROUTE_TABLE = re.compile(r"^(?P<vpc>.+)-private-rt-(?P<index>\d+)$")
+
+
+def _urn_name(urn: str) -> str:
+    return urn.rsplit("::", 1)[-1]
+
+
+def import_spec(state: dict) -> dict:
+    """Return a ``pulumi import --file`` document for un-migrated NAT routes."""
+    resources = state.get("deployment", state).get("resources") or []
+    existing = {_urn_name(r["urn"]) for r in resources if r.get("type") == ROUTE_TYPE}
+
+    name_table = {}
+    imports = []
+    for resource in resources:
+        if resource.get("type") != ROUTE_TABLE_TYPE:
+            continue
+        match = PRIVATE_ROUTE_TABLE.match(_urn_name(resource["urn"]))
+        if not match:
+            continue
+        route_name = f"{match['vpc']}-private-nat-route-{match['index']}"
+        if route_name in existing:
+            continue
+        nat_routes = [
+            route for route in (resource.get("outputs") or {}).get("routes") or []
+            if route.get("cidrBlock") == "0.0.0.0/0" and route.get("natGatewayId")
+        ]
+        if not nat_routes:
+            continue
+
+        entry = {"type": ROUTE_TYPE, "name": route_name, "id": f"{resource['id']}_0.0.0.0/0"}
+        if resource.get("parent"):
+            parent = f"vpc-{len(name_table)}"
+            for key, urn in name_table.items():
+                if urn == resource["parent"]:
+                    parent = key
+            name_table[parent] = resource["parent"]
+            entry["parent"] = parent
+        imports.append(entry)
+
+    return {"nameTable": name_table, "resources": imports}
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("state", help="Output of `pulumi stack export`")
+    args = parser.parse_args(argv)
+
+    with open(args.state) as f:
+        spec = import_spec(json.load(f))
+    print(json.dumps(spec, indent=2))
+    print(f"{len(spec['resources'])} NAT route(s) to import", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Local policy preflight.
+
+Runs a stack program under mocks, captures the inputs of every registered
+resource and evaluates a rule pack over them before anything reaches a
+cloud API. Rules are indexed by resource type, so each resource is only
+checked by the rules that apply to it and large stacks evaluate in
+milliseconds.
+
+Usage:
+    python scripts/policy_preflight.py aws [--stack production] [--config key=value]
+                                           [--advisory-only] [--json]
+
+Exits 1 when a mandatory rule is violated.
+"""
+import argparse
+import ipaddress
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.deploy_graph import parse_config  # noqa: E402
+from scripts.resource_graph import ResourceGraph, capture_program  # noqa: E402
+
+MANDATORY = "mandatory"
+ADVISORY = "advisory"
+# Matches every resource type.
+ANY_TYPE = "*"
+
+
+@dataclass
+class Violation:
+    rule: str
+    severity: str
+    urn: str
+    message: str
+
+
+@dataclass
+class PolicyContext:
+    project: str
+    stack: str
+
+    @property
+    def production(self) -> bool:
+        return self.stack == "production"
+
+
+@dataclass
+class Rule:
+    """A check over the inputs of one resource.
+
+    ``check(inputs, context)`` returns a message per violation (a string,
+    a list of strings, or None when the resource complies).
+    """
+
+    name: str
+    types: tuple
+    check: object
+    severity: str = MANDATORY
+    description: str = ""
+
+
+class PolicyPack:
+    def __init__(self, rules: list):
+        self.rules = list(rules)
+        self.by_type = defaultdict(list)
+        for rule in self.rules:
+            for type_token in rule.types:
+                self.by_type[type_token].append(rule)
+
+    def evaluate(self, graph: ResourceGraph) -> list:
+        """Return the violations of every rule across the graph."""
+        context = PolicyContext(graph.project, graph.stack)
+        violations = []
+        for type_token, nodes in graph.by_type().items():
+            rules = self.by_type.get(type_token, []) + self.by_type.get(ANY_TYPE, [])
+            for rule in rules:
+                for node in nodes:
+                    messages = rule.check(node.inputs, context)
+                    if isinstance(messages, str):
+                        messages = [messages]
+                    violations.extend(
+                        Violation(rule.name, rule.severity, node.urn, message)
+                        for message in messages or []
+                    )
+        return violations
+
+
+# Rule pack
+
+def _storage_encrypted(inputs: dict, context: PolicyContext):
+    if inputs.get("storageEncrypted") is not True:
+        return "storage_encrypted must be true"
+    return None
+
+
+# Types whose deletion protection is off unless set explicitly.
+DELETION_PROTECTION_DEFAULT_OFF = {
+    "aws:rds/instance:Instance",
+    "aws:rds/cluster:Cluster",
+}
+
+
+def _production_deletion_protection(inputs: dict, context: PolicyContext):
+    if not context.production or "deletionProtection" not in inputs:
+        return None
+    if inputs["deletionProtection"] is False:
+        return "deletion_protection must not be false in production"
+    return None
+
+
+def _production_rds_deletion_protection(inputs: dict, context: PolicyContext):
+    if context.production and "deletionProtection" not in inputs:
+        return "deletion_protection must be set to true in production"
+    return None
+
+
+def _too_broad(cidrs: list) -> list:
+    return [
+        cidr for cidr in cidrs or []
+        if ipaddress.ip_network(cidr, strict=False).prefixlen <= 8
+    ]
+
+
+def _ingress_cidrs(inputs: dict, context: PolicyContext):
+    cidrs = []
+    for rule in inputs.get("ingress") or []:
+        cidrs += (rule.get("cidrBlocks") or []) + (rule.get("ipv6CidrBlocks") or [])
+    if inputs.get("type") == "ingress":
+        cidrs += (inputs.get("cidrBlocks") or []) + (inputs.get("ipv6CidrBlocks") or [])
+    for key in ("cidrIpv4", "cidrIpv6"):
+        if inputs.get(key):
+            cidrs.append(inputs[key])
+    if (inputs.get("direction") or "INGRESS") == "INGRESS":
+        cidrs += inputs.get("sourceRanges") or []
+    return [f"ingress from {cidr} is not narrower than 10.0.0.0/8" for cidr in _too_broad(cidrs)]
+
+
+DEFAULT_RULES = [
+    Rule(
+        "rds-storage-encrypted",
+        ("aws:rds/instance:Instance", "aws:rds/cluster:Cluster"),
+        _storage_encrypted,
+        description="RDS storage must be encrypted at rest"
+    ),
+    Rule(
+        "production-deletion-protection",
+        (ANY_TYPE,),
+        _production_deletion_protection,
+        description="Production resources must not disable deletion protection"
+    ),
+    Rule(
+        "production-rds-deletion-protection",
+        tuple(DELETION_PROTECTION_DEFAULT_OFF),
+        _production_rds_deletion_protection,
+        description="Production databases must enable deletion protection explicitly"
+    ),
+    Rule(
+        "ingress-cidr-narrower-than-slash-8",
+        (
+            "aws:ec2/securityGroup:SecurityGroup",
+            "aws:ec2/securityGroupRule:SecurityGroupRule",
+            "aws:vpc/securityGroupIngressRule:SecurityGroupIngressRule",
+            "gcp:compute/firewall:Firewall",
+        ),
+        _ingress_cidrs,
+        description="Ingress CIDRs must be narrower than 10.0.0.0/8"
+    ),
+]
+
+
+def format_violations(violations: list, resource_count: int, seconds: float) -> str:
+    lines = [f"Checked {resource_count} resources in {seconds * 1000:.1f} ms"]
+    for violation in violations:
+        lines.append(f"  [{violation.severity}] {violation.rule}: {violation.message}")
+        lines.append(f"      {violation.urn}")
+    if not violations:
+        lines.append("  no violations")
+    return "\n".join(lines)
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("project", help="Project directory (aws, gcp, multi-cloud)")
+    parser.add_argument("--stack", default="dev")
+    parser.add_argument("--config", action="append", metavar="KEY=VALUE")
+    parser.add_argument("--advisory-only", action="store_true",
+                        help="Report violations without failing")
+    parser.add_argument("--json", action="store_true", help="Print violations as JSON")
+    args = parser.parse_args(argv)
+
+    graph = capture_program(os.path.join(REPO_ROOT, args.project), args.stack,
+                            parse_config(args.config))
+    started = time.perf_counter()
+    violations = PolicyPack(DEFAULT_RULES).evaluate(graph)
+    seconds = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps([asdict(violation) for violation in violations], indent=2))
+    else:
+        print(format_violations(violations, len(graph.nodes), seconds))
+
+    if args.advisory_only:
+        return 0
+    return 1 if any(v.severity == MANDATORY for v in violations) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""Offline resource graph capture for the Python Pulumi programs.
+
+Runs a stack program (``aws/``, ``gcp/``, ``multi-cloud/``) or any callable
+under Pulumi mocks and records every registered resource together with its
+inputs, parent, provider and dependencies. Nothing talks to a cloud provider
+or to the Pulumi service, so a capture takes well under a second.
+"""
+import json
+import os
+import runpy
+import sys
+import traceback
+from dataclasses import dataclass, field
+
+import pulumi
+import yaml
+from pulumi.runtime.mocks import MockMonitor
+from pulumi.runtime.settings import set_root_resource
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Outputs the stack programs read from other stacks through StackReference.
+# No secret output names are returned, so a stack output cache is never
+# written from placeholder values.
+MOCK_STACK_OUTPUTS = {
+    "vpc_id": "vpc-mock",
+    "vpc_cidr_block": "10.0.0.0/16",
+    "private_subnet_ids": ["subnet-private-a", "subnet-private-b"],
+    "public_subnet_ids": ["subnet-public-a", "subnet-public-b"],
+    "private_route_table_ids": ["rtb-private-a", "rtb-private-b"],
+    "eks_cluster_name": "eks-mock",
+    "vpc_name": "vpc-mock",
+    "subnet_names": ["subnet-mock"],
+    "subnet_cidr_blocks": ["10.10.0.0/16", "10.11.0.0/16"],
+    "gke_cluster_name": "gke-mock",
+}
+
+# Outputs the cloud providers compute that the modules read back (kubeconfig
+# rendering, ARNs in IAM documents, endpoints), keyed with engine (camelCase)
+# property names.
+MOCK_OUTPUTS = {
+    "pulumi:pulumi:StackReference": lambda name: {"outputs": MOCK_STACK_OUTPUTS},
+    "aws:eks/cluster:Cluster": lambda name: {
+        "endpoint": f"https://{name}.eks.mock",
+        "certificateAuthority": {"data": "bW9jay1jYQ=="},
+        "identities": [{"oidcs": [{"issuer": f"https://oidc.eks.mock/id/{name}"}]}],
+        "kubernetesNetworkConfig": {"serviceIpv4Cidr": "172.20.0.0/16",
+                                    "serviceIpv6Cidr": "fd6e:3b1c:9d1a::/108"},
+    },
+    "aws:ec2/vpc:Vpc": lambda name: {
+        "ipv6CidrBlock": "2600:1f14:abc:de00::/56",
+    },
+    "aws:rds/instance:Instance": lambda name: {
+        "endpoint": f"{name}.rds.mock:5432",
+        "address": f"{name}.rds.mock",
+    },
+    "gcp:container/cluster:Cluster": lambda name: {
+        "endpoint": "203.0.113.10",
+        "masterAuth": {"clusterCaCertificate": "bW9jay1jYQ=="},
+    },
+    "aws:ec2/vpnConnection:VpnConnection": lambda name: {
+        "tunnel1Address": "198.51.100.1",
+        "tunnel2Address": "198.51.100.2",
+        "tunnel1PresharedKey": "mock-psk-1",
+        "tunnel2PresharedKey": "mock-psk-2",
+    },
+    "gcp:compute/haVpnGateway:HaVpnGateway": lambda name: {
+        "vpnInterfaces": [{"id": 0, "ipAddress": "203.0.113.1"},
+                          {"id": 1, "ipAddress": "203.0.113.2"}],
+    },
+    "gcp:sql/databaseInstance:DatabaseInstance": lambda name: {
+        "project": "mock-project",
+        "connectionName": f"mock-project:us-central1:{name}",
+        "privateIpAddress": "10.0.0.5",
+    },
+    "gcp:filestore/instance:Instance": lambda name: {
+        "networks": [{"network": "main-vpc", "modes": ["MODE_IPV4"],
+                      "ipAddresses": ["10.20.0.2"]}],
+    },
+    "gcp:serviceaccount/account:Account": lambda name: {
+        "email": f"{name}@mock-project.iam.gserviceaccount.com",
+    },
+}
+
+
+@dataclass
+class ResourceNode:
+    """A resource registered during a capture."""
+
+    urn: str
+    type: str
+    name: str
+    custom: bool
+    parent: str = ""
+    provider: str = ""
+    inputs: dict = field(default_factory=dict)
+    dependencies: set = field(default_factory=set)
+    property_dependencies: dict = field(default_factory=dict)
+    explicit_dependencies: set = field(default_factory=set)
+    source: str = ""
+
+    @property
+    def implicit_dependencies(self) -> set:
+        """URNs this resource waits on because it consumes their outputs."""
+        deps = set()
+        for urns in self.property_dependencies.values():
+            deps.update(urns)
+        return deps
+
+
+class ResourceGraph:
+    """Resources captured from one program run, keyed by URN."""
+
+    def __init__(self, project: str, stack: str):
+        self.project = project
+        self.stack = stack
+        self.nodes = {}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes.values())
+
+    def custom_resources(self) -> list:
+        return [node for node in self.nodes.values() if node.custom]
+
+    def by_type(self) -> dict:
+        """Group custom resources by type token."""
+        groups = {}
+        for node in self.custom_resources():
+            groups.setdefault(node.type, []).append(node)
+        return groups
+
+    def deploy_dependencies(self, node: ResourceNode) -> set:
+        """URNs that must exist before ``node`` can be created.
+
+        This is every registered dependency plus the provider instance the
+        resource is created through, restricted to resources in the graph.
+        """
+        deps = set(node.dependencies)
+        if node.provider:
+            deps.add(_provider_urn(node.provider))
+        return {urn for urn in deps if urn in self.nodes and urn != node.urn}
+
+
+def _provider_urn(reference: str) -> str:
+    # Provider references are "<urn>::<id>"; the id never contains "::".
+    return reference.rsplit("::", 1)[0]
+
+
+class CapturingMocks(pulumi.runtime.Mocks):
+    """Mocks that echo inputs back as outputs with a few computed fields."""
+
+    def __init__(self, outputs: dict = None, calls: dict = None):
+        self.outputs = {**MOCK_OUTPUTS, **(outputs or {})}
+        self.calls = calls or {}
+
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+        name = args.inputs.get("name") or args.name
+        state = {
+            **args.inputs,
+            "name": name,
+            "arn": f"arn:mock:{args.typ}:{args.name}",
+        }
+        extra = self.outputs.get(args.typ)
+        if extra is not None:
+            state.update(extra(name))
+        return f"{args.name}-id", state
+
+    def call(self, args: pulumi.runtime.MockCallArgs):
+        result = self.calls.get(args.token)
+        if callable(result):
+            return result(args.args)
+        return result or {}
+
+
+class CapturingMonitor(MockMonitor):
+    """Mock monitor that keeps the full registration request of each resource."""
+
+    def __init__(self, mocks: pulumi.runtime.Mocks, graph: ResourceGraph):
+        super().__init__(mocks)
+        self.graph = graph
+
+    def RegisterResource(self, request):
+        response = super().RegisterResource(request)
+        if request.type == "pulumi:pulumi:Stack":
+            return response
+        inputs = pulumi.runtime.rpc.deserialize_properties(request.object)
+        self.graph.nodes[response.urn] = ResourceNode(
+            urn=response.urn,
+            type=request.type,
+            name=request.name,
+            custom=request.custom,
+            parent=request.parent,
+            provider=request.provider,
+            inputs=inputs,
+            dependencies=set(request.dependencies),
+            property_dependencies={
+                key: set(deps.urns) for key, deps in request.propertyDependencies.items()
+            },
+        )
+        return response
+
+
+class _ExplicitDependencyRecorder:
+    """Stack transformation recording ``depends_on`` and the declaring source line."""
+
+    def __init__(self):
+        self.records = []
+        self.urns = {}
+
+    def __call__(self, args: pulumi.ResourceTransformationArgs):
+        depends_on = args.opts.depends_on if args.opts else None
+        if isinstance(depends_on, pulumi.Resource):
+            depends_on = [depends_on]
+        self.records.append((args.resource, list(depends_on or []), _declaring_frame()))
+        return None
+
+    def resolve(self, graph: ResourceGraph) -> pulumi.Output:
+        """Attach explicit dependencies and source lines to the captured nodes.
+
+        Every resource passes through the transformation, so the recorded
+        resources cover all ``depends_on`` targets as well.
+        """
+        records = list(self.records)
+        resources = [resource for resource, _, _ in records]
+
+        def attach(urns):
+            self.urns.update((id(resource), urn) for resource, urn in zip(resources, urns))
+            for resource, depends_on, source in records:
+                node = graph.nodes.get(self.urns[id(resource)])
+                if node is None:
+                    continue
+                node.source = source
+                node.explicit_dependencies.update(
+                    self.urns[id(dep)] for dep in depends_on if id(dep) in self.urns
+                )
+            # Resources created inside applies register after this snapshot.
+            if len(self.records) > len(records):
+                self.records = self.records[len(records):]
+                return self.resolve(graph)
+            return None
+
+        return pulumi.Output.all(*(resource.urn for resource in resources)).apply(attach)
+
+
+def _declaring_frame() -> str:
+    """Return ``path:line`` of the repo frame that constructed the resource."""
+    for frame in reversed(traceback.extract_stack()):
+        path = os.path.abspath(frame.filename)
+        if not path.startswith(REPO_ROOT) or path == os.path.abspath(__file__):
+            continue
+        return f"{os.path.relpath(path, REPO_ROOT)}:{frame.lineno}"
+    return ""
+
+
+def load_project_config(project_dir: str, stack: str, overrides: dict = None) -> tuple:
+    """Return ``(project_name, config)`` for a project directory.
+
+    Config is seeded from the ``template.config`` defaults in ``Pulumi.yaml``,
+    then ``Pulumi.<stack>.yaml`` if present, then ``overrides``. Keys without a
+    namespace are qualified with the project name, as ``pulumi config`` does.
+    """
+    with open(os.path.join(project_dir, "Pulumi.yaml")) as f:
+        project = yaml.safe_load(f)
+    name = project["name"]
+
+    config = {}
+    template = (project.get("template") or {}).get("config") or {}
+    for key, spec in template.items():
+        if isinstance(spec, dict) and "default" in spec:
+            config[key] = spec["default"]
+
+    stack_file = os.path.join(project_dir, f"Pulumi.{stack}.yaml")
+    if os.path.exists(stack_file):
+        with open(stack_file) as f:
+            config.update((yaml.safe_load(f) or {}).get("config") or {})
+
+    config.update(overrides or {})
+    qualified = {}
+    for key, value in config.items():
+        qualified[key if ":" in key else f"{name}:{key}"] = value
+    return name, qualified
+
+
+# Values the programs `require` that have no template default.
+PLACEHOLDER_CONFIG = {
+    "gcp:project": "mock-project",
+    "dbPassword": "mock-password",
+}
+
+
+def capture(fn, project: str = "project", stack: str = "dev", config: dict = None,
+            mocks: pulumi.runtime.Mocks = None, preview: bool = False) -> ResourceGraph:
+    """Run ``fn`` under mocks and return the resulting resource graph.
+
+    ``config`` maps fully-qualified keys (``aws:region``, ``proj:minNodes``)
+    to values.
+    """
+    graph = ResourceGraph(project, stack)
+    recorder = _ExplicitDependencyRecorder()
+    monitor = CapturingMonitor(mocks or CapturingMocks(), graph)
+
+    # Each capture gets a fresh root stack so transformations and children
+    # from a previous capture in the same process do not leak into this one.
+    set_root_resource(None)
+    pulumi.runtime.set_all_config(
+        {key: value if isinstance(value, str) else json.dumps(value)
+         for key, value in (config or {}).items()}
+    )
+    pulumi.runtime.set_mocks(mocks or monitor.mocks, project=project, stack=stack,
+                             preview=preview, monitor=monitor)
+    pulumi.runtime.register_stack_transformation(recorder)
+
+    @pulumi.runtime.test
+    def run():
+        fn()
+        return recorder.resolve(graph)
+
+    run()
+    return graph
+
+
+def capture_program(project_dir: str, stack: str = "dev", config: dict = None,
+                    mocks: pulumi.runtime.Mocks = None, preview: bool = False) -> ResourceGraph:
+    """Capture the resource graph of the program in ``project_dir``."""
+    project_dir = os.path.abspath(project_dir)
+    name, merged = load_project_config(project_dir, stack, {**PLACEHOLDER_CONFIG, **(config or {})})
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    program = os.path.join(project_dir, "__main__.py")
+    return capture(lambda: runpy.run_path(program, run_name="__main__"),
+                   project=name, stack=stack, config=merged, mocks=mocks, preview=preview)
@@ -55,6 +55,335 @@ class TestAwsInfrastructure(unittest.TestCase):
         self.assertIsNotNone(eks.cluster)
         self.assertIsNotNone(eks.kubeconfig)
     
+    def test_max_pods_per_node(self):
+        """Test max-pods follows the VPC CNI calculator."""
+        from modules.aws.eks import max_pods_per_node
+        
+        self.assertEqual(max_pods_per_node("t3.medium"), 17)
+        self.assertEqual(max_pods_per_node("t3.medium", prefix_delegation=True), 110)
+        self.assertEqual(max_pods_per_node("m6i.8xlarge", prefix_delegation=True), 250)
+        with self.assertRaises(ValueError):
+            max_pods_per_node("x9.unknown")
+    
+    def test_vpc_flow_logs(self):
+        """Test flow logs go to S3 as hourly-partitioned Parquet with custom fields."""
+        from modules.aws.vpc import Vpc, VpcArgs
+        from scripts.resource_graph import capture
+        
+        vpc_args = VpcArgs(
+            name="test-vpc",
+            cidr_block="10.1.0.0/16",
+            enable_flow_logs=True
+        )
+        graph = capture(lambda: Vpc("test-vpc", vpc_args))
+        
+        flow_log, = graph.by_type()["aws:ec2/flowLog:FlowLog"]
+        self.assertEqual(flow_log.inputs["logDestinationType"], "s3")
+        self.assertEqual(flow_log.inputs["destinationOptions"],
+                         {"fileFormat": "parquet", "hiveCompatiblePartitions": True,
+                          "perHourPartition": True})
+        self.assertIn("${flow-direction}", flow_log.inputs["logFormat"])
+        self.assertIn("${traffic-path}", flow_log.inputs["logFormat"])
+        bucket, = graph.by_type()["aws:s3/bucketV2:BucketV2"]
+        self.assertFalse(bucket.inputs.get("forceDestroy", False))
+        
+        subnets = sorted(node.inputs["cidrBlock"] for node in graph.by_type()["aws:ec2/subnet:Subnet"])
+        self.assertEqual(subnets, ["10.1.0.0/24", "10.1.1.0/24", "10.1.10.0/24", "10.1.11.0/24"])
+    
+    def test_vpc_dual_stack(self):
+        """Test dual-stack subnets get a /64 each and private IPv6 egress skips NAT."""
+        from modules.aws.vpc import Vpc, VpcArgs
+        from scripts.resource_graph import capture
+
+        vpc_args = VpcArgs(
+            name="test-vpc",
+            cidr_block="10.1.0.0/16",
+            enable_ipv6=True
+        )
+        graph = capture(lambda: Vpc("test-vpc", vpc_args))
+        resources = graph.by_type()
+
+        vpc, = resources["aws:ec2/vpc:Vpc"]
+        self.assertTrue(vpc.inputs["assignGeneratedIpv6CidrBlock"])
+        subnets = {node.name: node.inputs for node in resources["aws:ec2/subnet:Subnet"]}
+        self.assertEqual(subnets["test-vpc-public-a"]["ipv6CidrBlock"], "2600:1f14:abc:de00::/64")
+        self.assertEqual(subnets["test-vpc-private-b"]["ipv6CidrBlock"], "2600:1f14:abc:de0b::/64")
+        self.assertTrue(subnets["test-vpc-private-a"]["enableDns64"])
+        self.assertFalse(subnets["test-vpc-public-a"]["enableDns64"])
+
+        self.assertEqual(len(resources["aws:ec2/egressOnlyInternetGateway:EgressOnlyInternetGateway"]), 1)
+        routes = [node.inputs for node in resources["aws:ec2/route:Route"]]
+        ipv6_routes = [r for r in routes if r.get("destinationIpv6CidrBlock") == "::/0"]
+        nat64_routes = [r for r in routes if r.get("destinationIpv6CidrBlock") == "64:ff9b::/96"]
+        self.assertEqual(len(ipv6_routes), 2)
+        self.assertTrue(all("egressOnlyGatewayId" in r for r in ipv6_routes))
+        self.assertTrue(all("natGatewayId" in r for r in nat64_routes))
+        self.assertEqual(len(nat64_routes), 2)
+
+        with self.assertRaises(ValueError):
+            Vpc("small-vpc", VpcArgs(name="small-vpc", cidr_block="10.1.0.0/22"))
+
+    def test_eks_ipv6(self):
+        """Test an IPv6 cluster configures the CNI, kubelet DNS and node permissions."""
+        import json
+        from modules.aws.eks import EksCluster, EksClusterArgs
+        from scripts.resource_graph import capture
+
+        eks_args = EksClusterArgs(
+            name="test-eks",
+            vpc_id="vpc-12345",
+            private_subnet_ids=["subnet-1", "subnet-2"],
+            ip_family="ipv6"
+        )
+        graph = capture(lambda: EksCluster("test-eks", eks_args))
+        resources = graph.by_type()
+
+        cluster, = resources["aws:eks/cluster:Cluster"]
+        self.assertEqual(cluster.inputs["kubernetesNetworkConfig"], {"ipFamily": "ipv6"})
+        addons = {node.inputs["addonName"]: json.loads(node.inputs["configurationValues"])
+                  for node in resources["aws:eks/addon:Addon"]}
+        self.assertEqual(addons["vpc-cni"]["env"]["ENABLE_IPv6"], "true")
+        self.assertEqual(len(resources["aws:iam/rolePolicy:RolePolicy"]), 1)
+
+        with self.assertRaises(ValueError):
+            EksCluster("bad-eks", EksClusterArgs(
+                name="bad-eks", vpc_id="vpc-12345", private_subnet_ids=["subnet-1"],
+                ip_family="ipv6", vpc_cni_prefix_delegation=False
+            ))
+
+        # The stack program rejects an IPv6 cluster in an IPv4-only VPC.
+        import os
+        from scripts.resource_graph import capture_program
+        with self.assertRaises(ValueError):
+            capture_program(os.path.join(os.path.dirname(__file__), "..", "aws"),
+                            config={"eksIpFamily": "ipv6"})
+
+    def test_eks_networking_addons(self):
+        """Test EKS manages vpc-cni, kube-proxy and CoreDNS add-ons."""
+        import base64
+        import json
+        from modules.aws.eks import EksCluster, EksClusterArgs, NodeLaunchTemplateArgs
+        from scripts.resource_graph import capture
+        
+        eks_args = EksClusterArgs(
+            name="test-eks",
+            vpc_id="vpc-12345",
+            private_subnet_ids=["subnet-1", "subnet-2"],
+            enable_node_local_dns=True,
+            node_launch_template=NodeLaunchTemplateArgs()
+        )
+        graph = capture(lambda: EksCluster("test-eks", eks_args))
+        
+        addons = {node.inputs["addonName"]: json.loads(node.inputs["configurationValues"])
+                  for node in graph.by_type()["aws:eks/addon:Addon"]}
+        self.assertEqual(addons["vpc-cni"]["env"]["ENABLE_PREFIX_DELEGATION"], "true")
+        self.assertEqual(addons["kube-proxy"]["mode"], "ipvs")
+        self.assertTrue(addons["coredns"]["autoScaling"]["enabled"])
+        
+        daemon_set = graph.by_type()["kubernetes:apps/v1:DaemonSet"][0]
+        args = daemon_set.inputs["spec"]["template"]["spec"]["containers"][0]["args"]
+        self.assertEqual(args[1], "169.254.20.10")
+        
+        # Under IPVS the kubelet must hand pods the cache address.
+        launch_template, = graph.by_type()["aws:ec2/launchTemplate:LaunchTemplate"]
+        self.assertIn('"169.254.20.10"', base64.b64decode(launch_template.inputs["userData"]).decode())
+        with self.assertRaises(ValueError):
+            EksCluster("bad-eks", EksClusterArgs(
+                name="bad-eks", vpc_id="vpc-12345", private_subnet_ids=["subnet-1"],
+                enable_node_local_dns=True
+            ))
+        
+        # Types without known ENI limits still build, keeping the AMI's max-pods.
+        graph = capture(lambda: EksCluster("micro-eks", EksClusterArgs(
+            name="micro-eks", vpc_id="vpc-12345", private_subnet_ids=["subnet-1"],
+            instance_types=["t3.micro"], node_launch_template=NodeLaunchTemplateArgs()
+        )))
+        launch_template, = graph.by_type()["aws:ec2/launchTemplate:LaunchTemplate"]
+        self.assertNotIn("maxPods", base64.b64decode(launch_template.inputs["userData"]).decode())
+    
+    def test_eks_karpenter(self):
+        """Test Karpenter gets an interruption queue and a NodePool from the cluster args."""
+        from modules.aws.eks import EksCluster, EksClusterArgs
+        from scripts.resource_graph import capture
+        
+        eks_args = EksClusterArgs(
+            name="test-eks",
+            vpc_id="vpc-12345",
+            private_subnet_ids=["subnet-1", "subnet-2"],
+            instance_types=["m6i.large", "m6i.xlarge"],
+            enable_karpenter=True
+        )
+        graph = capture(lambda: EksCluster("test-eks", eks_args))
+        resources = graph.by_type()
+        
+        self.assertEqual(len(resources["aws:cloudwatch/eventRule:EventRule"]), 4)
+        self.assertEqual(len(resources["aws:iam/openIdConnectProvider:OpenIdConnectProvider"]), 1)
+        
+        node_pool = next(node for node in resources["kubernetes:karpenter.sh/v1:NodePool"])
+        requirements = node_pool.inputs["spec"]["template"]["spec"]["requirements"]
+        self.assertEqual(requirements[0]["values"], ["m6i.large", "m6i.xlarge"])
+        
+        node_class = resources["kubernetes:karpenter.k8s.aws/v1:EC2NodeClass"][0]
+        self.assertEqual(node_class.inputs["spec"]["kubelet"]["maxPods"], 110)
+        self.assertEqual(node_class.inputs["spec"]["subnetSelectorTerms"],
+                         [{"id": "subnet-1"}, {"id": "subnet-2"}])
+    
+    def test_eks_node_launch_template(self):
+        """Test nodes launch from a gp3 launch template with Bottlerocket settings."""
+        import base64
+        from modules.aws.eks import EksCluster, EksClusterArgs, NodeLaunchTemplateArgs
+        from scripts.resource_graph import capture
+
+        eks_args = EksClusterArgs(
+            name="test-eks",
+            vpc_id="vpc-12345",
+            private_subnet_ids=["subnet-1", "subnet-2"],
+            instance_types=["m6id.large"],
+            node_launch_template=NodeLaunchTemplateArgs(
+                ami_family="bottlerocket",
+                image_cache_size_gib=100,
+                volume_throughput=500,
+                volume_iops=6000,
+                prepull_images=["public.ecr.aws/docker/library/python:3.12-slim"]
+            )
+        )
+        graph = capture(lambda: EksCluster("test-eks", eks_args))
+        resources = graph.by_type()
+
+        launch_template, = resources["aws:ec2/launchTemplate:LaunchTemplate"]
+        mapping, = launch_template.inputs["blockDeviceMappings"]
+        self.assertEqual(mapping["deviceName"], "/dev/xvdb")
+        self.assertEqual(mapping["ebs"]["volumeType"], "gp3")
+        self.assertEqual(mapping["ebs"]["volumeSize"], 110)
+        self.assertEqual(mapping["ebs"]["throughput"], 500)
+
+        user_data = base64.b64decode(launch_template.inputs["userData"]).decode()
+        self.assertIn("max-pods = 110", user_data)
+        self.assertIn('cluster-dns-ip = "172.20.0.10"', user_data)
+        self.assertIn("ephemeral-storage", user_data)
+
+        node_group, = resources["aws:eks/nodeGroup:NodeGroup"]
+        self.assertEqual(node_group.inputs["amiType"], "BOTTLEROCKET_x86_64")
+        self.assertNotIn("diskSize", node_group.inputs)
+        self.assertEqual(len(resources["kubernetes:apps/v1:DaemonSet"]), 1)
+
+    def test_node_launch_template_validation(self):
+        """Test gp3 limits and AMI architecture are checked locally."""
+        from modules.aws.eks.launch_template import ami_type, has_instance_store, validate_gp3
+
+        self.assertTrue(has_instance_store("m6id.large"))
+        self.assertTrue(has_instance_store("i4i.xlarge"))
+        self.assertFalse(has_instance_store("m6i.large"))
+        self.assertEqual(ami_type("AL2023", ["m7g.large"]), "AL2023_ARM_64_STANDARD")
+        with self.assertRaises(ValueError):
+            ami_type("AL2023", ["m6i.large", "m7g.large"])
+        with self.assertRaises(ValueError):
+            validate_gp3(1000, 3000)
+
+    def test_elasticache_cluster_mode(self):
+        """Test the cache shards with replicas, encrypts in transit and exposes endpoints."""
+        from modules.aws.elasticache import ElastiCache, ElastiCacheArgs
+        from scripts.resource_graph import capture
+
+        cache_args = ElastiCacheArgs(
+            name="test-cache",
+            vpc_id="vpc-12345",
+            subnet_ids=["subnet-1", "subnet-2"],
+            num_shards=3,
+            replicas_per_shard=2,
+            allowed_cidr_blocks=["10.0.0.0/16"]
+        )
+        graph = capture(lambda: ElastiCache("test-cache", cache_args))
+
+        group, = graph.by_type()["aws:elasticache/replicationGroup:ReplicationGroup"]
+        self.assertEqual(group.inputs["clusterMode"], "enabled")
+        self.assertEqual(group.inputs["numNodeGroups"], 3)
+        self.assertEqual(group.inputs["replicasPerNodeGroup"], 2)
+        self.assertEqual(group.inputs["parameterGroupName"], "default.valkey8.cluster.on")
+        self.assertTrue(group.inputs["transitEncryptionEnabled"])
+        self.assertTrue(group.inputs["automaticFailoverEnabled"])
+
+        with self.assertRaises(ValueError):
+            ElastiCache("bad-cache", ElastiCacheArgs(
+                name="bad-cache", vpc_id="vpc-12345", subnet_ids=["subnet-1"],
+                cluster_mode=False, num_shards=2
+            ))
+
+        # Redis OSS defaults to its own latest version and parameter group family.
+        graph = capture(lambda: ElastiCache("redis-cache", ElastiCacheArgs(
+            name="redis-cache", vpc_id="vpc-12345", subnet_ids=["subnet-1"],
+            engine="redis", cluster_mode=False, replicas_per_shard=0
+        )))
+        group, = graph.by_type()["aws:elasticache/replicationGroup:ReplicationGroup"]
+        self.assertEqual(group.inputs["engineVersion"], "7.1")
+        self.assertEqual(group.inputs["parameterGroupName"], "default.redis7")
+        self.assertFalse(group.inputs["automaticFailoverEnabled"])
+
+    def test_efs_shared_storage(self):
+        """Test EFS mounts in every subnet and derives throughput from the target."""
+        from modules.aws.efs import Efs, EfsArgs, efs_throughput
+        from scripts.resource_graph import capture
+        import pulumi_kubernetes as k8s
+
+        self.assertEqual(efs_throughput(500), {"throughput_mode": "elastic"})
+        self.assertEqual(efs_throughput(500, "provisioned"), {
+            "throughput_mode": "provisioned", "provisioned_throughput_in_mibps": 477
+        })
+        with self.assertRaises(ValueError):
+            efs_throughput(2000)
+
+        def program():
+            provider = k8s.Provider("k8s", kubeconfig="{}")
+            Efs("test-efs", EfsArgs(
+                name="test-efs",
+                vpc_id="vpc-12345",
+                subnet_ids=["subnet-1", "subnet-2", "subnet-3"],
+                throughput_mbps=200,
+                throughput_mode="provisioned",
+                k8s_provider=provider,
+                oidc_provider_arn="arn:aws:iam::123456789012:oidc-provider/oidc.eks.mock",
+                oidc_provider_url="https://oidc.eks.mock"
+            ))
+        resources = capture(program).by_type()
+
+        file_system, = resources["aws:efs/fileSystem:FileSystem"]
+        self.assertEqual(file_system.inputs["provisionedThroughputInMibps"], 191)
+        self.assertTrue(file_system.inputs["encrypted"])
+        self.assertEqual(len(resources["aws:efs/mountTarget:MountTarget"]), 3)
+
+        storage_class, = resources["kubernetes:storage.k8s.io/v1:StorageClass"]
+        self.assertEqual(storage_class.inputs["provisioner"], "efs.csi.aws.com")
+        self.assertEqual(storage_class.inputs["parameters"]["provisioningMode"], "efs-ap")
+
+    def test_database_observability(self):
+        """Test RDS enables Performance Insights, Enhanced Monitoring and query logging."""
+        from modules.aws.rds import RdsDatabase, RdsDatabaseArgs
+        from scripts.resource_graph import capture
+
+        rds_args = RdsDatabaseArgs(
+            name="test-db",
+            vpc_id="vpc-12345",
+            subnet_ids=["subnet-1", "subnet-2"],
+            instance_class="db.m6g.large",
+            enable_observability=True,
+            slow_query_threshold_ms=250
+        )
+        graph = capture(lambda: RdsDatabase("test-db", rds_args),
+                        config={"project:dbPassword": "mock-password"})
+        resources = graph.by_type()
+
+        instance, = resources["aws:rds/instance:Instance"]
+        self.assertTrue(instance.inputs["performanceInsightsEnabled"])
+        self.assertEqual(instance.inputs["performanceInsightsRetentionPeriod"], 7)
+        self.assertEqual(instance.inputs["monitoringInterval"], 60)
+        self.assertIn("monitoringRoleArn", instance.inputs)
+
+        parameter_group, = resources["aws:rds/parameterGroup:ParameterGroup"]
+        self.assertEqual(parameter_group.inputs["family"], "postgres13")
+        parameters = {p["name"]: p["value"] for p in parameter_group.inputs["parameters"]}
+        self.assertEqual(parameters["shared_preload_libraries"], "pg_stat_statements")
+        self.assertEqual(parameters["log_min_duration_statement"], "250")
+
     def test_rds_database_creation(self):
         """Test RDS database creation."""
         from modules.aws.rds import RdsDatabase, RdsDatabaseArgs
@@ -0,0 +1,95 @@
+"""Tests for the configuration-matrix simulator."""
+import unittest
+
+from scripts.config_matrix import capacity, expand_matrix, price_graph, simulate
+from scripts.resource_graph import ResourceGraph, ResourceNode
+
+
+def make_graph(resources):
+    """Build a graph from (name, type, inputs) tuples."""
+    graph = ResourceGraph("test", "test")
+    for name, type_, inputs in resources:
+        graph.nodes[name] = ResourceNode(urn=name, type=type_, name=name, custom=True, inputs=inputs)
+    return graph
+
+
+class TestConfigMatrix(unittest.TestCase):
+    """Test cases for matrix expansion, pricing and capacity."""
+
+    def test_expand_matrix_per_project(self):
+        """Test keys only vary the projects that declare them."""
+        variants = expand_matrix(["aws", "gcp"], {
+            "minNodes": ["1", "2"],
+            "natStrategy": ["single", "none"],
+            "dbTier": ["db-f1-micro", "db-g1-small", "db-custom-1-3840"],
+        })
+
+        counts = {}
+        for project, variant, _ in variants:
+            counts[project] = counts.get(project, 0) + 1
+            self.assertNotIn("dbTier" if project == "aws" else "natStrategy", variant)
+        self.assertEqual(counts, {"aws": 4, "gcp": 6})
+        with self.assertRaises(ValueError):
+            expand_matrix(["aws"], {"noSuchKey": ["1"]})
+
+    def test_price_and_capacity(self):
+        """Test node groups, regional pools and multi-AZ databases are priced and counted."""
+        graph = make_graph([
+            ("eks", "aws:eks/cluster:Cluster", {}),
+            ("nodes", "aws:eks/nodeGroup:NodeGroup", {
+                "instanceTypes": ["t3.medium"],
+                "scalingConfig": {"minSize": 2.0, "desiredSize": 2.0, "maxSize": 4.0},
+            }),
+            ("db", "aws:rds/instance:Instance", {
+                "instanceClass": "db.t3.micro", "multiAz": True, "allocatedStorage": 73.0,
+            }),
+            ("pool", "gcp:container/nodePool:NodePool", {
+                "location": "us-central1", "nodeCount": 1.0,
+                "nodeConfig": {"machineType": "unlisted-type"},
+                "autoscaling": {"minNodeCount": 1.0, "maxNodeCount": 2.0},
+            }),
+        ])
+
+        cost = price_graph(graph)
+        self.assertAlmostEqual(cost["hourly"], 0.10 + 2 * 0.0416 + 2 * 0.018 + 146 * 0.115 / 730)
+        self.assertEqual(cost["unpriced"], ["gce:unlisted-type"])
+
+        # t3.medium holds 17 pods without prefix delegation; regional pools span 3 zones.
+        self.assertEqual(capacity(graph), {
+            "min": 5, "desired": 5, "max": 10,
+            "pods_desired": 2 * 17 + 3 * 110, "pods_max": 4 * 17 + 6 * 110,
+        })
+
+    def test_billable_types_are_priced_or_flagged(self):
+        """Test storage and cache types are priced or listed as unpriced, never free."""
+        graph = make_graph([
+            ("share", "gcp:filestore/instance:Instance", {
+                "tier": "BASIC_HDD", "fileShares": {"name": "share1", "capacityGb": 1024.0},
+            }),
+            ("redis", "gcp:redis/instance:Instance", {"tier": "STANDARD_HA", "memorySizeGb": 5.0}),
+            ("redis-cluster", "gcp:redis/cluster:Cluster", {
+                "nodeType": "REDIS_SHARED_CORE_NANO", "shardCount": 3.0, "replicaCount": 1.0,
+            }),
+            ("efs", "aws:efs/fileSystem:FileSystem", {}),
+            ("vpn", "aws:ec2/vpnConnection:VpnConnection", {}),
+        ])
+
+        cost = price_graph(graph)
+        self.assertAlmostEqual(cost["hourly"], 1024 * 0.20 / 730 + 5 * 0.054 + 6 * 0.0302 + 0.05,
+                               places=4)
+        self.assertEqual(cost["unpriced"], ["resource:aws:efs/fileSystem:FileSystem"])
+
+    def test_simulate_aws_variant(self):
+        """Test a NAT strategy variant changes resource count and cost."""
+        single = simulate("aws", "dev", {}, {"natStrategy": "single"})
+        per_az = simulate("aws", "dev", {}, {"natStrategy": "per-az"})
+        rejected = simulate("aws", "dev", {}, {"natStrategy": "sometimes"})
+
+        self.assertGreater(per_az["resources"], single["resources"])
+        self.assertAlmostEqual(per_az["hourly"] - single["hourly"], 0.045 + 0.005)
+        self.assertEqual(single["capacity"]["pods_desired"], 110)
+        self.assertIn("natStrategy", rejected["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
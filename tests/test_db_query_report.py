@@ -0,0 +1,134 @@
+"""Tests for the cross-cloud database query report."""
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from scripts.db_query_report import (
+    fetch_performance_insights,
+    fetch_top_sql,
+    main,
+    normalize_query,
+    parse_slow_log,
+    summarize_slow_log,
+)
+
+RDS_LOG = """\
+2024-05-01 10:00:01 UTC:10.0.10.5(5432):app@appdb:[123]:LOG:  duration: 1200.500 ms  statement: SELECT * FROM orders WHERE id = 42
+2024-05-01 10:00:02 UTC:10.0.10.5(5432):app@appdb:[123]:LOG:  duration: 800.000 ms  statement: SELECT * FROM orders WHERE id = 7
+2024-05-01 10:00:03 UTC:10.0.10.5(5432):app@appdb:[124]:LOG:  duration: 3000.000 ms  execute <unnamed>: UPDATE carts SET total = $1 WHERE user_id = $2
+2024-05-01 10:00:04 UTC:10.0.10.5(5432):app@appdb:[124]:LOG:  connection received
+"""
+
+
+class FakeConnection:
+    """DB-API connection answering the extension check and the top SQL query."""
+
+    def __init__(self, extension: bool, rows: list = None):
+        self.extension = extension
+        self.rows = rows or []
+        self.statements = []
+        self.closed = False
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+
+    def fetchone(self):
+        return (1,) if self.extension else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        self.closed = True
+
+
+class FakePiClient:
+    def __init__(self):
+        self.request = None
+
+    def describe_dimension_keys(self, **request):
+        self.request = request
+        return {"Keys": [
+            {"Dimensions": {"db.sql_tokenized.statement": "SELECT * FROM orders WHERE id = ?"},
+             "Total": 1.75},
+        ]}
+
+
+class TestDbQueryReport(unittest.TestCase):
+    """Test cases for the database query report."""
+
+    def test_normalize_groups_literals(self):
+        """Test literals and bind parameters normalize to the same text."""
+        self.assertEqual(normalize_query("SELECT * FROM t WHERE a = 'x''y'  AND b = 12;"),
+                         "SELECT * FROM t WHERE a = ? AND b = ?")
+        self.assertEqual(normalize_query("SELECT * FROM t2 WHERE b = $1"),
+                         "SELECT * FROM t2 WHERE b = ?")
+
+    def test_slow_log_summary(self):
+        """Test slow statements group by normalized text, slowest total first."""
+        summary = summarize_slow_log(parse_slow_log(RDS_LOG.splitlines()))
+
+        self.assertEqual([entry["query"] for entry in summary], [
+            "UPDATE carts SET total = ? WHERE user_id = ?",
+            "SELECT * FROM orders WHERE id = ?",
+        ])
+        orders = summary[1]
+        self.assertEqual(orders["calls"], 2)
+        self.assertEqual(orders["total_ms"], 2000.5)
+        self.assertEqual(orders["max_ms"], 1200.5)
+
+    def test_performance_insights_entries(self):
+        """Test Performance Insights keys map to the common entry format."""
+        client = FakePiClient()
+        entries = fetch_performance_insights("db-ABC123", top=5, client=client)
+
+        self.assertEqual(client.request["GroupBy"], {"Group": "db.sql_tokenized", "Limit": 5})
+        self.assertEqual(entries, [{
+            "query": "SELECT * FROM orders WHERE id = ?",
+            "calls": None, "total_ms": None, "mean_ms": None, "max_ms": None,
+            "db_load": 1.75,
+        }])
+
+    def test_top_sql_requires_extension(self):
+        """Test top SQL never creates pg_stat_statements and exits when it is missing."""
+        installed = FakeConnection(extension=True, rows=[
+            ("SELECT * FROM orders WHERE id = $1", 10, 120.0, 12.0, 40.0, 10),
+        ])
+        entries = fetch_top_sql("postgresql://", connection=installed)
+        self.assertEqual(entries[0]["query"], "SELECT * FROM orders WHERE id = ?")
+        self.assertEqual(entries[0]["calls"], 10)
+        self.assertTrue(installed.closed)
+
+        missing = FakeConnection(extension=False)
+        with self.assertRaises(SystemExit) as raised:
+            fetch_top_sql("postgresql://", connection=missing)
+        self.assertIn("CREATE EXTENSION pg_stat_statements", str(raised.exception))
+        self.assertFalse(any("CREATE" in sql for sql in missing.statements))
+        self.assertTrue(missing.closed)
+
+    def test_main_prints_common_json(self):
+        """Test slow logs from both clouds land in one report keyed by target."""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {}
+            for target in ("aws", "gcp"):
+                paths[target] = os.path.join(tmp, f"{target}.log")
+                with open(paths[target], "w") as f:
+                    f.write(RDS_LOG)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                main(["--slow-log", f"aws={paths['aws']}", "--slow-log", f"gcp={paths['gcp']}"])
+
+        report = json.loads(out.getvalue())
+        self.assertEqual([section["cloud"] for section in report], ["aws", "gcp"])
+        self.assertEqual(report[0]["slow_queries"], report[1]["slow_queries"])
+        self.assertIsNone(report[0]["top_sql"])
+
+
+if __name__ == '__main__':
+    unittest.main()
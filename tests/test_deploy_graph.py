@@ -0,0 +1,70 @@
+"""Tests for the deployment critical-path estimator."""
+import unittest
+
+from scripts.deploy_graph import DeployGraph
+from scripts.resource_graph import ResourceGraph, ResourceNode, capture
+
+
+def make_graph(resources):
+    """Build a graph from (name, type, implicit deps, explicit deps) tuples."""
+    graph = ResourceGraph("test", "test")
+    for name, type_, implicit, explicit in resources:
+        graph.nodes[name] = ResourceNode(
+            urn=name,
+            type=type_,
+            name=name,
+            custom=True,
+            dependencies=set(implicit) | set(explicit),
+            property_dependencies={"input": set(implicit)} if implicit else {},
+            explicit_dependencies=set(explicit),
+        )
+    return graph
+
+
+class TestDeployGraph(unittest.TestCase):
+    """Test cases for critical path and depends_on analysis."""
+
+    def test_critical_path_and_parallelism(self):
+        """Test the longest chain wins and parallel branches overlap."""
+        graph = make_graph([
+            ("vpc", "vpc", [], []),
+            ("cluster", "cluster", ["vpc"], []),
+            ("nodes", "nodes", ["cluster"], []),
+            ("db", "db", ["vpc"], []),
+        ])
+        deploy = DeployGraph(graph, {"vpc": 5, "cluster": 600, "nodes": 240, "db": 420})
+
+        self.assertEqual(deploy.critical_path(), ["vpc", "cluster", "nodes"])
+        self.assertEqual(deploy.critical_path_seconds(), 845)
+        self.assertEqual(deploy.peak_width(), 2)
+        self.assertEqual(deploy.simulate(parallel=1), 1265)
+
+    def test_depends_on_findings(self):
+        """Test redundant and serializing depends_on edges are told apart."""
+        graph = make_graph([
+            ("vpc", "vpc", [], []),
+            ("igw", "igw", ["vpc"], []),
+            ("cluster", "cluster", ["vpc"], []),
+            ("nodes", "nodes", ["cluster"], ["cluster"]),
+            ("nat", "nat", ["vpc"], ["cluster"]),
+        ])
+        deploy = DeployGraph(graph, {"cluster": 600, "nat": 100})
+
+        kinds = {(f["resource"], f["kind"]) for f in deploy.depends_on_findings()}
+        self.assertEqual(kinds, {("nodes", "redundant"), ("nat", "serializing")})
+
+    def test_capture_records_explicit_depends_on(self):
+        """Test the VPC module's NAT gateway depends_on is captured under mocks."""
+        from modules.aws.vpc import Vpc, VpcArgs
+
+        graph = capture(lambda: Vpc("test", VpcArgs(name="test", single_nat_gateway=True)),
+                        config={"aws:region": "us-west-2"})
+
+        nat = next(node for node in graph if node.type == "aws:ec2/natGateway:NatGateway")
+        targets = {graph.nodes[urn].name for urn in nat.explicit_dependencies}
+        self.assertEqual(targets, {"test-igw"})
+        self.assertTrue(nat.source.startswith("modules/aws/vpc/vpc.py:"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests for the deploy timing telemetry collector."""
+import unittest
+
+from scripts.deploy_telemetry import EventCollector, connect, record, report
+
+NODE_GROUP = "urn:pulumi:dev::aws-infrastructure::aws:eks/nodeGroup:NodeGroup::main-eks-dev-nodegroup"
+DATABASE = "urn:pulumi:dev::aws-infrastructure::aws:rds/instance:Instance::main-db-dev-instance"
+PROVIDER = "urn:pulumi:dev::aws-infrastructure::pulumi:providers:aws::default_7_0_0::abc"
+
+
+def step(urn, type_token, op, start, end, failed=False, retries=0):
+    metadata = {"urn": urn, "type": type_token, "op": op, "provider": PROVIDER}
+    events = [{"timestamp": start, "resourcePreEvent": {"metadata": metadata}}]
+    events += [{"timestamp": start, "diagnosticEvent": {"urn": urn, "message": "Retrying request"}}
+               for _ in range(retries)]
+    done = "resOpFailedEvent" if failed else "resOutputsEvent"
+    events.append({"timestamp": end, done: {"metadata": metadata}})
+    return events
+
+
+def deploy(node_group_seconds):
+    events = [{"timestamp": 0, "preludeEvent": {"config": {}}}]
+    events += step(NODE_GROUP, "aws:eks/nodeGroup:NodeGroup", "update", 0, node_group_seconds)
+    events += step(DATABASE, "aws:rds/instance:Instance", "create", 0, 400, retries=2)
+    events.append({"timestamp": 400, "summaryEvent": {"resourceChanges": {"update": 1}}})
+    return events
+
+
+class TestDeployTelemetry(unittest.TestCase):
+    """Test cases for deploy telemetry."""
+
+    def test_collector_pairs_steps(self):
+        """Test pre/outputs events pair into steps and previews are ignored."""
+        collector = EventCollector()
+        events = deploy(240)
+        events.insert(1, {"timestamp": 0, "resourcePreEvent": {
+            "planning": True, "metadata": {"urn": DATABASE, "op": "create"}}})
+        events += step(DATABASE, "aws:rds/instance:Instance", "same", 400, 400)
+        for event in events:
+            collector.feed(event)
+
+        steps = {s["type"]: s for s in collector.steps}
+        self.assertEqual(len(collector.steps), 2)
+        self.assertEqual(steps["aws:eks/nodeGroup:NodeGroup"]["duration_seconds"], 240)
+        self.assertEqual(steps["aws:rds/instance:Instance"]["retries"], 2)
+        self.assertEqual(steps["aws:rds/instance:Instance"]["provider"], "aws")
+        self.assertEqual(collector.result, "succeeded")
+
+    def test_failed_step(self):
+        """Test a failed operation marks the step and the deploy as failed."""
+        collector = EventCollector()
+        for event in step(DATABASE, "aws:rds/instance:Instance", "create", 0, 90, failed=True):
+            collector.feed(event)
+        collector.feed({"timestamp": 90, "summaryEvent": {}})
+
+        self.assertTrue(collector.steps[0]["failed"])
+        self.assertEqual(collector.result, "failed")
+
+    def test_report_flags_regressions(self):
+        """Test the report ranks slow types and flags a slower latest deploy."""
+        db = connect(":memory:")
+        for i, seconds in enumerate([240, 250, 245, 600]):
+            record(db, deploy(seconds), "aws/dev", f"commit-{i}", "up")
+
+        summary = report(db, stack="aws/dev")
+        self.assertEqual([row["type"] for row in summary["slowest_types"]],
+                         ["aws:rds/instance:Instance", "aws:eks/nodeGroup:NodeGroup"])
+        self.assertEqual(summary["slowest_types"][0]["retries"], 8)
+        self.assertEqual(
+            [(r["type"], r["commit"]) for r in summary["regressions"]],
+            [("aws:eks/nodeGroup:NodeGroup", "commit-3")]
+        )
+        self.assertEqual(report(db, stack="gcp/dev")["slowest_types"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
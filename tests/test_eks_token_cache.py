@@ -0,0 +1,108 @@
+"""Tests for the caching EKS exec credential plugin."""
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import textwrap
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from scripts.eks_token_cache import TokenCache, fetch_credential, main
+
+# Fake token issuer: counts invocations and returns a credential that
+# expires after the number of seconds given as its first argument.
+FAKE_ISSUER = textwrap.dedent("""
+    import json, sys, time
+    from datetime import datetime, timedelta, timezone
+
+    with open(sys.argv[2], "a") as f:
+        f.write("x")
+    time.sleep(0.05)
+    expires = datetime.now(timezone.utc) + timedelta(seconds=int(sys.argv[1]))
+    print(json.dumps({
+        "kind": "ExecCredential",
+        "apiVersion": "client.authentication.k8s.io/v1beta1",
+        "status": {
+            "token": "k8s-aws-v1.fake",
+            "expirationTimestamp": expires.strftime("%Y-%m-%dT%H:%M:%SZ")
+        }
+    }))
+""")
+
+
+class TestEksTokenCache(unittest.TestCase):
+    """Test cases for the token cache."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.calls = os.path.join(self.tmp.name, "calls")
+        self.issuer = os.path.join(self.tmp.name, "issuer.py")
+        with open(self.issuer, "w") as f:
+            f.write(FAKE_ISSUER)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def issuer_command(self, lifetime=900):
+        return [sys.executable, self.issuer, str(lifetime), self.calls]
+
+    def issuer_calls(self):
+        if not os.path.exists(self.calls):
+            return 0
+        with open(self.calls) as f:
+            return len(f.read())
+
+    def test_reuses_token_until_refresh_window(self):
+        """Test a fresh token is reused and a nearly expired one is refetched."""
+        cache = TokenCache(self.cache_dir, refresh_skew=60)
+        fetch = lambda: fetch_credential(self.issuer_command())
+
+        first = cache.get("cluster", None, fetch)
+        second = cache.get("cluster", None, fetch)
+        self.assertEqual(first, second)
+        self.assertEqual(self.issuer_calls(), 1)
+
+        later = TokenCache(self.cache_dir, refresh_skew=60,
+                           clock=lambda: (datetime.now(timezone.utc) + timedelta(seconds=850)).timestamp())
+        later.get("cluster", None, fetch)
+        self.assertEqual(self.issuer_calls(), 2)
+
+    def test_tokens_are_cached_per_role(self):
+        """Test different roles on one cluster do not share a token."""
+        cache = TokenCache(self.cache_dir)
+        fetch = lambda: fetch_credential(self.issuer_command())
+
+        cache.get("cluster", "arn:aws:iam::123456789012:role/admin", fetch)
+        cache.get("cluster", "arn:aws:iam::123456789012:role/readonly", fetch)
+        self.assertEqual(self.issuer_calls(), 2)
+
+    def test_concurrent_callers_fetch_once(self):
+        """Test concurrent cache misses serialise on the lock and fetch once."""
+        cache = TokenCache(self.cache_dir)
+        fetch = lambda: fetch_credential(self.issuer_command())
+        threads = [threading.Thread(target=cache.get, args=("cluster", None, fetch))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.issuer_calls(), 1)
+
+    def test_main_prints_exec_credential(self):
+        """Test the plugin entry point prints the upstream ExecCredential."""
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            code = main(["--cluster", "cluster", "--cache-dir", self.cache_dir, "--"]
+                        + self.issuer_command())
+
+        self.assertEqual(code, 0)
+        self.assertEqual(json.loads(stdout.getvalue())["status"]["token"], "k8s-aws-v1.fake")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Tests for the offline VPC flow log analyzer."""
+import os
+import tempfile
+import unittest
+
+from scripts.flow_log_analyzer import HeavyHitters, analyze
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# (srcaddr, dstaddr, bytes, subnet_id, az_id, flow_direction, traffic_path)
+RECORDS = [
+    # Pod in AZ 1 pulling from the internet through the NAT gateway.
+    ("10.0.10.5", "52.1.1.1", 5000, "subnet-private-a", "usw2-az1", "egress", 1),
+    ("10.0.10.5", "52.1.1.1", 3000, "subnet-private-a", "usw2-az1", "egress", 1),
+    ("10.0.11.7", "52.2.2.2", 1000, "subnet-private-b", "usw2-az2", "egress", 1),
+    # Public subnet straight out of the internet gateway: not NAT.
+    ("10.0.0.9", "52.3.3.3", 700, "subnet-public-a", "usw2-az1", "egress", 8),
+    # Cross-AZ service traffic, seen by both ENIs.
+    ("10.0.10.5", "10.0.11.7", 400, "subnet-private-a", "usw2-az1", "egress", 1),
+    ("10.0.10.5", "10.0.11.7", 400, "subnet-private-b", "usw2-az2", "ingress", None),
+    # Same-AZ traffic.
+    ("10.0.10.5", "10.0.10.6", 200, "subnet-private-a", "usw2-az1", "egress", 1),
+    ("10.0.10.6", "10.0.10.5", 50, "subnet-private-a", "usw2-az1", "egress", 1),
+]
+
+
+class TestFlowLogAnalyzer(unittest.TestCase):
+    """Test cases for the flow log analyzer."""
+
+    def test_heavy_hitters(self):
+        """Test the Space-Saving sketch keeps heavy keys within its error bound."""
+        hitters = HeavyHitters(capacity=3)
+        for i in range(100):
+            hitters.update("heavy", 50)
+            hitters.update(f"light-{i}", 1)
+
+        key, count, error = hitters.top(1)[0]
+        self.assertEqual(key, "heavy")
+        self.assertLessEqual(count - error, 5000)
+        self.assertGreaterEqual(count, 5000)
+        self.assertLessEqual(len(hitters.counts), 3)
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_analyze_sample_day(self):
+        """Test top talkers, NAT bytes per subnet and cross-AZ flows on sample files."""
+        columns = list(zip(*RECORDS))
+        names = ["srcaddr", "dstaddr", "bytes", "subnet_id", "az_id", "flow_direction", "traffic_path"]
+        with tempfile.TemporaryDirectory() as tmp:
+            # Two hourly partitions, read in small batches.
+            for hour, rows in (("00", slice(0, 4)), ("01", slice(4, None))):
+                directory = os.path.join(tmp, f"hour={hour}")
+                os.makedirs(directory)
+                table = pyarrow.table({
+                    name: pyarrow.array(values[rows],
+                                        type=pyarrow.int64() if name == "bytes"
+                                        else pyarrow.int32() if name == "traffic_path"
+                                        else pyarrow.string())
+                    for name, values in zip(names, columns)
+                })
+                pyarrow.parquet.write_table(table, os.path.join(directory, "flows.parquet"))
+
+            report = analyze([tmp], top=2, batch_size=2)
+
+        self.assertEqual(report["records"], len(RECORDS))
+        self.assertEqual(report["top_talkers"][0],
+                         {"srcaddr": "10.0.10.5", "dstaddr": "52.1.1.1", "bytes": 8000, "max_overcount": 0})
+        self.assertEqual(report["nat_bytes_by_subnet"],
+                         {"subnet-private-a": 8000, "subnet-private-b": 1000})
+        self.assertEqual(report["cross_az"], [{"src_az": "usw2-az1", "dst_az": "usw2-az2", "bytes": 400}])
+        self.assertEqual(report["same_az_bytes"], 250)
+
+
+if __name__ == '__main__':
+    unittest.main()
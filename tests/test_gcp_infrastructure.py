@@ -15,6 +15,164 @@ class TestGcpInfrastructure(unittest.TestCase):
         """Test Cloud SQL database creation."""
         # This would test Cloud SQL creation
         pass
+    
+    def test_memorystore_cluster(self):
+        """Test Valkey cluster mode gets shards, replicas, TLS and a PSC policy."""
+        from modules.gcp.memorystore import Memorystore, MemorystoreArgs
+        from scripts.resource_graph import capture
+        
+        cache_args = MemorystoreArgs(
+            name="test-cache",
+            network="projects/test/global/networks/main",
+            subnetwork="projects/test/regions/us-central1/subnetworks/main",
+            project="test",
+            shard_count=3,
+            replica_count=2
+        )
+        graph = capture(lambda: Memorystore("test-cache", cache_args))
+        resources = graph.by_type()
+        
+        instance, = resources["gcp:memorystore/instance:Instance"]
+        self.assertEqual(instance.inputs["mode"], "CLUSTER")
+        self.assertEqual(instance.inputs["shardCount"], 3)
+        self.assertEqual(instance.inputs["replicaCount"], 2)
+        self.assertEqual(instance.inputs["transitEncryptionMode"], "SERVER_AUTHENTICATION")
+        
+        policy, = resources["gcp:networkconnectivity/serviceConnectionPolicy:ServiceConnectionPolicy"]
+        self.assertEqual(policy.inputs["serviceClass"], "gcp-memorystore")
+        self.assertIn(policy.urn, instance.explicit_dependencies)
+        
+        with self.assertRaises(ValueError):
+            Memorystore("bad-cache", MemorystoreArgs(
+                name="bad-cache", network="main", cluster_mode=False, shard_count=2
+            ))
+        
+        # Redis Cluster takes the same node types with a REDIS_ prefix.
+        graph = capture(lambda: Memorystore("redis-cluster", MemorystoreArgs(
+            name="redis-cluster", network="main", subnetwork="main", engine="REDIS"
+        )))
+        cluster, = graph.by_type()["gcp:redis/cluster:Cluster"]
+        self.assertEqual(cluster.inputs["nodeType"], "REDIS_SHARED_CORE_NANO")
+        with self.assertRaises(ValueError):
+            Memorystore("bad-node-cache", MemorystoreArgs(
+                name="bad-node-cache", network="main", subnetwork="main", node_type="MICRO"
+            ))
+        
+        # Non-cluster Redis read replicas need a 5 GB Standard instance.
+        graph = capture(lambda: Memorystore("redis-cache", MemorystoreArgs(
+            name="redis-cache", network="main", engine="REDIS", cluster_mode=False
+        )))
+        redis, = graph.by_type()["gcp:redis/instance:Instance"]
+        self.assertEqual(redis.inputs["memorySizeGb"], 5)
+        self.assertEqual(redis.inputs["readReplicasMode"], "READ_REPLICAS_ENABLED")
+        with self.assertRaises(ValueError):
+            Memorystore("small-cache", MemorystoreArgs(
+                name="small-cache", network="main", engine="REDIS", cluster_mode=False,
+                memory_size_gb=1
+            ))
+        capture(lambda: Memorystore("small-cache", MemorystoreArgs(
+            name="small-cache", network="main", engine="REDIS", cluster_mode=False,
+            memory_size_gb=1, replica_count=0
+        )))
+    
+    def test_filestore_sizing(self):
+        """Test Filestore tier and capacity follow the throughput target."""
+        from modules.gcp.filestore import Filestore, FilestoreArgs, size_filestore
+        from modules.gcp.filestore.instance import CSI_TIERS
+        from scripts.resource_graph import capture
+        import pulumi_kubernetes as k8s
+        
+        self.assertEqual(size_filestore(100), ("BASIC_HDD", 1024))
+        self.assertEqual(CSI_TIERS["BASIC_HDD"], "standard")
+        self.assertEqual(size_filestore(180), ("ZONAL", 1024))
+        self.assertEqual(size_filestore(180, tiers=("BASIC_HDD",)), ("BASIC_HDD", 10240))
+        self.assertEqual(size_filestore(1000), ("BASIC_SSD", 2560))
+        self.assertEqual(size_filestore(2000), ("ZONAL", 7680))
+        self.assertEqual(size_filestore(300, tiers=("REGIONAL",)), ("REGIONAL", 2560))
+        with self.assertRaises(ValueError):
+            size_filestore(50000, tiers=("BASIC_SSD",))
+        
+        def program():
+            provider = k8s.Provider("k8s", kubeconfig="{}")
+            Filestore("test-share", FilestoreArgs(
+                name="test-share", network="main", project="test",
+                throughput_mbps=2000, k8s_provider=provider,
+                dynamic_storage_class_name="filestore-dynamic"
+            ))
+        resources = capture(program).by_type()
+        
+        instance, = resources["gcp:filestore/instance:Instance"]
+        self.assertEqual(instance.inputs["tier"], "ZONAL")
+        self.assertEqual(instance.inputs["fileShares"]["capacityGb"], 7680)
+        
+        # The share's class never provisions; the opt-in dynamic class does.
+        classes = {node.inputs["metadata"]["name"]: node.inputs
+                   for node in resources["kubernetes:storage.k8s.io/v1:StorageClass"]}
+        self.assertEqual(classes["filestore"]["provisioner"], "kubernetes.io/no-provisioner")
+        self.assertEqual(classes["filestore-dynamic"]["parameters"]["tier"], "zonal")
+        volume, = resources["kubernetes:core/v1:PersistentVolume"]
+        self.assertEqual(volume.inputs["spec"]["csi"]["volumeAttributes"]["ip"], "10.20.0.2")
+
+    
+    def test_pgbouncer_pool(self):
+        """Test the PgBouncer pool splits the instance connection budget across replicas."""
+        from modules.gcp.cloud_sql import PgBouncer, PgBouncerArgs, cloud_sql_max_connections
+        from scripts.resource_graph import capture
+        import pulumi_kubernetes as k8s
+        
+        self.assertEqual(cloud_sql_max_connections("db-f1-micro"), 25)
+        self.assertEqual(cloud_sql_max_connections("db-custom-2-7680"), 400)
+        with self.assertRaises(ValueError):
+            cloud_sql_max_connections("db-n1-standard-1")
+        
+        def program(**overrides):
+            provider = k8s.Provider("k8s", kubeconfig="{}")
+            PgBouncer("test-pool", PgBouncerArgs(**{
+                "name": "test-pool", "instance_connection_name": "test:us-central1:db",
+                "k8s_provider": provider, "user": "appuser", "password": "secret",
+                "databases": ["appdb", "reports"], "tier": "db-custom-2-7680", "project": "test",
+                "pool_sizes": {"reports": 2}, "max_user_connections": {"appuser": 40},
+                **overrides
+            }))
+        resources = capture(program).by_type()
+        
+        config_map, = resources["kubernetes:core/v1:ConfigMap"]
+        ini = config_map.inputs["data"]["pgbouncer.ini"]
+        self.assertIn("pool_mode = transaction", ini)
+        # (400 - 3 reserved) // (4 replicas * 2 databases)
+        self.assertIn("max_db_connections = 49", ini)
+        self.assertIn("dbname=reports pool_size=2", ini)
+        self.assertIn("appuser = max_user_connections=40", ini)
+        
+        deployment, = resources["kubernetes:apps/v1:Deployment"]
+        containers = deployment.inputs["spec"]["template"]["spec"]["containers"]
+        self.assertEqual([c["name"] for c in containers], ["pgbouncer", "cloud-sql-proxy"])
+        self.assertEqual(containers[1]["args"][-2:], ["--private-ip", "test:us-central1:db"])
+        self.assertTrue(containers[0]["image"].startswith(
+            "us-central1-docker.pkg.dev/test/test-pool-dockerhub/edoburu/pgbouncer:"
+        ))
+        repository, = resources["gcp:artifactregistry/repository:Repository"]
+        self.assertEqual(repository.inputs["mode"], "REMOTE_REPOSITORY")
+        hpa, = resources["kubernetes:autoscaling/v2:HorizontalPodAutoscaler"]
+        self.assertEqual(hpa.inputs["spec"]["maxReplicas"], 4)
+        self.assertIn("kubernetes:policy/v1:PodDisruptionBudget", resources)
+        
+        with self.assertRaises(ValueError):
+            capture(lambda: program(pool_mode="prepared"))
+        with self.assertRaises(ValueError):
+            capture(lambda: program(tier="db-f1-micro", max_replicas=12))
+        
+        # The stack gives Cloud SQL a private IP on the VPC when pooling is on.
+        import os
+        from scripts.resource_graph import capture_program
+        graph = capture_program(os.path.join(os.path.dirname(__file__), "..", "gcp"), config={
+            "enableConnectionPooling": "true", "dbPassword": "mock-password"
+        })
+        instance, = graph.by_type()["gcp:sql/databaseInstance:DatabaseInstance"]
+        self.assertEqual(instance.inputs["settings"]["ipConfiguration"]["privateNetwork"],
+                         "main-vpc-dev-id")
+        connection, = graph.by_type()["gcp:servicenetworking/connection:Connection"]
+        self.assertIn(connection.urn, instance.explicit_dependencies)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,57 @@
+"""Tests for the inline NAT route migration."""
+import unittest
+
+from scripts.migrate_vpc_routes import import_spec
+
+VPC_URN = "urn:pulumi:dev::aws-infrastructure::modules:aws:Vpc::main-vpc-dev"
+
+
+def route_table(index, routes, name="main-vpc-dev-private-rt"):
+    return {
+        "urn": f"{VPC_URN}$aws:ec2/routeTable:RouteTable::{name}-{index}",
+        "type": "aws:ec2/routeTable:RouteTable",
+        "id": f"rtb-{index}",
+        "parent": VPC_URN,
+        "outputs": {"routes": routes},
+    }
+
+
+NAT_ROUTE = {"cidrBlock": "0.0.0.0/0", "natGatewayId": "nat-0"}
+
+
+class TestMigrateVpcRoutes(unittest.TestCase):
+    """Test cases for building the import file from a stack export."""
+
+    def test_imports_inline_nat_routes(self):
+        """Test each private table's inline NAT route is adopted under the new name."""
+        state = {"deployment": {"resources": [
+            route_table(0, [NAT_ROUTE]),
+            route_table(1, [NAT_ROUTE]),
+            # Public tables keep their inline internet gateway route.
+            route_table(0, [{"cidrBlock": "0.0.0.0/0", "gatewayId": "igw-0"}],
+                        name="main-vpc-dev-public-rt"),
+        ]}}
+
+        spec = import_spec(state)
+        self.assertEqual(spec["nameTable"], {"vpc-0": VPC_URN})
+        self.assertEqual(spec["resources"], [
+            {"type": "aws:ec2/route:Route", "name": "main-vpc-dev-private-nat-route-0",
+             "id": "rtb-0_0.0.0.0/0", "parent": "vpc-0"},
+            {"type": "aws:ec2/route:Route", "name": "main-vpc-dev-private-nat-route-1",
+             "id": "rtb-1_0.0.0.0/0", "parent": "vpc-0"},
+        ])
+
+    def test_skips_migrated_stacks(self):
+        """Test routes already in state as standalone resources are not imported again."""
+        state = {"deployment": {"resources": [
+            route_table(0, [NAT_ROUTE]),
+            {"urn": f"{VPC_URN}$aws:ec2/route:Route::main-vpc-dev-private-nat-route-0",
+             "type": "aws:ec2/route:Route", "id": "r-rtb-0", "parent": VPC_URN},
+            route_table(1, []),
+        ]}}
+
+        self.assertEqual(import_spec(state), {"nameTable": {}, "resources": []})
+
+
+if __name__ == '__main__':
+    unittest.main()
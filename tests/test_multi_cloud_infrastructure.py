@@ -0,0 +1,218 @@
+"""Tests for multi-cloud infrastructure."""
+import json
+import os
+import tempfile
+import unittest
+
+from scripts.resource_graph import CapturingMocks, capture_program
+
+PROJECT_DIR = os.path.join(os.path.dirname(__file__), "..", "multi-cloud")
+
+STACK_OUTPUTS = {
+    "organization/aws-infrastructure/dev": {
+        "vpc_id": "vpc-12345",
+        "vpc_cidr_block": "10.0.0.0/16",
+        "private_subnet_ids": ["subnet-1", "subnet-2"],
+        "public_subnet_ids": ["subnet-3", "subnet-4"],
+        "private_route_table_ids": ["rtb-1", "rtb-2"],
+        "eks_cluster_name": "eks-dev",
+        "kubeconfig": "apiVersion: v1"
+    },
+    "organization/gcp-infrastructure/dev": {
+        "vpc_name": "gcp-vpc-dev",
+        "subnet_names": ["gcp-subnet-dev"],
+        "subnet_cidr_blocks": ["10.10.0.0/16", "10.11.0.0/16"],
+        "gke_cluster_name": "gke-dev",
+        "gke_kubeconfig": "apiVersion: v1"
+    },
+}
+SECRET_OUTPUTS = ["kubeconfig", "gke_kubeconfig"]
+
+
+class StackReferenceMocks(CapturingMocks):
+    """Mocks that serve stack outputs and count StackReference reads."""
+
+    def __init__(self):
+        super().__init__()
+        self.references = []
+
+    def new_resource(self, args):
+        if args.typ == "pulumi:pulumi:StackReference":
+            stack_name = args.inputs["name"]
+            self.references.append(stack_name)
+            return stack_name, {
+                "name": stack_name,
+                "outputs": STACK_OUTPUTS[stack_name],
+                "secretOutputNames": SECRET_OUTPUTS
+            }
+        return super().new_resource(args)
+
+
+class TestMultiCloudInfrastructure(unittest.TestCase):
+    """Test cases for multi-cloud infrastructure."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = {
+            "stackOutputCacheDir": self.tmp.name,
+            "awsStack": "organization/aws-infrastructure/dev",
+            "gcpStack": "organization/gcp-infrastructure/dev"
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_compose_mode_creates_no_cloud_resources(self):
+        """Test compose mode reads the per-cloud stacks instead of creating resources."""
+        mocks = StackReferenceMocks()
+        graph = capture_program(PROJECT_DIR, config=self.config, mocks=mocks)
+
+        self.assertEqual(graph.custom_resources(), [])
+        self.assertEqual(sorted(mocks.references), sorted(STACK_OUTPUTS))
+
+    def test_cache_excludes_secret_outputs(self):
+        """Test fetched outputs are cached without the secret ones."""
+        capture_program(PROJECT_DIR, config=self.config, mocks=StackReferenceMocks())
+
+        with open(os.path.join(self.tmp.name, "organization_aws-infrastructure_dev.json")) as f:
+            cached = json.load(f)["outputs"]
+        self.assertEqual(cached["vpc_id"], "vpc-12345")
+        self.assertNotIn("kubeconfig", cached)
+
+    def test_preview_serves_outputs_from_cache(self):
+        """Test a preview with a fresh cache plans against the cached outputs."""
+        capture_program(PROJECT_DIR, config=self.config, mocks=StackReferenceMocks())
+
+        cache_path = os.path.join(self.tmp.name, "organization_aws-infrastructure_dev.json")
+        with open(cache_path) as f:
+            entry = json.load(f)
+        entry["outputs"]["private_route_table_ids"] = ["rtb-cached-1", "rtb-cached-2"]
+        with open(cache_path, "w") as f:
+            json.dump(entry, f)
+
+        config = {**self.config, "enableCrossCloudVpn": True}
+        mocks = StackReferenceMocks()
+        graph = capture_program(PROJECT_DIR, config=config, mocks=mocks, preview=True)
+        # The references are still registered so the preview shows no
+        # deletes for them; only their outputs come from the cache.
+        self.assertEqual(sorted(mocks.references), sorted(STACK_OUTPUTS))
+        routes = graph.by_type()["aws:ec2/route:Route"]
+        self.assertEqual(sorted(r.inputs["routeTableId"] for r in routes),
+                         ["rtb-cached-1", "rtb-cached-2"])
+
+        # Updates always refetch so they never act on stale outputs.
+        graph = capture_program(PROJECT_DIR, config=config, mocks=StackReferenceMocks())
+        routes = graph.by_type()["aws:ec2/route:Route"]
+        self.assertEqual(sorted(r.inputs["routeTableId"] for r in routes), ["rtb-1", "rtb-2"])
+
+    def test_standalone_mode_creates_clusters(self):
+        """Test standalone mode creates its own VPC, EKS and GKE clusters."""
+        graph = capture_program(PROJECT_DIR, config={**self.config, "mode": "standalone"})
+        types = graph.by_type()
+
+        self.assertIn("aws:eks/cluster:Cluster", types)
+        self.assertIn("gcp:container/cluster:Cluster", types)
+
+    def test_cross_cloud_vpn_mesh(self):
+        """Test the HA VPN builds four ECMP tunnels per gateway and routes GCP traffic."""
+        graph = capture_program(PROJECT_DIR, config={
+            **self.config,
+            "enableCrossCloudVpn": True,
+            "vpnGatewayCount": 2
+        }, mocks=StackReferenceMocks())
+        types = graph.by_type()
+
+        tgw, = types["aws:ec2transitgateway/transitGateway:TransitGateway"]
+        self.assertEqual(tgw.inputs["vpnEcmpSupport"], "enable")
+        self.assertEqual(len(types["aws:ec2/vpnConnection:VpnConnection"]), 4)
+        self.assertEqual(len(types["gcp:compute/vPNTunnel:VPNTunnel"]), 8)
+
+        inside = {conn.inputs[key] for conn in types["aws:ec2/vpnConnection:VpnConnection"]
+                  for key in ("tunnel1InsideCidr", "tunnel2InsideCidr")}
+        self.assertEqual(len(inside), 8)
+        peers = {peer.inputs["peerIpAddress"] for peer in types["gcp:compute/routerPeer:RouterPeer"]}
+        self.assertIn("169.254.100.1", peers)
+
+        # Routes cover the ranges the gcp stack exports, not the standalone defaults.
+        prefix_list, = types["aws:ec2/managedPrefixList:ManagedPrefixList"]
+        self.assertEqual([entry["cidr"] for entry in prefix_list.inputs["entries"]],
+                         ["10.10.0.0/16", "10.11.0.0/16"])
+        routes = types["aws:ec2/route:Route"]
+        self.assertEqual(sorted(r.inputs["routeTableId"] for r in routes), ["rtb-1", "rtb-2"])
+        self.assertTrue(all(r.inputs["destinationPrefixListId"] for r in routes))
+
+    def test_vpn_validation(self):
+        """Test tunnel inside CIDRs and ASNs are validated locally."""
+        from modules.common.cross_cloud_vpn import validate_asn, validate_inside_cidrs
+
+        validate_inside_cidrs(["169.254.100.0/30", "169.254.100.4/30"])
+        with self.assertRaises(ValueError):
+            validate_inside_cidrs(["169.254.100.0/29"])
+        with self.assertRaises(ValueError):
+            validate_inside_cidrs(["169.254.169.252/30"])
+        with self.assertRaises(ValueError):
+            validate_inside_cidrs(["169.254.100.0/30", "169.254.100.0/30"])
+        with self.assertRaises(ValueError):
+            validate_asn(7224, "AWS")
+
+        with self.assertRaises(ValueError):
+            capture_program(PROJECT_DIR, config={
+                **self.config,
+                "enableCrossCloudVpn": True,
+                "vpnGcpAsn": 64512
+            }, mocks=StackReferenceMocks())
+
+    def test_vpn_rejects_overlapping_stack_ranges(self):
+        """Test compose mode fails when the referenced stacks' ranges overlap."""
+        from modules.common.cross_cloud_vpn import validate_disjoint_ranges
+
+        with self.assertRaises(ValueError):
+            validate_disjoint_ranges(["10.0.0.0/16"], ["10.10.0.0/16", "10.0.128.0/20"])
+
+        gcp_outputs = STACK_OUTPUTS["organization/gcp-infrastructure/dev"]
+        original = gcp_outputs["subnet_cidr_blocks"]
+        gcp_outputs["subnet_cidr_blocks"] = ["10.0.0.0/16", "10.1.0.0/16"]
+        try:
+            with self.assertRaises(ValueError):
+                capture_program(PROJECT_DIR, config={**self.config, "enableCrossCloudVpn": True},
+                                mocks=StackReferenceMocks())
+        finally:
+            gcp_outputs["subnet_cidr_blocks"] = original
+
+    def test_global_latency_routing(self):
+        """Test one hostname gets a health-checked latency record per cluster ingress."""
+        routing_config = {
+            **self.config,
+            "globalHostname": "app.example.com",
+            "globalZoneId": "Z123",
+            "awsIngressHostname": "ingress-123.elb.us-west-2.amazonaws.com",
+            "gcpIngressAddress": "203.0.113.50"
+        }
+        graph = capture_program(PROJECT_DIR, config=routing_config, mocks=StackReferenceMocks())
+        types = graph.by_type()
+
+        cnames = [r for r in types["aws:route53/record:Record"] if r.inputs["type"] == "CNAME"]
+        regions = {r.inputs["records"][0]: r.inputs["latencyRoutingPolicies"][0]["region"] for r in cnames}
+        self.assertEqual(regions, {
+            "ingress-123.elb.us-west-2.amazonaws.com": "us-west-2",
+            "gcp.app.example.com": "us-east-2",
+        })
+        self.assertTrue(all(r.inputs["name"] == "app.example.com" and r.inputs["healthCheckId"]
+                            for r in cnames))
+        checks = {check.inputs.get("ipAddress") or check.inputs["fqdn"]
+                  for check in types["aws:route53/healthCheck:HealthCheck"]}
+        self.assertEqual(checks, {"ingress-123.elb.us-west-2.amazonaws.com", "203.0.113.50"})
+
+        graph = capture_program(PROJECT_DIR, config={
+            **routing_config,
+            "globalRoutingPolicy": "weighted",
+            "globalRoutingWeights": {"us-west-2": 3, "us-central1": 0}
+        }, mocks=StackReferenceMocks())
+        weights = sorted(r.inputs["weightedRoutingPolicies"][0]["weight"]
+                         for r in graph.by_type()["aws:route53/record:Record"]
+                         if r.inputs["type"] == "CNAME")
+        self.assertEqual(weights, [0, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
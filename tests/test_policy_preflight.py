@@ -0,0 +1,68 @@
+"""Tests for the local policy preflight."""
+import os
+import unittest
+
+from scripts.policy_preflight import DEFAULT_RULES, PolicyPack, Rule
+from scripts.resource_graph import capture, capture_program
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def rds(**overrides):
+    from modules.aws.rds import RdsDatabase, RdsDatabaseArgs
+
+    args = RdsDatabaseArgs(
+        name="test-db",
+        vpc_id="vpc-12345",
+        subnet_ids=["subnet-1", "subnet-2"],
+        **overrides
+    )
+    return lambda: RdsDatabase("test-db", args)
+
+
+class TestPolicyPreflight(unittest.TestCase):
+    """Test cases for the policy preflight."""
+
+    def evaluate(self, fn, stack="dev"):
+        graph = capture(fn, stack=stack, config={"project:dbPassword": "mock-password"})
+        return PolicyPack(DEFAULT_RULES).evaluate(graph)
+
+    def test_violations_carry_urns(self):
+        """Test unencrypted RDS and broad ingress are reported against their URNs."""
+        violations = self.evaluate(rds(storage_encrypted=False))
+
+        found = {(v.rule, v.urn.rsplit("::", 1)[-1]) for v in violations}
+        self.assertEqual(found, {
+            ("rds-storage-encrypted", "test-db-instance"),
+            ("ingress-cidr-narrower-than-slash-8", "test-db-security-group"),
+        })
+
+    def test_production_deletion_protection(self):
+        """Test deletion_protection=False is only a violation in production."""
+        fn = rds(allowed_cidr_blocks=["10.0.0.0/16"])
+        self.assertEqual(self.evaluate(fn), [])
+
+        violations = self.evaluate(fn, stack="production")
+        self.assertEqual([v.rule for v in violations], ["production-deletion-protection"])
+
+        self.assertEqual(self.evaluate(rds(allowed_cidr_blocks=["10.0.0.0/16"], deletion_protection=True),
+                                       stack="production"), [])
+
+    def test_rules_only_see_their_types(self):
+        """Test rules are dispatched by resource type."""
+        seen = []
+        pack = PolicyPack([Rule("record", ("aws:rds/instance:Instance",),
+                                lambda inputs, context: seen.append(inputs["identifier"]))])
+        graph = capture(rds(), config={"project:dbPassword": "mock-password"})
+        pack.evaluate(graph)
+
+        self.assertEqual(seen, ["test-db"])
+
+    def test_aws_production_stack_passes(self):
+        """Test the aws program satisfies the rule pack in production."""
+        graph = capture_program(os.path.join(REPO_ROOT, "aws"), stack="production")
+        self.assertEqual(PolicyPack(DEFAULT_RULES).evaluate(graph), [])
+
+
+if __name__ == '__main__':
+    unittest.main()